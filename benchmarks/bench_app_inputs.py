@@ -0,0 +1,145 @@
+"""Benchmark of the KF RNA-seq app input generation.
+
+Compares the throughput of the current input factory (vectorized sample
+preparation and compiled input template) with the previous per-sample
+generator, which is reproduced below as a baseline. File lookups use a fake
+client, so only the local processing is measured.
+
+Usage: python benchmarks/bench_app_inputs.py [--samples N] [--repeat N]
+"""
+import argparse
+import re
+from copy import deepcopy
+from functools import partial
+from timeit import repeat
+
+import numpy as np
+import pandas as pd
+
+from sagetasks.sevenbridges.inputs import (
+    GTEX_NORMAL_PARAMS,
+    STRANDEDNESS_DEFAULTS,
+    TUMOR_REGEX,
+    manifest_to_kf_rnaseq_app_inputs_factory,
+)
+
+
+class FakeRecord:
+    def __init__(self, resource):
+        self.valid = True
+        self.resource = resource
+
+
+class FakeFiles:
+    def get(self, file_id):
+        return file_id
+
+    def bulk_get(self, file_ids):
+        return [FakeRecord(file_id) for file_id in file_ids]
+
+
+class FakeClient:
+    files = FakeFiles()
+
+
+def make_manifest(num_samples):
+    sample_ids = np.repeat([f"sample {i}" for i in range(num_samples)], 2)
+    sample_types = np.where(np.arange(num_samples) % 2, "normal", "tumor")
+    return pd.DataFrame(
+        {
+            "cavatica_file_id": [f"file-{i}" for i in range(2 * num_samples)],
+            "sample_id": sample_ids,
+            "read_length": 100,
+            # Alternate tumor and normal samples (both files share the type)
+            "sample_type": np.repeat(sample_types, 2),
+            "read_orientation": ["R1", "R2"] * num_samples,
+            "strandedness": "default",
+            "library_id": np.char.add("library ", sample_ids.astype(str)),
+            "platform": "Illumina",
+        }
+    )
+
+
+def get_unique_value(df, col, default=None):
+    if col not in df and default is not None:
+        raw = [default]
+    else:
+        raw = df[col].unique()
+    assert len(raw) == 1
+    val = raw[0]
+    if isinstance(val, np.int64):
+        val = int(val)
+    return val
+
+
+def legacy_inputs(client, manifest):
+    """Previous generator, which processes one sample group at a time."""
+    strandedness_map = dict(zip(STRANDEDNESS_DEFAULTS, STRANDEDNESS_DEFAULTS))
+    for sample_id, sample_df in manifest.groupby("sample_id"):
+        assert len(sample_df.index) == 2
+        r1_file_id = sample_df[sample_df["read_orientation"] == "R1"][
+            "cavatica_file_id"
+        ].iat[0]
+        r2_file_id = sample_df[sample_df["read_orientation"] == "R2"][
+            "cavatica_file_id"
+        ].iat[0]
+        strandedness = strandedness_map.get(get_unique_value(sample_df, "strandedness"))
+        assert strandedness
+        library_id = get_unique_value(sample_df, "library_id", "Not_Reported")
+        platform = get_unique_value(sample_df, "platform", "Not_Reported")
+        read_length = get_unique_value(sample_df, "read_length")
+        sample_type = get_unique_value(sample_df, "sample_type")
+        is_tumor = TUMOR_REGEX.search(sample_type)
+        inputs = dict() if is_tumor else deepcopy(GTEX_NORMAL_PARAMS)
+        rg_vals = [
+            f"ID:{sample_id}",
+            f"LB:{library_id}",
+            f"PL:{platform}",
+            f"SM:{sample_id}",
+        ]
+        inputs.update(
+            {
+                "input_type": "FASTQ",
+                "reads1": client.files.get(r1_file_id),
+                "reads2": client.files.get(r2_file_id),
+                "runThreadN": 36,
+                "wf_strand_param": strandedness,
+                "sample_name": sample_id,
+                "rmats_read_length": read_length,
+                "outSAMattrRGline": "\t".join(
+                    re.sub(r"\s", "_", val) for val in rg_vals
+                ),
+            }
+        )
+        yield "kf-rnaseq-workflow - " + sample_id, inputs, None
+
+
+def consume(inputs_fn, client, manifest):
+    return list(inputs_fn(client, manifest))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    client = FakeClient()
+    manifest = make_manifest(args.samples)
+    current_inputs = manifest_to_kf_rnaseq_app_inputs_factory()
+    generators = {"legacy": legacy_inputs, "current": current_inputs}
+
+    # Both generators should produce the same inputs
+    expected = [x[:2] for x in legacy_inputs(client, manifest)]
+    assert [x[:2] for x in current_inputs(client, manifest)] == expected
+
+    print(f"{args.samples} samples (best of {args.repeat} runs)")
+    for name, inputs_fn in generators.items():
+        run = partial(consume, inputs_fn, client, manifest)
+        timings = repeat(run, number=1, repeat=args.repeat)
+        best = min(timings)
+        print(f"{name:>8}: {best:8.3f} s ({args.samples / best:10.0f} samples/s)")
+
+
+if __name__ == "__main__":
+    main()
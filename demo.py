@@ -7,10 +7,9 @@ import os
 from sys import argv
 
 import pandas as pd
-from prefect import flow, task, unmapped
+from prefect import flow, task
 from prefect.blocks.system import Secret
 
-import sagetasks.sevenbridges.general as sbggen
 import sagetasks.sevenbridges.prefect as sbg
 
 # specific task function imports
@@ -59,21 +58,17 @@ def prepare_file_imports(row):
 
 
 @task
-def call_import_volume_file(sbg_args, project_id, volume_id, row):
-    imported_file_id = sbggen.import_volume_file(
-        sbg_args,
-        project_id,
-        volume_id,
-        row.volume_path,
-        row.project_path,
-    )
-    row["cavatica_file_id"] = imported_file_id
-    return row
+def concat_rows(rows):
+    return pd.concat(rows, axis=1).T
 
 
 @task
-def concat_rows(rows):
-    return pd.concat(rows, axis=1).T
+def add_imported_file_ids(data_frame, imports):
+    errors = [f"{x['project_path']}: {x['error']}" for x in imports if x["error"]]
+    if errors:
+        raise RuntimeError("Failed to import files:\n" + "\n".join(errors))
+    data_frame["cavatica_file_id"] = [x["file_id"] for x in imports]
+    return data_frame
 
 
 # --------------------------------------------------------------
@@ -111,15 +106,17 @@ def demo(
     # Transform
     rows = split_rows(manifest)
     rows_prep = prepare_file_imports.map(rows)
+    manifest_prep = concat_rows(rows_prep)
 
     # Load
-    rows_imp = call_import_volume_file.map(
-        unmapped(sbg_args),
-        unmapped(project_id),
-        unmapped(volume_id),
-        rows_prep,
+    imports = sbg.import_volume_files(
+        sbg_args,
+        project_id,
+        volume_id,
+        manifest_prep.volume_path.tolist(),
+        manifest_prep.project_path.tolist(),
     )
-    sbg_manifest = concat_rows(rows_imp)
+    sbg_manifest = add_imported_file_ids(manifest_prep, imports)
     drafted_tasks = sbg.create_tasks(
         sbg_args, project_id, app_id, sbg_manifest, prepare_task_inputs
     )
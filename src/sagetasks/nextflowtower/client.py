@@ -1,25 +1,176 @@
+import asyncio
 import json
+import logging
 import os
 import re
-from typing import Iterator
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from itertools import islice
+from threading import Lock
+from typing import (
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import quote
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 
+from sagetasks.nextflowtower.metrics import MetricsRegistry, RequestEvent
+from sagetasks.nextflowtower.streaming import AsyncJsonItemStream, JsonItemStream
+from sagetasks.utils import Backoff, TokenBucket
 
-class TowerClient:
+logger = logging.getLogger(__name__)
+
+# HTTP methods that can safely be replayed
+IDEMPOTENT_METHODS = {"GET", "PUT", "DELETE"}
+
+# HTTP status codes worth retrying (429 is also retried for other methods)
+RETRY_STATUSES = {429, 502, 503, 504}
+
+# Token buckets shared by all clients using the same access token
+TOKEN_BUCKETS: Dict[tuple, TokenBucket] = dict()
+TOKEN_BUCKETS_LOCK = Lock()
+
+# Size of the chunks read from streamed response bodies
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def get_token_bucket(
+    tower_token: str, rate: float, capacity: Optional[float] = None
+) -> TokenBucket:
+    """Retrieve (or create) the token bucket shared for an access token.
+
+    Args:
+        tower_token (str): Tower access token.
+        rate (float): Number of requests allowed per second.
+        capacity (float, optional): Maximum burst size. Defaults to None.
+
+    Returns:
+        TokenBucket: Token bucket shared across clients.
+    """
+    key = (tower_token, rate, capacity)
+    with TOKEN_BUCKETS_LOCK:
+        if key not in TOKEN_BUCKETS:
+            TOKEN_BUCKETS[key] = TokenBucket(rate, capacity)
+        return TOKEN_BUCKETS[key]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convert a `Retry-After` header value into a number of seconds.
+
+    Args:
+        value (str, optional): Number of seconds or HTTP date.
+
+    Returns:
+        float, optional: Number of seconds (or None if unavailable).
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=timezone.utc)
+    delta = retry_date - datetime.now(timezone.utc)
+    return max(delta.total_seconds(), 0.0)
+
+
+class BaseTowerClient:
     def __init__(
         self,
         tower_token: str = None,
         tower_api_url: str = None,
         debug_mode: bool = False,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        timeout: Optional[float] = None,
+        max_retries: int = 3,
+        backoff_factor: float = 1,
+        max_backoff: float = 60,
+        rate_limit: Optional[float] = None,
+        burst: Optional[float] = None,
+        hooks: Optional[Iterable[Callable[[RequestEvent], None]]] = None,
+        metrics: Optional[MetricsRegistry] = None,
     ) -> None:
-        """Simple Python client for making requests to Nextflow Tower.
+        """Shared configuration for Nextflow Tower clients.
+
+        Each client owns a pooled HTTP session, which is shared by all
+        of its requests. This session is created lazily and can be
+        released by closing the client (or by using it as a context
+        manager).
+
+        Requests are optionally throttled with a token bucket shared by
+        all clients using the same access token. Failed requests are
+        retried with jittered exponential backoff, honoring the
+        `Retry-After` header. Only idempotent methods (GET, PUT, DELETE)
+        are retried after server errors or connection failures, whereas
+        other methods (e.g., POST `/workflow/launch`) are only retried
+        after a 429 response, i.e., when Tower refused the request. The
+        number of retries and throttled requests are available with
+        `stats()`.
+
+        Each request can be instrumented with its latency, status code,
+        bytes sent and received, endpoint template and retry count. These
+        `RequestEvent` records are passed to any `hooks` (including the
+        optional `metrics` registry) and, in debug mode, logged at the DEBUG
+        level. The level and handlers of the module logger are left to the
+        application (e.g., `logging.basicConfig(level=logging.DEBUG)`).
+        When there are no hooks and debug logging is disabled, requests
+        aren't measured at all.
 
         Args:
             tower_token (str): Tower (bearer) access token for authentication.
                 https://help.tower.nf/22.3/api/overview/#openapi
             tower_api_url (str): Base URL for the Tower API.
-            debug_mode (bool): Whether to log HTTP requests.
+            debug_mode (bool): Whether to log HTTP requests (including
+                their payloads and responses) at the DEBUG level.
+            pool_connections (int): Number of per-host connection pools
+                to cache. Defaults to 10.
+            pool_maxsize (int): Maximum number of connections to keep
+                open per host. Defaults to 10.
+            pool_block (bool): Whether to block when no free connection
+                is available for a host (instead of opening a throwaway
+                connection). Defaults to False.
+            keep_alive (bool): Whether to reuse connections between
+                requests. Defaults to True.
+            timeout (float, optional): Default timeout (in seconds) for
+                each request. Defaults to None (no timeout).
+            max_retries (int): Maximum number of retries per request.
+                Defaults to 3.
+            backoff_factor (float): Delay (in seconds) before the first
+                retry, which doubles for each subsequent retry. Defaults to 1.
+            max_backoff (float): Maximum delay (in seconds) between retries,
+                including delays requested with `Retry-After`. Defaults
+                to 60.
+            rate_limit (float, optional): Maximum number of requests per
+                second for the access token. Defaults to None (no limit).
+            burst (float, optional): Maximum number of requests that can
+                be sent in a burst when `rate_limit` is set. Defaults to
+                None, which uses `max(rate_limit, 1)`.
+            hooks (Iterable[Callable], optional): Functions called with a
+                `RequestEvent` after each request. Defaults to None.
+            metrics (MetricsRegistry, optional): Registry for aggregating
+                request metrics in-process. Defaults to None.
 
         Raises:
             KeyError: The 'NXF_TOWER_TOKEN' environment variable isn't defined
@@ -37,6 +188,16 @@ class TowerClient:
             or os.environ.get("TOWER_API_ENDPOINT")  # Backwards-compatible
         )
         self.debug = debug_mode or bool(int(os.environ.get("NXF_TOWER_DEBUG", 0)))
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self._stats: Counter = Counter()
+        self._stats_lock = Lock()
         # Check for empty values
         if self.tower_token is None:
             raise ValueError(
@@ -48,6 +209,13 @@ class TowerClient:
                 "Provide the Nextflow Tower API base URL using the `tower_api_url` "
                 "argument or the `NXF_TOWER_API_URL` environment variable."
             )
+        self.token_bucket = None
+        if rate_limit:
+            self.token_bucket = get_token_bucket(self.tower_token, rate_limit, burst)
+        self.metrics = metrics
+        self.hooks = list(hooks or ())
+        if metrics is not None:
+            self.hooks.append(metrics)
 
     def get_valid_name(self, full_name: str) -> str:
         """Generate Tower-friendly name from full name
@@ -60,61 +228,811 @@ class TowerClient:
         """
         return re.sub(r"[^A-Za-z0-9_-]", "-", full_name)
 
-    def request(self, method: str, endpoint: str, **kwargs) -> dict:
-        """Make an authenticated HTTP request to the Nextflow Tower API
+    def check_method(self, method: str) -> None:
+        """Ensure that the given HTTP method is supported.
 
         Args:
             method (str): An HTTP method (GET, PUT, POST, or DELETE)
-            endpoint (str): The API endpoint with the path parameters filled in
-            **kwargs: Additional named arguments passed through to
-                requests.request().
 
-        Returns:
-            Response: The raw Response object to allow for special handling
+        Raises:
+            ValueError: If the method isn't supported.
         """
         valid_methods = {"GET", "PUT", "POST", "DELETE"}
         if method not in valid_methods:
             raise ValueError(
                 f"Specified method ({method}) isn't a valid option ({valid_methods})."
             )
-        url = self.tower_api_base_url + endpoint
-        kwargs["headers"] = {"Authorization": f"Bearer {self.tower_token}"}
-        response = requests.request(method, url, **kwargs)
+
+    def increment(self, key: str, value: float = 1) -> None:
+        """Increment a client statistic in a thread-safe manner.
+
+        Args:
+            key (str): Statistic name.
+            value (float, optional): Increment. Defaults to 1.
+        """
+        with self._stats_lock:
+            self._stats[key] += value
+
+    def stats(self) -> dict:
+        """Summarize the number of requests, retries, and throttling events.
+
+        Returns:
+            dict: Client statistics, namely `requests`, `retries`,
+                `rate_limited` (429 responses), `throttled` (requests
+                delayed by the token bucket) and `throttle_seconds`.
+        """
+        keys = ("requests", "retries", "rate_limited", "throttled")
+        with self._stats_lock:
+            stats = {key: self._stats[key] for key in keys}
+            stats["throttle_seconds"] = self._stats["throttle_seconds"]
+        return stats
+
+    def reserve_token(self) -> float:
+        """Reserve a token for the next request (if rate-limited).
+
+        Returns:
+            float: Number of seconds to wait before sending the request.
+        """
+        self.increment("requests")
+        if self.token_bucket is None:
+            return 0.0
+        delay = self.token_bucket.reserve()
+        if delay > 0:
+            self.increment("throttled")
+            self.increment("throttle_seconds", delay)
+        return delay
+
+    def init_backoff(self) -> Backoff:
+        """Initialize the backoff schedule for retrying a request.
+
+        Returns:
+            Backoff: Jittered exponential backoff schedule.
+        """
+        return Backoff(self.backoff_factor, self.max_backoff, factor=2, jitter=0.5)
+
+    def get_retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        backoff: Backoff,
+        status_code: Optional[int] = None,
+        headers: Optional[Mapping] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Optional[float]:
+        """Determine whether (and when) a failed request should be retried.
+
+        Args:
+            method (str): The HTTP method used for the request.
+            attempt (int): Number of retries already made.
+            backoff (Backoff): Backoff schedule for the request.
+            status_code (int, optional): HTTP status code of the response.
+                Defaults to None, which indicates a connection failure.
+            headers (Mapping, optional): HTTP headers of the response.
+                Defaults to None.
+            idempotent (bool, optional): Whether the request can safely be
+                replayed. Defaults to None, which is based on the method.
+
+        Returns:
+            float, optional: Number of seconds to wait before retrying
+                (or None if the request shouldn't be retried).
+        """
+        if attempt >= self.max_retries:
+            return None
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        rate_limited = status_code == 429
+        if not rate_limited and not idempotent:
+            return None
+        if status_code is not None and status_code not in RETRY_STATUSES:
+            return None
+        delay = backoff.next()
+        retry_after = parse_retry_after((headers or {}).get("Retry-After"))
+        if retry_after is not None:
+            # Large server-supplied delays shouldn't stall the caller
+            delay = min(retry_after, self.max_backoff)
+        self.increment("retries")
+        if rate_limited:
+            self.increment("rate_limited")
+        return delay
+
+    def fill_endpoint(self, endpoint: str, path_params: Mapping) -> str:
+        """Fill in the path parameters of an endpoint template.
+
+        Args:
+            endpoint (str): The API endpoint template (e.g., `/workflow/{id}`).
+            path_params (Mapping): Values for the path parameters.
+
+        Returns:
+            str: The API endpoint with the path parameters filled in.
+        """
+        values = {key: quote(str(val), safe="") for key, val in path_params.items()}
+        return endpoint.format(**values)
+
+    def is_instrumented(self) -> bool:
+        """Whether requests need to be measured (for hooks or logging)."""
+        return bool(self.hooks) or (self.debug and logger.isEnabledFor(logging.DEBUG))
+
+    def measure_response(self, response, streamed: bool = False) -> Tuple[int, int]:
+        """Compute the number of bytes sent and received for a response.
+
+        Args:
+            response: The raw response (from `requests` or `httpx`).
+            streamed (bool, optional): Whether the response body is streamed,
+                in which case only the Content-Length header is used to
+                avoid reading the body. Defaults to False.
+
+        Returns:
+            Tuple[int, int]: Number of bytes sent and received.
+        """
+        if response is None:
+            return 0, 0
+        request = response.request
+        body = getattr(request, "body", None)
+        if body is None:
+            body = getattr(request, "content", None)
+        length = response.headers.get("Content-Length")
+        try:
+            if length or streamed:
+                bytes_received = int(length or 0)
+            else:
+                bytes_received = len(response.content)
+        except (TypeError, ValueError, httpx.ResponseNotRead):
+            bytes_received = 0
+        return len(body or b""), bytes_received
+
+    def record_request(
+        self,
+        method: str,
+        endpoint: str,
+        start: float,
+        response=None,
+        retries: int = 0,
+        error: Optional[Exception] = None,
+        streamed: bool = False,
+    ) -> RequestEvent:
+        """Report the measurements for a request to the logs and hooks.
+
+        Args:
+            method (str): The HTTP method used for the request.
+            endpoint (str): The API endpoint template.
+            start (float): Start time of the request (`time.perf_counter()`).
+            response (optional): The final raw response, if any.
+            retries (int, optional): Number of retries. Defaults to 0.
+            error (Exception, optional): Error raised by the request, if any.
+            streamed (bool, optional): Whether the response body is streamed.
+                Defaults to False.
+
+        Returns:
+            RequestEvent: Summary of the request.
+        """
+        elapsed = time.perf_counter() - start
+        status_code = getattr(response, "status_code", None)
+        bytes_sent, bytes_received = self.measure_response(response, streamed)
+        error_name = None if error is None else type(error).__name__
+        event = RequestEvent(
+            method,
+            endpoint,
+            status_code,
+            elapsed,
+            bytes_sent,
+            bytes_received,
+            retries,
+            error_name,
+        )
+        if self.debug:
+            logger.debug(
+                "%s %s -> %s in %.3fs (sent %d B, received %d B, %d retries)%s",
+                method,
+                endpoint,
+                status_code,
+                elapsed,
+                bytes_sent,
+                bytes_received,
+                retries,
+                f" [{error_name}]" if error_name else "",
+                extra={"tower_request": event._asdict()},
+            )
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.warning("Request hook %r failed.", hook, exc_info=True)
+        return event
+
+    def unpack_page(self, response: dict) -> Tuple[int, list]:
+        """Extract the total size and the items from a page of results.
+
+        Args:
+            response (dict): Decoded response for a paged endpoint.
+
+        Returns:
+            Tuple[int, list]: Total number of items and items in the page.
+        """
+        total_size = response.pop("totalSize", 0)
+        _, items = response.popitem()
+        return total_size, items
+
+    def init_page_offsets(self, total_size: int, first_page_size: int) -> range:
+        """Compute the offsets of the pages after the first one.
+
+        The page step is taken from the size of the first page, which
+        accounts for servers that cap the number of items per page.
+
+        Args:
+            total_size (int): Total number of items.
+            first_page_size (int): Number of items in the first page.
+
+        Returns:
+            range: Offsets for the remaining pages.
+        """
+        if first_page_size == 0:
+            return range(0)
+        return range(first_page_size, total_size, first_page_size)
+
+    def parse_response(self, method: str, url: str, response, **kwargs) -> dict:
+        """Check the status of a response and decode its JSON body.
+
+        Args:
+            method (str): The HTTP method used for the request.
+            url (str): The full URL used for the request.
+            response: The raw response (from `requests` or `httpx`).
+            **kwargs: The named arguments used for the request.
+
+        Returns:
+            dict: The decoded JSON body (or an empty dictionary).
+        """
         response.raise_for_status()
         try:
             result = response.json()
         except json.decoder.JSONDecodeError:
             result = dict()
+        self.log_response(method, url, result, **kwargs)
+        return result
+
+    def log_response(self, method: str, url: str, result, **kwargs) -> None:
+        """Log the details of a request and its response in debug mode.
+
+        Args:
+            method (str): The HTTP method used for the request.
+            url (str): The full URL used for the request.
+            result: The decoded response (or a placeholder if streamed).
+            **kwargs: The named arguments used for the request.
+        """
         if self.debug:
-            # TODO: Switch from print to logging
-            print(f"\nEndpoint:\t {method} {url}")
-            print(f"Params: \t {kwargs.get('params')}")
-            print(f"Payload:\t {kwargs.get('json')}")
-            print(f"Status Code:\t {response.status_code} / {response.reason}")
-            print(f"Response:\t {result}")
+            logger.debug(
+                "%s %s\nParams: %s\nPayload: %s\nResponse: %s",
+                method,
+                url,
+                kwargs.get("params"),
+                kwargs.get("json"),
+                result,
+            )
+
+    def next_stream_offset(
+        self, offset: int, count: int, page: Union[JsonItemStream, AsyncJsonItemStream]
+    ) -> Optional[int]:
+        """Compute the offset of the next page when streaming pages.
+
+        Args:
+            offset (int): Offset of the page that was just streamed.
+            count (int): Number of items in that page.
+            page (JsonItemStream or AsyncJsonItemStream): The exhausted
+                page stream.
+
+        Returns:
+            int, optional: Offset of the next page (or None if done).
+        """
+        total_size = page.fields.get("totalSize", 0)
+        offset += count
+        if count == 0 or offset >= total_size:
+            return None
+        return offset
+
+
+class TowerClient(BaseTowerClient):
+    def __init__(self, *args, **kwargs) -> None:
+        """Simple Python client for making requests to Nextflow Tower.
+
+        The client owns a pooled HTTP session, which is shared by all
+        requests (including those made by `TowerUtils` methods). This
+        session is created lazily and can be released with `close()`
+        or by using the client as a context manager. The underlying
+        connection pool is thread-safe, so a single client can be
+        shared across threads.
+
+        See `BaseTowerClient` for the available arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self._session: Optional[requests.Session] = None
+        self._session_lock = Lock()
+
+    def __enter__(self) -> "TowerClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def session(self) -> requests.Session:
+        """Retrieve (or create) the pooled HTTP session.
+
+        Returns:
+            requests.Session: Authenticated session shared by all requests.
+        """
+        with self._session_lock:
+            if self._session is None:
+                self._session = self.init_session()
+            return self._session
+
+    def init_session(self) -> requests.Session:
+        """Initialize an authenticated HTTP session with a connection pool.
+
+        Returns:
+            requests.Session: Authenticated session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["Authorization"] = f"Bearer {self.tower_token}"
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def close(self) -> None:
+        """Close the HTTP session and release pooled connections.
+
+        The client remains usable afterwards; a new session will be
+        created on the next request.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        idempotent: Optional[bool] = None,
+        path_params: Optional[Mapping] = None,
+        stream: bool = False,
+        **kwargs,
+    ):
+        """Make an authenticated HTTP request to the Nextflow Tower API
+
+        Args:
+            method (str): An HTTP method (GET, PUT, POST, or DELETE)
+            endpoint (str): The API endpoint, either with the path parameters
+                filled in or as a template (e.g., `/workflow/{workflow_id}`)
+                when `path_params` is provided
+            idempotent (bool, optional): Whether the request can safely be
+                retried after server errors or connection failures.
+                Defaults to None, which is based on the method.
+            path_params (Mapping, optional): Values for the path parameters
+                in the endpoint template. Using a template allows requests
+                to be aggregated by endpoint in metrics. Defaults to None.
+            stream (bool, optional): Whether to decode the items of the
+                response incrementally as the body is downloaded rather
+                than loading the whole body at once. Defaults to False.
+            **kwargs: Additional named arguments passed through to
+                requests.Session.request().
+
+        Returns:
+            dict: The decoded JSON response, or a `JsonItemStream` over
+                the items in the response if `stream` is enabled
+        """
+        self.check_method(method)
+        template = endpoint
+        if path_params:
+            endpoint = self.fill_endpoint(endpoint, path_params)
+        url = self.tower_api_base_url + endpoint
+        kwargs.setdefault("timeout", self.timeout)
+        if stream:
+            kwargs["stream"] = True
+        instrumented = self.is_instrumented()
+        start = time.perf_counter() if instrumented else 0.0
+        backoff = self.init_backoff()
+        attempt = 0
+        response = None
+        try:
+            while True:
+                delay = self.reserve_token()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout):
+                    response = None
+                    retry_delay = self.get_retry_delay(
+                        method, attempt, backoff, idempotent=idempotent
+                    )
+                    if retry_delay is None:
+                        raise
+                else:
+                    status_code = response.status_code
+                    headers = response.headers
+                    retry_delay = None
+                    if status_code in RETRY_STATUSES:
+                        retry_delay = self.get_retry_delay(
+                            method, attempt, backoff, status_code, headers, idempotent
+                        )
+                    if retry_delay is None:
+                        break
+                    response.close()
+                attempt += 1
+                time.sleep(retry_delay)
+            if stream:
+                kwargs.pop("stream")
+                result = self.stream_response(method, url, response, **kwargs)
+            else:
+                result = self.parse_response(method, url, response, **kwargs)
+        except Exception as error:
+            if instrumented:
+                self.record_request(
+                    method, template, start, response, attempt, error, stream
+                )
+            raise
+        if instrumented:
+            self.record_request(
+                method, template, start, response, attempt, streamed=stream
+            )
         return result
 
-    def paged_request(self, method: str, endpoint: str, **kwargs) -> Iterator[dict]:
+    def stream_response(
+        self, method: str, url: str, response: requests.Response, **kwargs
+    ) -> JsonItemStream:
+        """Check the status of a streamed response and decode it lazily.
+
+        Args:
+            method (str): The HTTP method used for the request.
+            url (str): The full URL used for the request.
+            response (requests.Response): The raw (streamed) response.
+            **kwargs: The named arguments used for the request.
+
+        Returns:
+            JsonItemStream: Iterable over the items in the response.
+        """
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        self.log_response(method, url, "<streamed>", **kwargs)
+        chunks = response.iter_content(STREAM_CHUNK_SIZE)
+        return JsonItemStream(chunks, close=response.close)
+
+    def paged_request(
+        self,
+        method: str,
+        endpoint: str,
+        page_size: int = 50,
+        max_workers: int = 4,
+        stream: bool = False,
+        **kwargs,
+    ) -> Iterator[dict]:
         """Iterate through pages of results for a given request
 
+        The first page is retrieved on its own to learn the total number
+        of items. The remaining pages are then prefetched concurrently
+        with a thread pool. Items are still yielded in order, and at most
+        `max_workers` pages are fetched ahead of the consumer, which
+        keeps memory usage bounded.
+
         Args:
             method (str): An HTTP method (GET, PUT, POST, or DELETE)
             endpoint (str): The API endpoint with the path parameters filled in
+            page_size (int): Number of items requested per page.
+                Defaults to 50.
+            max_workers (int): Maximum number of pages fetched concurrently
+                (and thus prefetched ahead of the consumer). Defaults to 4.
+            stream (bool): Whether to decode each page incrementally, which
+                bounds memory usage by a single item rather than by pages.
+                Pages are then fetched one at a time. Defaults to False.
             **kwargs: Additional named arguments passed through to
-                requests.request().
+                requests.Session.request().
 
         Returns:
             Iterator[Dict]: An iterator traversing through pages of responses
         """
         params = kwargs.pop("params", {})
-        params["max"] = 50
-        num_items = 0
-        total_size = 1  # Artificial value for initiating the while-loop
-        while num_items < total_size:
-            params["offset"] = num_items
-            response = self.request(method, endpoint, params=params, **kwargs)
-            total_size = response.pop("totalSize", 0)
-            _, items = response.popitem()
-            for item in items:
-                num_items += 1
-                yield item
+
+        if stream:
+            offset: Optional[int] = 0
+            while offset is not None:
+                page_params = dict(params, max=page_size, offset=offset)
+                page = self.request(
+                    method, endpoint, params=page_params, stream=True, **kwargs
+                )
+                count = 0
+                with page:
+                    for item in page:
+                        count += 1
+                        yield item
+                offset = self.next_stream_offset(offset, count, page)
+            return
+
+        def get_page(offset):
+            page_params = dict(params, max=page_size, offset=offset)
+            response = self.request(method, endpoint, params=page_params, **kwargs)
+            return self.unpack_page(response)
+
+        total_size, items = get_page(0)
+        yield from items
+        offsets = iter(self.init_page_offsets(total_size, len(items)))
+        pending: Deque[Future] = deque()
+        executor = ThreadPoolExecutor(max_workers)
+        try:
+            while True:
+                for offset in islice(offsets, max_workers - len(pending)):
+                    pending.append(executor.submit(get_page, offset))
+                if not pending:
+                    break
+                _, items = pending.popleft().result()
+                yield from items
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown()
+
+
+class AsyncTowerClient(BaseTowerClient):
+    def __init__(self, *args, **kwargs) -> None:
+        """Asyncio-native Python client for making requests to Nextflow Tower.
+
+        This client mirrors `TowerClient`, but its request methods are
+        coroutines (or asynchronous iterators) backed by `httpx`. Many
+        requests can thus be in flight concurrently on a single event
+        loop. The pooled session can be released with `aclose()` or by
+        using the client as an asynchronous context manager.
+
+        See `BaseTowerClient` for the available arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self._session: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "AsyncTowerClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """Retrieve (or create) the pooled asynchronous HTTP session.
+
+        Returns:
+            httpx.AsyncClient: Authenticated session shared by all requests.
+        """
+        if self._session is None:
+            self._session = self.init_session()
+        return self._session
+
+    def init_session(self) -> httpx.AsyncClient:
+        """Initialize an authenticated asynchronous HTTP session.
+
+        Returns:
+            httpx.AsyncClient: Authenticated session.
+        """
+        keepalive = self.pool_maxsize if self.keep_alive else 0
+        limits = httpx.Limits(
+            max_connections=self.pool_maxsize,
+            max_keepalive_connections=keepalive,
+        )
+        headers = {"Authorization": f"Bearer {self.tower_token}"}
+        session = httpx.AsyncClient(
+            headers=headers, limits=limits, timeout=self.timeout
+        )
+        return session
+
+    async def aclose(self) -> None:
+        """Close the HTTP session and release pooled connections."""
+        if self._session is not None:
+            await self._session.aclose()
+            self._session = None
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        idempotent: Optional[bool] = None,
+        path_params: Optional[Mapping] = None,
+        stream: bool = False,
+        **kwargs,
+    ):
+        """Make an authenticated HTTP request to the Nextflow Tower API
+
+        Args:
+            method (str): An HTTP method (GET, PUT, POST, or DELETE)
+            endpoint (str): The API endpoint, either with the path parameters
+                filled in or as a template (e.g., `/workflow/{workflow_id}`)
+                when `path_params` is provided
+            idempotent (bool, optional): Whether the request can safely be
+                retried after server errors or connection failures.
+                Defaults to None, which is based on the method.
+            path_params (Mapping, optional): Values for the path parameters
+                in the endpoint template. Using a template allows requests
+                to be aggregated by endpoint in metrics. Defaults to None.
+            stream (bool, optional): Whether to decode the items of the
+                response incrementally as the body is downloaded rather
+                than loading the whole body at once. Defaults to False.
+            **kwargs: Additional named arguments passed through to
+                httpx.AsyncClient.request().
+
+        Returns:
+            dict: The decoded JSON response, or an `AsyncJsonItemStream`
+                over the items in the response if `stream` is enabled
+        """
+        self.check_method(method)
+        template = endpoint
+        if path_params:
+            endpoint = self.fill_endpoint(endpoint, path_params)
+        url = self.tower_api_base_url + endpoint
+        instrumented = self.is_instrumented()
+        start = time.perf_counter() if instrumented else 0.0
+        backoff = self.init_backoff()
+        attempt = 0
+        response = None
+        try:
+            while True:
+                delay = self.reserve_token()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    response = await self.send(method, url, stream, **kwargs)
+                except httpx.TransportError:
+                    response = None
+                    retry_delay = self.get_retry_delay(
+                        method, attempt, backoff, idempotent=idempotent
+                    )
+                    if retry_delay is None:
+                        raise
+                else:
+                    status_code = response.status_code
+                    headers = response.headers
+                    retry_delay = None
+                    if status_code in RETRY_STATUSES:
+                        retry_delay = self.get_retry_delay(
+                            method, attempt, backoff, status_code, headers, idempotent
+                        )
+                    if retry_delay is None:
+                        break
+                    await response.aclose()
+                attempt += 1
+                await asyncio.sleep(retry_delay)
+            if stream:
+                result = await self.stream_response(method, url, response, **kwargs)
+            else:
+                result = self.parse_response(method, url, response, **kwargs)
+        except Exception as error:
+            if instrumented:
+                self.record_request(
+                    method, template, start, response, attempt, error, stream
+                )
+            raise
+        if instrumented:
+            self.record_request(
+                method, template, start, response, attempt, streamed=stream
+            )
+        return result
+
+    async def send(
+        self, method: str, url: str, stream: bool = False, **kwargs
+    ) -> httpx.Response:
+        """Send a request, optionally without reading the response body.
+
+        Args:
+            method (str): An HTTP method (GET, PUT, POST, or DELETE)
+            url (str): The full URL for the request.
+            stream (bool, optional): Whether to leave the response body
+                unread for streaming. Defaults to False.
+            **kwargs: Additional named arguments passed through to
+                httpx.AsyncClient.build_request().
+
+        Returns:
+            httpx.Response: The raw response.
+        """
+        if not stream:
+            return await self.session.request(method, url, **kwargs)
+        request = self.session.build_request(method, url, **kwargs)
+        return await self.session.send(request, stream=True)
+
+    async def stream_response(
+        self, method: str, url: str, response: httpx.Response, **kwargs
+    ) -> AsyncJsonItemStream:
+        """Check the status of a streamed response and decode it lazily.
+
+        Args:
+            method (str): The HTTP method used for the request.
+            url (str): The full URL used for the request.
+            response (httpx.Response): The raw (streamed) response.
+            **kwargs: The named arguments used for the request.
+
+        Returns:
+            AsyncJsonItemStream: Asynchronous iterable over the items
+                in the response.
+        """
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            response.raise_for_status()
+        self.log_response(method, url, "<streamed>", **kwargs)
+        chunks = response.aiter_bytes(STREAM_CHUNK_SIZE)
+        return AsyncJsonItemStream(chunks, close=response.aclose)
+
+    async def paged_request(
+        self,
+        method: str,
+        endpoint: str,
+        page_size: int = 50,
+        max_workers: int = 4,
+        stream: bool = False,
+        **kwargs,
+    ) -> AsyncIterator[dict]:
+        """Iterate through pages of results for a given request
+
+        Like `TowerClient.paged_request()`, the remaining pages are
+        prefetched concurrently once the first page reveals the total
+        number of items, while items are yielded in order.
+
+        Args:
+            method (str): An HTTP method (GET, PUT, POST, or DELETE)
+            endpoint (str): The API endpoint with the path parameters filled in
+            page_size (int): Number of items requested per page.
+                Defaults to 50.
+            max_workers (int): Maximum number of pages fetched concurrently
+                (and thus prefetched ahead of the consumer). Defaults to 4.
+            stream (bool): Whether to decode each page incrementally, which
+                bounds memory usage by a single item rather than by pages.
+                Pages are then fetched one at a time. Defaults to False.
+            **kwargs: Additional named arguments passed through to
+                httpx.AsyncClient.request().
+
+        Returns:
+            AsyncIterator[Dict]: An iterator traversing through pages of responses
+        """
+        params = kwargs.pop("params", {})
+
+        if stream:
+            offset: Optional[int] = 0
+            while offset is not None:
+                page_params = dict(params, max=page_size, offset=offset)
+                page = await self.request(
+                    method, endpoint, params=page_params, stream=True, **kwargs
+                )
+                count = 0
+                async with page:
+                    async for item in page:
+                        count += 1
+                        yield item
+                offset = self.next_stream_offset(offset, count, page)
+            return
+
+        async def get_page(offset):
+            page_params = dict(params, max=page_size, offset=offset)
+            response = await self.request(
+                method, endpoint, params=page_params, **kwargs
+            )
+            return self.unpack_page(response)
+
+        total_size, items = await get_page(0)
+        for item in items:
+            yield item
+        offsets = iter(self.init_page_offsets(total_size, len(items)))
+        pending: Deque[asyncio.Task] = deque()
+        try:
+            while True:
+                for offset in islice(offsets, max_workers - len(pending)):
+                    pending.append(asyncio.ensure_future(get_page(offset)))
+                if not pending:
+                    break
+                _, items = await pending.popleft()
+                for item in items:
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
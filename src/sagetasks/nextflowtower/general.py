@@ -68,3 +68,36 @@ def launch_workflow(
         pre_run_script=pre_run_script,
     )
     return workflow
+
+
+def launch_batch(
+    specs_path: str,
+    workspace_id=None,
+    max_workers: int = 4,
+    client_args=None,
+):
+    """Launch a batch of workflow runs on Nextflow Tower.
+
+    The launch specifications are read from a JSONL or CSV file
+    (based on the `.csv` extension). Each JSON line or CSV row
+    contains the arguments of the `launch-workflow` command using
+    their Python names (_e.g._ `compute_env_id`, `pipeline`,
+    `run_name`). In CSV files, list arguments like `profiles`
+    are comma-separated.
+
+    Launches are submitted in parallel, and a result is reported
+    for each specification, including any error message.
+
+    You can provide your Tower credentials with the following
+    environment variables:
+
+    - NXF_TOWER_TOKEN='<tower-access-token>'
+
+    - NXF_TOWER_API_URL='<tower-api-url>'
+    """
+    client_args = client_args or dict()
+    specs = TowerUtils.read_launch_specs(specs_path)
+    with TowerUtils(client_args) as utils:
+        utils.open_workspace(workspace_id)
+        results = utils.launch_workflows(specs, max_workers=max_workers)
+    return results
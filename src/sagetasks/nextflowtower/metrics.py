@@ -0,0 +1,145 @@
+from collections import Counter, defaultdict, deque
+from threading import Lock
+from typing import Deque, Dict, NamedTuple, Optional
+
+
+class RequestEvent(NamedTuple):
+    """Summary of a completed (or failed) request to the Tower API."""
+
+    method: str
+    endpoint: str
+    status_code: Optional[int]
+    elapsed: float
+    bytes_sent: int
+    bytes_received: int
+    retries: int
+    error: Optional[str] = None
+
+
+class Histogram:
+    def __init__(self, max_samples: int = 1024) -> None:
+        """Running summary of a series of values with approximate quantiles.
+
+        The count, sum, minimum and maximum are exact, whereas quantiles
+        are computed from the most recent `max_samples` values.
+
+        Args:
+            max_samples (int, optional): Number of recent values kept for
+                computing quantiles. Defaults to 1024.
+        """
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+
+    def add(self, value: float) -> None:
+        """Add a value to the histogram.
+
+        Args:
+            value (float): Observed value.
+        """
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.samples.append(value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile from the recent values.
+
+        Args:
+            q (float): Quantile between 0 and 1.
+
+        Returns:
+            float, optional: Estimated quantile (or None if empty).
+        """
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(int(q * len(ordered)), len(ordered) - 1)
+        return ordered[index]
+
+    def summary(self) -> dict:
+        """Summarize the histogram.
+
+        Returns:
+            dict: Count, sum, mean, min, max, and the 50th, 90th and
+                99th percentiles.
+        """
+        mean = self.total / self.count if self.count else None
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": mean,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self, max_samples: int = 1024) -> None:
+        """Thread-safe in-process registry of Tower request metrics.
+
+        Metrics are grouped by HTTP method and endpoint template (e.g.,
+        `GET /workflow/{workflow_id}`), which keeps their number bounded.
+        An instance can be passed to the `metrics` argument of a Tower
+        client, and the same registry can be shared by many clients.
+
+        Args:
+            max_samples (int, optional): Number of recent values kept per
+                histogram for computing quantiles. Defaults to 1024.
+        """
+        self.max_samples = max_samples
+        self._lock = Lock()
+        self.reset()
+
+    def __call__(self, event: RequestEvent) -> None:
+        self.record(event)
+
+    def reset(self) -> None:
+        """Clear all recorded metrics."""
+        with self._lock:
+            self._latency: Dict[str, Histogram] = defaultdict(self._init_histogram)
+            self._statuses: Dict[str, Counter] = defaultdict(Counter)
+            self._totals: Dict[str, Counter] = defaultdict(Counter)
+
+    def _init_histogram(self) -> Histogram:
+        return Histogram(self.max_samples)
+
+    def record(self, event: RequestEvent) -> None:
+        """Record the metrics for a request.
+
+        Args:
+            event (RequestEvent): Summary of the request.
+        """
+        key = f"{event.method} {event.endpoint}"
+        status = event.status_code or event.error or "unknown"
+        with self._lock:
+            self._latency[key].add(event.elapsed)
+            self._statuses[key][status] += 1
+            totals = self._totals[key]
+            totals["bytes_sent"] += event.bytes_sent
+            totals["bytes_received"] += event.bytes_received
+            totals["retries"] += event.retries
+            totals["errors"] += event.error is not None
+
+    def summary(self) -> Dict[str, dict]:
+        """Summarize the recorded metrics for each endpoint.
+
+        Returns:
+            Dict[str, dict]: Latency summary (in seconds), status counts
+                and byte/retry/error totals, keyed by method and endpoint.
+        """
+        with self._lock:
+            return {
+                key: {
+                    "latency": histogram.summary(),
+                    "statuses": dict(self._statuses[key]),
+                    **self._totals[key],
+                }
+                for key, histogram in self._latency.items()
+            }
@@ -0,0 +1,230 @@
+import codecs
+import json
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+WHITESPACE = " \t\n\r"
+
+
+class JsonItemDecoder:
+    def __init__(self) -> None:
+        """Incremental decoder for JSON objects containing item arrays.
+
+        Tower responses for paged endpoints are JSON objects with a single
+        array of items (e.g., `{"workflows": [...], "totalSize": 123}`).
+        This decoder is fed the raw response body in chunks and returns
+        the items of top-level arrays as soon as they are fully decoded,
+        so only one item needs to be held in memory at a time. The other
+        top-level values are collected in the `fields` attribute, whereas
+        the key of the (last) item array is stored in `items_key`.
+
+        Only the top level is parsed incrementally; each item is decoded
+        with the standard JSON decoder once all of its bytes are received.
+        """
+        self.fields: dict = dict()
+        self.items_key: Optional[str] = None
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = "start"
+        self._key: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the end of the top-level object was reached."""
+        return self._state == "done"
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Decode the next chunk of the response body.
+
+        Args:
+            data (bytes): Next chunk of the response body.
+
+        Returns:
+            List[Any]: Items that were fully decoded in this chunk.
+        """
+        self._buffer += self._text.decode(data)
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """Decode whatever remains after the last chunk.
+
+        Returns:
+            List[Any]: Items that were decoded from the remaining data.
+
+        Raises:
+            ValueError: If the response body is not a complete JSON object.
+        """
+        self._buffer += self._text.decode(b"", final=True)
+        items = self._parse(final=True)
+        if not self.done:
+            raise ValueError("Incomplete JSON object in response body.")
+        return items
+
+    def _decode_value(self, pos: int, final: bool):
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None, None
+        # Numbers (and literals) can continue in the next chunk
+        if end == len(self._buffer) and not final:
+            return None, None
+        return value, end
+
+    def _parse(self, final: bool) -> List[Any]:
+        items = list()
+        buffer = self._buffer
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if self._state == "start":
+                if char != "{":
+                    raise ValueError(f"Expected a JSON object, not '{char}'.")
+                self._state = "key"
+                pos += 1
+            elif self._state == "key":
+                if char in ",}":
+                    self._state = "key" if char == "," else "done"
+                    pos += 1
+                    continue
+                key, end = self._decode_value(pos, final)
+                if end is None:
+                    break
+                self._key, pos = key, end
+                self._state = "colon"
+            elif self._state == "colon":
+                if char != ":":
+                    raise ValueError(f"Expected ':' after key, not '{char}'.")
+                self._state = "value"
+                pos += 1
+            elif self._state == "value":
+                if char == "[":
+                    self.items_key = self._key
+                    self._state = "items"
+                    pos += 1
+                    continue
+                value, end = self._decode_value(pos, final)
+                if end is None:
+                    break
+                self.fields[self._key] = value
+                self._state = "key"
+                pos = end
+            elif self._state == "items":
+                if char in ",]":
+                    self._state = "items" if char == "," else "key"
+                    pos += 1
+                    continue
+                item, end = self._decode_value(pos, final)
+                if end is None:
+                    break
+                items.append(item)
+                pos = end
+            else:
+                raise ValueError("Unexpected data after the JSON object.")
+        self._buffer = buffer[pos:]
+        return items
+
+
+class JsonItemStream:
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        close: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Iterable over the items of a streamed JSON response body.
+
+        The top-level values other than the item array (e.g., `totalSize`)
+        are available from the `fields` attribute once the iteration is
+        complete, since they can appear after the items.
+
+        Args:
+            chunks (Iterable[bytes]): Chunks of the response body.
+            close (Callable, optional): Function releasing the underlying
+                connection. It's called once the body is exhausted or when
+                the stream is closed early. Defaults to None.
+        """
+        self.chunks = chunks
+        self.decoder = JsonItemDecoder()
+        self._close = close
+
+    @property
+    def fields(self) -> dict:
+        return self.decoder.fields
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            for chunk in self.chunks:
+                yield from self.decoder.feed(chunk)
+            yield from self.decoder.close()
+        finally:
+            self.close()
+
+    def __enter__(self) -> "JsonItemStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the underlying connection."""
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+
+class AsyncJsonItemStream:
+    def __init__(
+        self,
+        chunks: AsyncIterable[bytes],
+        close: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """Asynchronous version of `JsonItemStream`.
+
+        Args:
+            chunks (AsyncIterable[bytes]): Chunks of the response body.
+            close (Callable, optional): Coroutine function releasing the
+                underlying connection. Defaults to None.
+        """
+        self.chunks = chunks
+        self.decoder = JsonItemDecoder()
+        self._close = close
+
+    @property
+    def fields(self) -> dict:
+        return self.decoder.fields
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        try:
+            async for chunk in self.chunks:
+                for item in self.decoder.feed(chunk):
+                    yield item
+            for item in self.decoder.close():
+                yield item
+        finally:
+            await self.aclose()
+
+    async def __aenter__(self) -> "AsyncJsonItemStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Release the underlying connection."""
+        if self._close is not None:
+            close, self._close = self._close, None
+            await close()
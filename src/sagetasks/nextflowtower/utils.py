@@ -1,8 +1,31 @@
+import asyncio
+import csv
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from datetime import datetime
-from typing import List, Mapping, Optional
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
 
-from sagetasks.nextflowtower.client import TowerClient
-from sagetasks.utils import dedup, update_dict
+from sagetasks.nextflowtower.client import AsyncTowerClient, TowerClient
+from sagetasks.nextflowtower.workflows import (
+    WorkflowHandle,
+    WorkflowTransition,
+    WorkflowWatcher,
+)
+from sagetasks.utils import TtlCache, dedup, update_dict
 
 ENDPOINTS = {
     "tower.nf": "https://tower.nf/api",
@@ -10,12 +33,124 @@ ENDPOINTS = {
     "sage-dev": "https://tower-dev.sagebionetworks.org/api",
 }
 
+# Launch arguments that expect a list of values
+LIST_LAUNCH_ARGUMENTS = ("profiles", "user_secrets", "workspace_secrets")
 
-class TowerUtils:
+# Number of seconds for which compute environments are cached by default
+COMPUTE_ENV_CACHE_TTL = float(os.environ.get("TOWER_COMPUTE_ENV_CACHE_TTL", 300))
+
+# Process-wide cache of compute environments (see `shared_cache` argument)
+COMPUTE_ENV_CACHE = TtlCache(ttl=COMPUTE_ENV_CACHE_TTL, maxsize=128)
+
+
+def set_shared_cache_ttl(ttl: Optional[float]) -> None:
+    """Set the TTL of the process-wide compute environment cache.
+
+    This affects every instance created with `shared_cache=True`,
+    including existing ones.
+
+    Args:
+        ttl (float, optional): Number of seconds for which compute
+            environments are cached. Set to None to disable expiry.
+    """
+    COMPUTE_ENV_CACHE.ttl = ttl
+
+
+def init_launch_data(compute_env_id: str, compute_env: Mapping) -> dict:
+    """Initialize request for `/workflow/launch` from a compute environment.
+
+    Args:
+        compute_env_id (str): Compute environment alphanumerical ID.
+        compute_env (Mapping): Information about the compute environment,
+            as returned by `get_compute_env()`.
+
+    Raises:
+        ValueError: If the compute environment is not available.
+
+    Returns:
+        dict: Initial request for `/workflow/launch` endpoint.
+    """
+    if compute_env["status"] != "AVAILABLE":
+        ce_name = compute_env["name"]
+        raise ValueError(f"The compute environment ({ce_name}) is not available.")
+    ce_config = compute_env["config"]
+    # Replicating date format in requests made by Tower frontend
+    now_utc = datetime.now().isoformat()[:-3] + "Z"
+    data = {
+        "launch": {
+            "computeEnvId": compute_env_id,
+            "configProfiles": [],
+            "configText": None,
+            "dateCreated": now_utc,
+            "entryName": None,
+            "id": None,
+            "mainScript": None,
+            "paramsText": None,
+            "pipeline": None,
+            "postRunScript": ce_config["postRunScript"],
+            "preRunScript": ce_config["preRunScript"],
+            "pullLatest": None,
+            "revision": None,
+            "runName": None,
+            "schemaName": None,
+            "stubRun": None,
+            "towerConfig": None,
+            "userSecrets": [],
+            "workDir": ce_config["workDir"],
+            "workspaceSecrets": [],
+        }
+    }
+    return data
+
+
+def init_launch_arguments(
+    pipeline: str,
+    revision: Optional[str] = None,
+    params_yaml: Optional[str] = None,
+    params_json: Optional[str] = None,
+    nextflow_config: Optional[str] = None,
+    run_name: Optional[str] = None,
+    work_dir: Optional[str] = None,
+    profiles: Optional[List[str]] = (),
+    user_secrets: Optional[List[str]] = (),
+    workspace_secrets: Optional[List[str]] = (),
+    pre_run_script: Optional[str] = None,
+) -> dict:
+    """Prepare the `/workflow/launch` overrides from launch arguments.
+
+    See `TowerUtils.launch_workflow()` for a description of each argument.
+
+    Returns:
+        dict: Overrides to apply onto the initial launch request.
+    """
+    arguments = {
+        "launch": {
+            "configProfiles": dedup(profiles),
+            "configText": nextflow_config,
+            # TODO: Validate YAML or JSON
+            "paramsText": params_yaml or params_json,
+            "pipeline": pipeline,
+            "preRunScript": pre_run_script,
+            "revision": revision,
+            # TODO: Avoid duplicate run names
+            "runName": run_name,
+            "userSecrets": dedup(user_secrets),
+            "workDir": work_dir,
+            "workspaceSecrets": dedup(workspace_secrets),
+        }
+    }
+    return arguments
+
+
+class BaseTowerUtils:
     def __init__(
-        self, client_args: Mapping, workspace_id: Optional[int] = None
+        self,
+        client_args: Mapping,
+        workspace_id: Optional[int] = None,
+        cache_ttl: Optional[float] = COMPUTE_ENV_CACHE_TTL,
+        shared_cache: bool = False,
     ) -> None:
-        """Initialize TowerUtils for interacting with the Tower API.
+        """Shared logic for interacting with the Tower API.
 
         Args:
             client_args (Mapping): Bundled client arguments, which can
@@ -23,11 +158,35 @@ class TowerUtils:
                 static method.
             workspace (int, optional): Tower workspace identifier.
                 Defaults to None with no opened workspace.
+            cache_ttl (float, optional): Number of seconds for which
+                compute environments are cached by this instance. It only
+                applies to per-instance caches. Defaults to the
+                `TOWER_COMPUTE_ENV_CACHE_TTL` environment variable (or 300).
+            shared_cache (bool, optional): Whether to use the process-wide
+                compute environment cache instead of a per-instance cache.
+                Its TTL is set with the `TOWER_COMPUTE_ENV_CACHE_TTL`
+                environment variable or `set_shared_cache_ttl()`.
+                Defaults to False.
         """
         # TODO: Validate access token (by attempting a simple auth'ed request)
-        self.client = TowerClient(**client_args)
+        self.client = self.init_client(client_args)
         self._workspace: Optional[int] = None
         self.open_workspace(workspace_id)
+        if shared_cache:
+            self.compute_env_cache = COMPUTE_ENV_CACHE
+        else:
+            self.compute_env_cache = TtlCache(ttl=cache_ttl)
+
+    def init_client(self, client_args: Mapping):
+        """Initialize the Tower client used for requests.
+
+        Args:
+            client_args (Mapping): Bundled client arguments.
+
+        Raises:
+            NotImplementedError: If not implemented by a subclass.
+        """
+        raise NotImplementedError
 
     @property
     def workspace(self) -> int:
@@ -61,14 +220,69 @@ class TowerUtils:
         """Clear default workspace for workspace-related requests."""
         self._workspace = None
 
-    def init_params(self) -> dict:
+    def init_params(self, workspace_id: Optional[int] = None) -> dict:
         """Initialize query-string parameters with workspace ID.
 
+        Args:
+            workspace_id (int, optional): Tower workspace identifier.
+                Defaults to None, which uses the opened workspace.
+
         Returns:
             dict: Parameters for workspace-related requests,
-                which can be passed to `requests.request`.
+                which can be passed to `TowerClient.request`.
+        """
+        return {"workspaceId": workspace_id or self.workspace}
+
+    @staticmethod
+    def read_launch_specs(path: str) -> Iterator[dict]:
+        """Read workflow launch specifications from a JSONL or CSV file.
+
+        Each JSON line (or CSV row) contains the named arguments for
+        `launch_workflow()`. In CSV files, empty cells are
+        ignored and list arguments (e.g., `profiles`) are comma-separated.
+
+        Args:
+            path (str): Path to a `.jsonl` or `.csv` file.
+
+        Yields:
+            Iterator[dict]: Launch specification for each workflow.
+        """
+        with open(path, newline="") as file:
+            if path.endswith(".csv"):
+                for row in csv.DictReader(file):
+                    spec = {key: val for key, val in row.items() if val}
+                    for key in LIST_LAUNCH_ARGUMENTS:
+                        if key in spec:
+                            spec[key] = [x.strip() for x in spec[key].split(",")]
+                    yield spec
+            else:
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def compute_env_key(self, compute_env_id: str) -> tuple:
+        """Generate the cache key for a compute environment.
+
+        Args:
+            compute_env_id (str): Compute environment alphanumerical ID.
+
+        Returns:
+            tuple: Tower API URL, workspace ID, and compute environment ID.
         """
-        return {"workspaceId": self.workspace}
+        return (self.client.tower_api_base_url, self.workspace, compute_env_id)
+
+    def invalidate_compute_env(self, compute_env_id: Optional[str] = None) -> None:
+        """Remove a compute environment from the cache.
+
+        Args:
+            compute_env_id (str, optional): Compute environment alphanumerical
+                ID. Defaults to None, which clears the entire cache.
+        """
+        if compute_env_id is None:
+            self.compute_env_cache.invalidate()
+        else:
+            key = self.compute_env_key(compute_env_id)
+            self.compute_env_cache.invalidate(key)
 
     @staticmethod
     def bundle_client_args(
@@ -90,6 +304,8 @@ class TowerUtils:
             endpoint (str, optional): Full Tower API URL. This argument
                 will override the value associated with the specified
                 `platform`. Defaults to None.
+            **kwargs: Additional arguments passed through to `TowerClient`
+                (e.g., connection pool settings like `pool_maxsize`).
 
         Raises:
             ValueError: If `platform` is not valid.
@@ -107,36 +323,135 @@ class TowerUtils:
         client_args = dict(tower_token=auth_token, tower_api_url=endpoint, **kwargs)
         return client_args
 
-    def get_compute_env(self, compute_env_id: str) -> dict:
+
+class TowerUtils(BaseTowerUtils):
+    def __init__(
+        self,
+        client_args: Mapping,
+        workspace_id: Optional[int] = None,
+        cache_ttl: Optional[float] = COMPUTE_ENV_CACHE_TTL,
+        shared_cache: bool = False,
+    ) -> None:
+        """Initialize TowerUtils for interacting with the Tower API.
+
+        Args:
+            client_args (Mapping): Bundled client arguments, which can
+                be generated with the `TowerUtils.bundle_client_args()`
+                static method.
+            workspace (int, optional): Tower workspace identifier.
+                Defaults to None with no opened workspace.
+            cache_ttl (float, optional): Number of seconds for which
+                compute environments are cached by this instance. It only
+                applies to per-instance caches. Defaults to the
+                `TOWER_COMPUTE_ENV_CACHE_TTL` environment variable (or 300).
+            shared_cache (bool, optional): Whether to use the process-wide
+                compute environment cache instead of a per-instance cache.
+                Its TTL is set with the `TOWER_COMPUTE_ENV_CACHE_TTL`
+                environment variable or `set_shared_cache_ttl()`.
+                Defaults to False.
+        """
+        super().__init__(client_args, workspace_id, cache_ttl, shared_cache)
+
+    def init_client(self, client_args: Mapping) -> TowerClient:
+        """Initialize the Tower client used for requests.
+
+        Args:
+            client_args (Mapping): Bundled client arguments.
+
+        Returns:
+            TowerClient: Tower client with a pooled HTTP session.
+        """
+        return TowerClient(**client_args)
+
+    def __enter__(self) -> "TowerUtils":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the pooled HTTP connections held by the Tower client."""
+        self.client.close()
+
+    def get_compute_env(self, compute_env_id: str, use_cache: bool = True) -> dict:
         """Retrieve information about a given compute environment.
 
+        Compute environments are cached for `cache_ttl` seconds. The
+        cache is refreshed whenever a request is made.
+
         Args:
             compute_env_id (str): Compute environment alphanumerical ID.
+            use_cache (bool, optional): Whether to return a cached record
+                if available. Defaults to True.
 
         Returns:
             dict: Information about the compute environment.
         """
-        endpoint = f"/compute-envs/{compute_env_id}"
+        key = self.compute_env_key(compute_env_id)
+        if use_cache:
+            compute_env = self.compute_env_cache.get(key)
+            if compute_env is not None:
+                return compute_env
+        endpoint = "/compute-envs/{compute_env_id}"
+        path_params = {"compute_env_id": compute_env_id}
         params = self.init_params()
-        response = self.client.request("GET", endpoint, params=params)
+        response = self.client.request(
+            "GET", endpoint, path_params=path_params, params=params
+        )
         compute_env = response["computeEnv"]
+        self.compute_env_cache.set(key, compute_env)
         return compute_env
 
-    def get_workflow(self, workflow_id: str) -> dict:
+    def get_workflow(
+        self, workflow_id: str, workspace_id: Optional[int] = None
+    ) -> dict:
         """Retrieve information about a given workflow run.
 
         Args:
             workflow_id (str): Workflow run alphanumerical ID.
+            workspace_id (int, optional): Tower workspace identifier.
+                Defaults to None, which uses the opened workspace.
 
         Returns:
             dict: Information about the workflow run.
         """
-        endpoint = f"/workflow/{workflow_id}"
-        params = self.init_params()
-        response = self.client.request("GET", endpoint, params=params)
+        endpoint = "/workflow/{workflow_id}"
+        path_params = {"workflow_id": workflow_id}
+        params = self.init_params(workspace_id)
+        response = self.client.request(
+            "GET", endpoint, path_params=path_params, params=params
+        )
         return response
 
-    def init_launch_workflow_data(self, compute_env_id: str) -> dict:
+    def get_workflows(
+        self,
+        workflow_ids: Iterable[str],
+        workspace_id: Optional[int] = None,
+        max_workers: int = 4,
+    ) -> List[dict]:
+        """Retrieve information about many workflow runs concurrently.
+
+        Args:
+            workflow_ids (Iterable[str]): Workflow run alphanumerical IDs.
+            workspace_id (int, optional): Tower workspace identifier.
+                Defaults to None, which uses the opened workspace.
+            max_workers (int, optional): Maximum number of concurrent
+                requests. Defaults to 4.
+
+        Returns:
+            List[dict]: Information about each workflow run (in the given order).
+        """
+        workspace_id = workspace_id or self.workspace
+        with ThreadPoolExecutor(max_workers) as executor:
+            futures = [
+                executor.submit(self.get_workflow, workflow_id, workspace_id)
+                for workflow_id in workflow_ids
+            ]
+            return [future.result() for future in futures]
+
+    def init_launch_workflow_data(
+        self, compute_env_id: str, use_cache: bool = True
+    ) -> dict:
         """Initialize request for `/workflow/launch` endpoint.
 
         You can use this method to modify the contents before
@@ -145,6 +460,10 @@ class TowerUtils:
 
         Args:
             compute_env_id (str): Compute environment alphanumerical ID.
+            use_cache (bool, optional): Whether to use a cached compute
+                environment for the default values. Set to False when the
+                availability check must reflect the latest status.
+                Defaults to True.
 
         Raises:
             ValueError: If the compute environment is not available.
@@ -153,38 +472,11 @@ class TowerUtils:
             dict: Initial request for `/workflow/launch` endpoint.
         """
         # Retrieve compute environment for default values
-        compute_env = self.get_compute_env(compute_env_id)
-        if compute_env["status"] != "AVAILABLE":
-            ce_name = compute_env["name"]
-            raise ValueError(f"The compute environment ({ce_name}) is not available.")
-        ce_config = compute_env["config"]
-        # Replicating date format in requests made by Tower frontend
-        now_utc = datetime.now().isoformat()[:-3] + "Z"
-        data = {
-            "launch": {
-                "computeEnvId": compute_env_id,
-                "configProfiles": [],
-                "configText": None,
-                "dateCreated": now_utc,
-                "entryName": None,
-                "id": None,
-                "mainScript": None,
-                "paramsText": None,
-                "pipeline": None,
-                "postRunScript": ce_config["postRunScript"],
-                "preRunScript": ce_config["preRunScript"],
-                "pullLatest": None,
-                "revision": None,
-                "runName": None,
-                "schemaName": None,
-                "stubRun": None,
-                "towerConfig": None,
-                "userSecrets": [],
-                "workDir": ce_config["workDir"],
-                "workspaceSecrets": [],
-            }
-        }
-        return data
+        compute_env = self.get_compute_env(compute_env_id, use_cache)
+        # Double-check the availability of cached compute environments
+        if use_cache and compute_env["status"] != "AVAILABLE":
+            compute_env = self.get_compute_env(compute_env_id, use_cache=False)
+        return init_launch_data(compute_env_id, compute_env)
 
     def launch_workflow(
         self,
@@ -201,7 +493,8 @@ class TowerUtils:
         workspace_secrets: Optional[List[str]] = (),
         pre_run_script: Optional[str] = None,
         init_data: Optional[Mapping] = None,
-    ) -> dict:
+        lazy: bool = False,
+    ) -> Union[dict, WorkflowHandle]:
         """Launch a workflow using the given compute environment.
 
         This method will use any opened workspace if available.
@@ -240,33 +533,641 @@ class TowerUtils:
                 launching a workflow. It's recommended to generate a basic
                 request using `init_launch_workflow_data()` and modifying
                 it before passing it to `init_data`. Defaults to None.
+            lazy (bool, optional): Whether to return a `WorkflowHandle`
+                right away instead of retrieving the workflow details,
+                which saves one request per launch. The details are
+                retrieved on first access. Defaults to False.
 
         Returns:
-            dict: Information about the just-launched workflow run.
+            dict: Information about the just-launched workflow run
+                (or a `WorkflowHandle` if `lazy` is enabled).
         """
         endpoint = "/workflow/launch"
         params = self.init_params()
-        arguments = {
-            "launch": {
-                "configProfiles": dedup(profiles),
-                "configText": nextflow_config,
-                # TODO: Validate YAML or JSON
-                "paramsText": params_yaml or params_json,
-                "pipeline": pipeline,
-                "preRunScript": pre_run_script,
-                "revision": revision,
-                # TODO: Avoid duplicate run names
-                "runName": run_name,
-                "userSecrets": dedup(user_secrets),
-                "workDir": work_dir,
-                "workspaceSecrets": dedup(workspace_secrets),
-            }
-        }
+        arguments = init_launch_arguments(
+            pipeline,
+            revision=revision,
+            params_yaml=params_yaml,
+            params_json=params_json,
+            nextflow_config=nextflow_config,
+            run_name=run_name,
+            work_dir=work_dir,
+            profiles=profiles,
+            user_secrets=user_secrets,
+            workspace_secrets=workspace_secrets,
+            pre_run_script=pre_run_script,
+        )
         # Update default data with argument values and user-provided overrides
         data = init_data or self.init_launch_workflow_data(compute_env_id)
         data = update_dict(data, arguments)
         # Launch workflow and obtain workflow ID
         response = self.client.request("POST", endpoint, params=params, json=data)
+        if lazy:
+            return WorkflowHandle(self, response["workflowId"], self.workspace)
         # Get more information about workflow run
         workflow = self.get_workflow(response["workflowId"])
         return workflow
+
+    def launch_workflows(
+        self, specs: Iterable[Mapping], max_workers: int = 4
+    ) -> List[dict]:
+        """Launch many workflows in parallel with per-item results.
+
+        Each compute environment is only retrieved once, and its initial
+        launch request is shared by all specs without an `init_data`.
+        Failures are recorded in the results instead of interrupting
+        the remaining launches.
+
+        Args:
+            specs (Iterable[Mapping]): Launch specifications, each being
+                the named arguments for `launch_workflow()`.
+            max_workers (int, optional): Maximum number of launches
+                submitted concurrently. Defaults to 4.
+
+        Returns:
+            List[dict]: Result for each spec (in the given order) with the
+                `index`, the `spec`, the launched `workflow` (if successful)
+                and the `error` message (if unsuccessful).
+        """
+        specs = [dict(spec) for spec in specs]
+        # Resolve the initial request for each compute environment once
+        init_data = dict()
+        for spec in specs:
+            ce_id = spec.get("compute_env_id")
+            if spec.get("init_data") or not ce_id or ce_id in init_data:
+                continue
+            try:
+                init_data[ce_id] = self.init_launch_workflow_data(ce_id)
+            except Exception as error:
+                init_data[ce_id] = error
+
+        def launch(spec):
+            ce_data = init_data.get(spec.get("compute_env_id"))
+            if isinstance(ce_data, Exception):
+                raise ce_data
+            if ce_data and not spec.get("init_data"):
+                spec = dict(spec, init_data=deepcopy(ce_data))
+            return self.launch_workflow(**spec)
+
+        results = list()
+        with ThreadPoolExecutor(max_workers) as executor:
+            futures = [executor.submit(launch, spec) for spec in specs]
+            for index, (spec, future) in enumerate(zip(specs, futures)):
+                result = {"index": index, "spec": spec, "workflow": None}
+                try:
+                    result["workflow"] = future.result()
+                    result["error"] = None
+                except Exception as error:
+                    result["error"] = f"{type(error).__name__}: {error}"
+                results.append(result)
+        return results
+
+    def get_workflow_statuses(
+        self,
+        workflow_ids: Iterable[str],
+        list_threshold: int = 10,
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+    ) -> Dict[str, dict]:
+        """Retrieve the latest information about many workflow runs.
+
+        When there are more than `list_threshold` workflow runs, the
+        paged workflow list endpoint is used to retrieve many runs per
+        request. Paging stops as soon as all runs have been found or after
+        `max_pages` pages, and any runs that weren't listed (e.g., older
+        runs) are retrieved individually. This avoids paging through the
+        whole workspace on every poll when some runs are never listed.
+
+        Args:
+            workflow_ids (Iterable[str]): Workflow run alphanumerical IDs.
+            list_threshold (int, optional): Minimum number of workflow runs
+                for using the list endpoint. Defaults to 10.
+            page_size (int, optional): Number of workflow runs per page.
+                Defaults to 100.
+            max_pages (int, optional): Maximum number of pages to scan.
+                Defaults to None, which scans one more page than needed
+                to hold all of the workflow runs.
+
+        Returns:
+            Dict[str, dict]: Information about each workflow run, keyed by ID.
+        """
+        remaining = set(workflow_ids)
+        workflows = dict()
+        if len(remaining) > list_threshold:
+            max_pages = max_pages or math.ceil(len(remaining) / page_size) + 1
+            max_items = max_pages * page_size
+            params = self.init_params()
+            items = self.client.paged_request(
+                "GET", "/workflow", params=params, page_size=page_size
+            )
+            for num_items, item in enumerate(items, 1):
+                workflow_id = item["workflow"]["id"]
+                if workflow_id in remaining:
+                    workflows[workflow_id] = item
+                    remaining.discard(workflow_id)
+                if not remaining or num_items >= max_items:
+                    break
+            items.close()
+        remaining = sorted(remaining)
+        for workflow_id, workflow in zip(remaining, self.get_workflows(remaining)):
+            workflows[workflow_id] = workflow
+        return workflows
+
+    def watch_workflows(
+        self,
+        workflow_ids: Iterable[str],
+        min_interval: float = 5,
+        max_interval: float = 60,
+        backoff_factor: float = 1.5,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Iterator[WorkflowTransition]:
+        """Poll many workflow runs and yield their status changes.
+
+        All runs are polled together (see `get_workflow_statuses()`).
+        The polling interval grows while nothing changes and resets
+        whenever a status changes. The iterator ends once all runs
+        have reached a terminal status.
+
+        Args:
+            workflow_ids (Iterable[str]): Workflow run alphanumerical IDs.
+            min_interval (float, optional): Minimum polling interval
+                (in seconds). Defaults to 5.
+            max_interval (float, optional): Maximum polling interval
+                (in seconds). Defaults to 60.
+            backoff_factor (float, optional): Multiplier applied to the
+                polling interval when nothing changes. Defaults to 1.5.
+            timeout (float, optional): Maximum number of seconds to wait
+                for all runs to finish. Defaults to None (no timeout).
+            **kwargs: Additional arguments for `get_workflow_statuses()`.
+
+        Raises:
+            TimeoutError: If the runs don't finish before the timeout.
+
+        Yields:
+            Iterator[WorkflowTransition]: Status changes as they're observed.
+        """
+        watcher = WorkflowWatcher(
+            workflow_ids, min_interval, max_interval, backoff_factor, timeout
+        )
+        while True:
+            workflows = self.get_workflow_statuses(watcher.pending, **kwargs)
+            yield from watcher.update(workflows)
+            if not watcher.pending:
+                break
+            time.sleep(watcher.next_delay())
+
+    def wait_all(
+        self, workflow_ids: Iterable[str], timeout: Optional[float] = None, **kwargs
+    ) -> Dict[str, dict]:
+        """Wait for many workflow runs to reach a terminal status.
+
+        Args:
+            workflow_ids (Iterable[str]): Workflow run alphanumerical IDs.
+            timeout (float, optional): Maximum number of seconds to wait.
+                Defaults to None (no timeout).
+            **kwargs: Additional arguments for `watch_workflows()`.
+
+        Raises:
+            TimeoutError: If the runs don't finish before the timeout.
+
+        Returns:
+            Dict[str, dict]: Final information about each run, keyed by ID.
+        """
+        workflows = dict()
+        for transition in self.watch_workflows(workflow_ids, timeout=timeout, **kwargs):
+            workflows[transition.workflow_id] = transition.workflow
+        return workflows
+
+
+class AsyncTowerUtils(BaseTowerUtils):
+    def __init__(
+        self,
+        client_args: Mapping,
+        workspace_id: Optional[int] = None,
+        max_concurrency: int = 10,
+        cache_ttl: Optional[float] = COMPUTE_ENV_CACHE_TTL,
+        shared_cache: bool = False,
+    ) -> None:
+        """Initialize AsyncTowerUtils for concurrent requests to the Tower API.
+
+        This class mirrors the methods of `TowerUtils` as coroutines.
+        It also provides bulk helpers (e.g., `launch_workflows()`)
+        that run many requests concurrently on the event loop.
+
+        Args:
+            client_args (Mapping): Bundled client arguments, which can
+                be generated with the `AsyncTowerUtils.bundle_client_args()`
+                static method.
+            workspace (int, optional): Tower workspace identifier.
+                Defaults to None with no opened workspace.
+            max_concurrency (int, optional): Maximum number of in-flight
+                requests for bulk helpers. Defaults to 10.
+            cache_ttl (float, optional): Number of seconds for which
+                compute environments are cached by this instance. It only
+                applies to per-instance caches. Defaults to the
+                `TOWER_COMPUTE_ENV_CACHE_TTL` environment variable (or 300).
+            shared_cache (bool, optional): Whether to use the process-wide
+                compute environment cache instead of a per-instance cache.
+                Its TTL is set with the `TOWER_COMPUTE_ENV_CACHE_TTL`
+                environment variable or `set_shared_cache_ttl()`.
+                Defaults to False.
+        """
+        super().__init__(client_args, workspace_id, cache_ttl, shared_cache)
+        self.max_concurrency = max_concurrency
+
+    def init_client(self, client_args: Mapping) -> AsyncTowerClient:
+        """Initialize the asynchronous Tower client used for requests.
+
+        Args:
+            client_args (Mapping): Bundled client arguments.
+
+        Returns:
+            AsyncTowerClient: Asynchronous Tower client.
+        """
+        return AsyncTowerClient(**client_args)
+
+    async def __aenter__(self) -> "AsyncTowerUtils":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Release the pooled HTTP connections held by the Tower client."""
+        await self.client.aclose()
+
+    async def gather(
+        self,
+        awaitables: Iterable[Awaitable],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> list:
+        """Run awaitables concurrently with a bounded concurrency limit.
+
+        Args:
+            awaitables (Iterable[Awaitable]): Coroutines to run.
+            max_concurrency (int, optional): Maximum number of awaitables
+                running at once. Defaults to `self.max_concurrency`.
+            return_exceptions (bool, optional): Whether to return exceptions
+                in place of results instead of raising the first one.
+                Defaults to False.
+
+        Returns:
+            list: Results in the same order as the awaitables.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+
+        async def bounded(awaitable):
+            async with semaphore:
+                return await awaitable
+
+        tasks = [bounded(awaitable) for awaitable in awaitables]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    async def get_compute_env(
+        self, compute_env_id: str, use_cache: bool = True
+    ) -> dict:
+        """Retrieve information about a given compute environment.
+
+        Compute environments are cached for `cache_ttl` seconds. The
+        cache is refreshed whenever a request is made.
+
+        Args:
+            compute_env_id (str): Compute environment alphanumerical ID.
+            use_cache (bool, optional): Whether to return a cached record
+                if available. Defaults to True.
+
+        Returns:
+            dict: Information about the compute environment.
+        """
+        key = self.compute_env_key(compute_env_id)
+        if use_cache:
+            compute_env = self.compute_env_cache.get(key)
+            if compute_env is not None:
+                return compute_env
+        endpoint = "/compute-envs/{compute_env_id}"
+        path_params = {"compute_env_id": compute_env_id}
+        params = self.init_params()
+        response = await self.client.request(
+            "GET", endpoint, path_params=path_params, params=params
+        )
+        compute_env = response["computeEnv"]
+        self.compute_env_cache.set(key, compute_env)
+        return compute_env
+
+    async def get_workflow(
+        self, workflow_id: str, workspace_id: Optional[int] = None
+    ) -> dict:
+        """Retrieve information about a given workflow run.
+
+        Args:
+            workflow_id (str): Workflow run alphanumerical ID.
+            workspace_id (int, optional): Tower workspace identifier.
+                Defaults to None, which uses the opened workspace.
+
+        Returns:
+            dict: Information about the workflow run.
+        """
+        endpoint = "/workflow/{workflow_id}"
+        path_params = {"workflow_id": workflow_id}
+        params = self.init_params(workspace_id)
+        response = await self.client.request(
+            "GET", endpoint, path_params=path_params, params=params
+        )
+        return response
+
+    async def init_launch_workflow_data(
+        self, compute_env_id: str, use_cache: bool = True
+    ) -> dict:
+        """Initialize request for `/workflow/launch` endpoint.
+
+        You can use this method to modify the contents before
+        passing the adjusted payload to the `init_data` argument
+        on the `launch_workflow()` method.
+
+        Args:
+            compute_env_id (str): Compute environment alphanumerical ID.
+            use_cache (bool, optional): Whether to use a cached compute
+                environment for the default values. Set to False when the
+                availability check must reflect the latest status.
+                Defaults to True.
+
+        Raises:
+            ValueError: If the compute environment is not available.
+
+        Returns:
+            dict: Initial request for `/workflow/launch` endpoint.
+        """
+        # Retrieve compute environment for default values
+        compute_env = await self.get_compute_env(compute_env_id, use_cache)
+        # Double-check the availability of cached compute environments
+        if use_cache and compute_env["status"] != "AVAILABLE":
+            compute_env = await self.get_compute_env(compute_env_id, use_cache=False)
+        return init_launch_data(compute_env_id, compute_env)
+
+    async def launch_workflow(
+        self,
+        compute_env_id: str,
+        pipeline: str,
+        revision: Optional[str] = None,
+        params_yaml: Optional[str] = None,
+        params_json: Optional[str] = None,
+        nextflow_config: Optional[str] = None,
+        run_name: Optional[str] = None,
+        work_dir: Optional[str] = None,
+        profiles: Optional[List[str]] = (),
+        user_secrets: Optional[List[str]] = (),
+        workspace_secrets: Optional[List[str]] = (),
+        pre_run_script: Optional[str] = None,
+        init_data: Optional[Mapping] = None,
+    ) -> dict:
+        """Launch a workflow using the given compute environment.
+
+        This method will use any opened workspace if available.
+
+        Args:
+            compute_env_id (str): Compute environment ID where the
+                execution will be launched.
+            pipeline (str): Nextflow pipeline URL. This can be a GitHub
+                shorthand like `nf-core/rnaseq`.
+            revision (str, optional): A valid repository commit ID (SHA),
+                tag, or branch name. Defaults to None.
+            params_yaml (str, optional): Pipeline parameters in YAML format.
+                Defaults to None.
+            params_json (str, optional): Pipeline parameters in JSON format.
+                Defaults to None.
+            nextflow_config (str, optional): Additional Nextflow configuration
+                settings can be provided here. Defaults to None.
+            run_name (str, optional): Custom workflow run name. Defaults to
+                None, which will automatically assign a random run name.
+            work_dir (str, optional): The bucket path where the pipeline
+                scratch data is stored. Defaults to None, which uses the
+                default work directory for the given compute environment.
+            profiles (List[str], optional): Configuration profile names
+                to use for this execution. Defaults to an empty list.
+            user_secrets (List[str], optional): Secrets required by the
+                pipeline execution. Those secrets must be defined in the
+                launching user's account. User secrets take precedence over
+                workspace secrets. Defaults to an empty list.
+            workspace_secrets (List[str], optional): Secrets required by the
+                pipeline execution. Those secrets must be defined in the
+                opened workspace. Defaults to an empty list.
+            pre_run_script (str, optional): A Bash script that's executed
+                in the same environment where Nextflow runs just before
+                the pipeline is launched. Defaults to None.
+            init_data (Mapping, optional): An alternate request payload for
+                launching a workflow. It's recommended to generate a basic
+                request using `init_launch_workflow_data()` and modifying
+                it before passing it to `init_data`. Defaults to None.
+
+        Returns:
+            dict: Information about the just-launched workflow run.
+        """
+        endpoint = "/workflow/launch"
+        params = self.init_params()
+        arguments = init_launch_arguments(
+            pipeline,
+            revision=revision,
+            params_yaml=params_yaml,
+            params_json=params_json,
+            nextflow_config=nextflow_config,
+            run_name=run_name,
+            work_dir=work_dir,
+            profiles=profiles,
+            user_secrets=user_secrets,
+            workspace_secrets=workspace_secrets,
+            pre_run_script=pre_run_script,
+        )
+        # Update default data with argument values and user-provided overrides
+        data = init_data or await self.init_launch_workflow_data(compute_env_id)
+        data = update_dict(data, arguments)
+        # Launch workflow and obtain workflow ID
+        response = await self.client.request("POST", endpoint, params=params, json=data)
+        # Get more information about workflow run
+        workflow = await self.get_workflow(response["workflowId"])
+        return workflow
+
+    async def get_workflows(
+        self,
+        workflow_ids: Iterable[str],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> list:
+        """Retrieve information about many workflow runs concurrently.
+
+        Args:
+            workflow_ids (Iterable[str]): Workflow run alphanumerical IDs.
+            max_concurrency (int, optional): Maximum number of in-flight
+                requests. Defaults to `self.max_concurrency`.
+            return_exceptions (bool, optional): Whether to return exceptions
+                in place of results. Defaults to False.
+
+        Returns:
+            list: Information about each workflow run (in the given order).
+        """
+        requests = [self.get_workflow(wid) for wid in workflow_ids]
+        return await self.gather(requests, max_concurrency, return_exceptions)
+
+    async def launch_workflows(
+        self,
+        specs: Iterable[Mapping],
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> list:
+        """Launch many workflows concurrently.
+
+        Each compute environment is only retrieved once, and its initial
+        launch request is shared by all specs without an `init_data`.
+        If a compute environment cannot be retrieved (e.g., if it's not
+        available), the error is reported for each launch using it, like
+        any other launch error.
+
+        Args:
+            specs (Iterable[Mapping]): Launch specifications, each being
+                the named arguments for `launch_workflow()`.
+            max_concurrency (int, optional): Maximum number of in-flight
+                requests. Defaults to `self.max_concurrency`.
+            return_exceptions (bool, optional): Whether to return exceptions
+                in place of results. Defaults to False.
+
+        Returns:
+            list: Information about each launched workflow (in the given order).
+        """
+        specs = [dict(spec) for spec in specs]
+        # Resolve the initial request for each compute environment once
+        ce_ids = {
+            spec["compute_env_id"]
+            for spec in specs
+            if spec.get("compute_env_id") and not spec.get("init_data")
+        }
+        ce_ids = sorted(ce_ids)
+        init_requests = [self.init_launch_workflow_data(ce_id) for ce_id in ce_ids]
+        init_data = await self.gather(
+            init_requests, max_concurrency, return_exceptions=True
+        )
+        init_data = dict(zip(ce_ids, init_data))
+
+        async def launch(spec):
+            ce_data = init_data.get(spec.get("compute_env_id"))
+            if isinstance(ce_data, Exception):
+                raise ce_data
+            if ce_data and not spec.get("init_data"):
+                spec = dict(spec, init_data=deepcopy(ce_data))
+            return await self.launch_workflow(**spec)
+
+        launches = [launch(spec) for spec in specs]
+        return await self.gather(launches, max_concurrency, return_exceptions)
+
+    async def get_workflow_statuses(
+        self,
+        workflow_ids: Iterable[str],
+        list_threshold: int = 10,
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+    ) -> Dict[str, dict]:
+        """Retrieve the latest information about many workflow runs.
+
+        See `TowerUtils.get_workflow_statuses()` for more details.
+
+        Args:
+            workflow_ids (Iterable[str]): Workflow run alphanumerical IDs.
+            list_threshold (int, optional): Minimum number of workflow runs
+                for using the list endpoint. Defaults to 10.
+            page_size (int, optional): Number of workflow runs per page.
+                Defaults to 100.
+            max_pages (int, optional): Maximum number of pages to scan.
+                Defaults to None, which scans one more page than needed
+                to hold all of the workflow runs.
+
+        Returns:
+            Dict[str, dict]: Information about each workflow run, keyed by ID.
+        """
+        remaining = set(workflow_ids)
+        workflows = dict()
+        if len(remaining) > list_threshold:
+            max_pages = max_pages or math.ceil(len(remaining) / page_size) + 1
+            max_items = max_pages * page_size
+            params = self.init_params()
+            items = self.client.paged_request(
+                "GET", "/workflow", params=params, page_size=page_size
+            )
+            num_items = 0
+            async for item in items:
+                num_items += 1
+                workflow_id = item["workflow"]["id"]
+                if workflow_id in remaining:
+                    workflows[workflow_id] = item
+                    remaining.discard(workflow_id)
+                if not remaining or num_items >= max_items:
+                    break
+            await items.aclose()
+        remaining = sorted(remaining)
+        results = await self.get_workflows(remaining)
+        workflows.update(zip(remaining, results))
+        return workflows
+
+    async def watch_workflows(
+        self,
+        workflow_ids: Iterable[str],
+        min_interval: float = 5,
+        max_interval: float = 60,
+        backoff_factor: float = 1.5,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> AsyncIterator[WorkflowTransition]:
+        """Poll many workflow runs and yield their status changes.
+
+        See `TowerUtils.watch_workflows()` for more details.
+
+        Args:
+            workflow_ids (Iterable[str]): Workflow run alphanumerical IDs.
+            min_interval (float, optional): Minimum polling interval
+                (in seconds). Defaults to 5.
+            max_interval (float, optional): Maximum polling interval
+                (in seconds). Defaults to 60.
+            backoff_factor (float, optional): Multiplier applied to the
+                polling interval when nothing changes. Defaults to 1.5.
+            timeout (float, optional): Maximum number of seconds to wait
+                for all runs to finish. Defaults to None (no timeout).
+            **kwargs: Additional arguments for `get_workflow_statuses()`.
+
+        Raises:
+            TimeoutError: If the runs don't finish before the timeout.
+
+        Yields:
+            AsyncIterator[WorkflowTransition]: Status changes as they're observed.
+        """
+        watcher = WorkflowWatcher(
+            workflow_ids, min_interval, max_interval, backoff_factor, timeout
+        )
+        while True:
+            workflows = await self.get_workflow_statuses(watcher.pending, **kwargs)
+            for transition in watcher.update(workflows):
+                yield transition
+            if not watcher.pending:
+                break
+            await asyncio.sleep(watcher.next_delay())
+
+    async def wait_all(
+        self, workflow_ids: Iterable[str], timeout: Optional[float] = None, **kwargs
+    ) -> Dict[str, dict]:
+        """Wait for many workflow runs to reach a terminal status.
+
+        Args:
+            workflow_ids (Iterable[str]): Workflow run alphanumerical IDs.
+            timeout (float, optional): Maximum number of seconds to wait.
+                Defaults to None (no timeout).
+            **kwargs: Additional arguments for `watch_workflows()`.
+
+        Raises:
+            TimeoutError: If the runs don't finish before the timeout.
+
+        Returns:
+            Dict[str, dict]: Final information about each run, keyed by ID.
+        """
+        workflows = dict()
+        transitions = self.watch_workflows(workflow_ids, timeout=timeout, **kwargs)
+        async for transition in transitions:
+            workflows[transition.workflow_id] = transition.workflow
+        return workflows
@@ -0,0 +1,220 @@
+from collections import defaultdict
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+from sagetasks.utils import Waiter
+
+# Workflow statuses after which a run will no longer change
+TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "CANCELLED", "UNKNOWN"}
+
+
+class WorkflowHandle:
+    def __init__(
+        self,
+        utils,
+        workflow_id: str,
+        workspace_id: Optional[int] = None,
+        details: Optional[dict] = None,
+    ) -> None:
+        """Lightweight reference to a workflow run with lazy details.
+
+        The workflow details are only retrieved from Tower on first
+        access (e.g., `handle.status` or `handle["workflow"]`). Fields
+        of the `workflow` object are exposed as attributes, whereas
+        the full response can be indexed like a dictionary.
+
+        Note that handles hold a reference to a `TowerUtils` instance
+        and thus cannot be pickled. Use `workflow_id` when passing
+        workflows between Prefect tasks.
+
+        Args:
+            utils (TowerUtils): Tower utilities used for requests.
+            workflow_id (str): Workflow run alphanumerical ID.
+            workspace_id (int, optional): Tower workspace identifier.
+                Defaults to None, which uses the opened workspace.
+            details (dict, optional): Known workflow details, if any.
+                Defaults to None.
+        """
+        self._utils = utils
+        self._details = details
+        self._lock = Lock()
+        self.workflow_id = workflow_id
+        self.workspace_id = workspace_id or utils.workspace
+
+    def __repr__(self) -> str:
+        return f"WorkflowHandle({self.workflow_id!r}, {self.workspace_id!r})"
+
+    def __getitem__(self, key: str) -> Any:
+        return self.details[key]
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        workflow = self.details.get("workflow", {})
+        if name not in workflow:
+            raise AttributeError(f"Workflow has no attribute '{name}'.")
+        return workflow[name]
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the workflow details have been retrieved yet."""
+        return self._details is not None
+
+    @property
+    def details(self) -> dict:
+        """Retrieve the workflow details (fetching them if needed).
+
+        Returns:
+            dict: Information about the workflow run.
+        """
+        with self._lock:
+            if self._details is None:
+                self._details = self._fetch()
+            return self._details
+
+    def _fetch(self) -> dict:
+        return self._utils.get_workflow(self.workflow_id, self.workspace_id)
+
+    def update(self, details: dict) -> None:
+        """Replace the workflow details with more recent information.
+
+        Args:
+            details (dict): Information about the workflow run.
+        """
+        with self._lock:
+            self._details = details
+
+    def refresh(self) -> dict:
+        """Retrieve the latest workflow details from Tower.
+
+        Returns:
+            dict: Information about the workflow run.
+        """
+        self.update(self._fetch())
+        return self._details
+
+    @staticmethod
+    def refresh_all(
+        handles: Iterable["WorkflowHandle"], max_workers: int = 4
+    ) -> List["WorkflowHandle"]:
+        """Retrieve the latest details for many workflow handles at once.
+
+        Handles are grouped by Tower utilities and workspace, and the
+        details for each group are retrieved concurrently.
+
+        Args:
+            handles (Iterable[WorkflowHandle]): Workflow handles.
+            max_workers (int, optional): Maximum number of concurrent
+                requests per group. Defaults to 4.
+
+        Returns:
+            List[WorkflowHandle]: The refreshed handles.
+        """
+        handles = list(handles)
+        groups = defaultdict(list)
+        for handle in handles:
+            groups[(handle._utils, handle.workspace_id)].append(handle)
+        for (utils, workspace_id), group in groups.items():
+            workflow_ids = [handle.workflow_id for handle in group]
+            workflows = utils.get_workflows(workflow_ids, workspace_id, max_workers)
+            for handle, workflow in zip(group, workflows):
+                handle.update(workflow)
+        return handles
+
+
+class WorkflowTransition(NamedTuple):
+    """Change in the status of a workflow run."""
+
+    workflow_id: str
+    previous_status: Optional[str]
+    status: str
+    workflow: dict
+
+
+class WorkflowWatcher:
+    def __init__(
+        self,
+        workflow_ids: Iterable[str],
+        min_interval: float = 5,
+        max_interval: float = 60,
+        backoff_factor: float = 1.5,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Track the statuses of many workflow runs between polls.
+
+        The polling interval starts at `min_interval` and grows by
+        `backoff_factor` after each poll without status changes (up
+        to `max_interval`). Any status change resets the interval. The
+        interval is clipped to the time remaining before the timeout,
+        which is only raised once the deadline has passed (see
+        `sagetasks.utils.Waiter`). This class only holds state;
+        `TowerUtils.watch_workflows()` and
+        `AsyncTowerUtils.watch_workflows()` perform the polling.
+
+        Args:
+            workflow_ids (Iterable[str]): Workflow run alphanumerical IDs.
+            min_interval (float, optional): Minimum polling interval
+                (in seconds). Defaults to 5.
+            max_interval (float, optional): Maximum polling interval
+                (in seconds). Defaults to 60.
+            backoff_factor (float, optional): Multiplier applied to the
+                polling interval when nothing changes. Defaults to 1.5.
+            timeout (float, optional): Maximum number of seconds to wait
+                for all runs to finish. Defaults to None (no timeout).
+        """
+        self.statuses: Dict[str, Optional[str]] = dict.fromkeys(workflow_ids)
+        self.workflows: Dict[str, dict] = dict()
+        self.waiter = Waiter(
+            min_interval, max_interval, backoff_factor, timeout=timeout
+        )
+        self.waiter.start()
+        self.backoff = self.waiter.backoff
+
+    @property
+    def pending(self) -> List[str]:
+        """Workflow runs that haven't reached a terminal status yet."""
+        return [
+            workflow_id
+            for workflow_id, status in self.statuses.items()
+            if status not in TERMINAL_STATUSES
+        ]
+
+    def update(self, workflows: Mapping[str, dict]) -> List[WorkflowTransition]:
+        """Record the latest workflow details and detect status changes.
+
+        Args:
+            workflows (Mapping[str, dict]): Latest information about
+                workflow runs, keyed by workflow ID.
+
+        Returns:
+            List[WorkflowTransition]: Status changes since the last update.
+        """
+        transitions = list()
+        for workflow_id, workflow in workflows.items():
+            status = workflow["workflow"]["status"]
+            previous_status = self.statuses.get(workflow_id)
+            self.workflows[workflow_id] = workflow
+            if status != previous_status:
+                self.statuses[workflow_id] = status
+                transition = WorkflowTransition(
+                    workflow_id, previous_status, status, workflow
+                )
+                transitions.append(transition)
+        if transitions:
+            self.backoff.reset()
+        return transitions
+
+    def next_delay(self) -> float:
+        """Compute the delay before the next poll.
+
+        Raises:
+            TimeoutError: If the deadline has passed.
+
+        Returns:
+            float: Delay (in seconds) before the next poll.
+        """
+        try:
+            return self.waiter.next_delay()
+        except TimeoutError:
+            pending = self.pending
+            raise TimeoutError(f"Timed out waiting for workflow runs: {pending}")
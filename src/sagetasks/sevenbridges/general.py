@@ -1,3 +1,4 @@
+from sagetasks.sevenbridges import inputs
 from sagetasks.sevenbridges.utils import SbgUtils
 
 
@@ -45,13 +46,30 @@ def import_volume_file(client_args, project, volume_id, volume_path, project_pat
     return imported_file_id
 
 
-def create_tasks(client_args, project, app_id, manifest, inputs_fn):
-    """SevenBridges - Create draft tasks"""
+def import_volume_files(
+    client_args, project, volume_id, volume_paths, project_paths, timeout=None
+):
+    """SevenBridges - Import many files from a volume"""
     utils = SbgUtils(client_args)
     utils.open_project(project)
-    draft_task_ids = list()
-    for task_name, inputs, callback_fn in inputs_fn(utils.client, manifest):
-        task = utils.get_or_create_task(app_id, inputs, task_name, callback_fn)
-        task_id = utils.extract_id(task)
-        draft_task_ids.append(task_id)
+    specs = zip(volume_paths, project_paths)
+    results = utils.import_volume_files(volume_id, specs, timeout)
+    return results
+
+
+def create_tasks(client_args, project, app_id, manifest, inputs_fn=None, max_workers=8):
+    """SevenBridges - Create draft tasks
+
+    If `inputs_fn` isn't provided, the app input factory registered for
+    the app (see `register_app_inputs_factory()`) is used with its default
+    arguments.
+    """
+    if inputs_fn is None:
+        inputs_factory = inputs.get_app_inputs_factory(app_id)
+        inputs_fn = inputs_factory()
+    utils = SbgUtils(client_args)
+    utils.open_project(project)
+    specs = inputs_fn(utils.client, manifest)
+    draft_tasks = utils.get_or_create_tasks(app_id, specs, max_workers)
+    draft_task_ids = [utils.extract_id(task) for task in draft_tasks]
     return draft_task_ids
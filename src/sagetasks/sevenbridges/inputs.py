@@ -1,7 +1,9 @@
 import re
-from copy import deepcopy
+from types import MappingProxyType
 
-import numpy as np
+import pandas as pd
+
+from sagetasks.sevenbridges.utils import BULK_BATCH_SIZE
 
 # Parameters used in GTEx pipeline for normal (i.e., non-tumor) samples
 GTEX_NORMAL_PARAMS = {
@@ -29,29 +31,339 @@ STRANDEDNESS_DEFAULTS = ("default", "rf-stranded", "fr-stranded")
 
 TUMOR_REGEX = re.compile(r"tumou?r")
 
+# Suffix added to the names of public apps copied with `SbgUtils.import_app()`
+COPIED_APP_SUFFIX_REGEX = re.compile(r"-\d+$")
+
+# Registry of app input factories keyed by app name and revision
+APP_INPUTS_FACTORIES = dict()
+
+
+def parse_app_id(app_id):
+    """Extracts the app name and revision (or None) from an app ID.
+
+    App IDs have the form `owner/project/app_name` with an optional revision
+    suffix (e.g., `/3`).
+    """
+    parts = app_id.strip("/").split("/")
+    revision = None
+    if len(parts) == 4 and parts[3].isdigit():
+        revision = int(parts.pop())
+    return parts[-1], revision
+
+
+def register_app_inputs_factory(app_id, revision=None):
+    """Registers an app input factory for the given app (and optionally revision).
+
+    This function can be used as a decorator on factory functions. The app ID can
+    be given in full or as the app name alone.
+    """
+
+    def register(factory):
+        app_name, app_revision = parse_app_id(app_id)
+        key = (app_name, revision if revision is not None else app_revision)
+        APP_INPUTS_FACTORIES[key] = factory
+        return factory
+
+    return register
+
+
+def get_app_inputs_factory(app_id, revision=None):
+    """Retrieves the app input factory for the given app and revision.
+
+    Factories registered for a specific revision take precedence over those
+    registered for any revision. Public apps copied into projects with
+    `SbgUtils.import_app()` are named with a numeric suffix (e.g.,
+    `kfdrc-rnaseq-workflow-1`), so the factories registered for the public
+    app name are used if there are none for the suffixed name.
+    """
+    app_name, app_revision = parse_app_id(app_id)
+    revision = revision if revision is not None else app_revision
+    public_app_name = COPIED_APP_SUFFIX_REGEX.sub("", app_name)
+    for name in dict.fromkeys([app_name, public_app_name]):
+        for key in [(name, revision), (name, None)]:
+            if key in APP_INPUTS_FACTORIES:
+                return APP_INPUTS_FACTORIES[key]
+    raise ValueError(f"No inputs factory registered for app ({app_id}).")
+
+
+class AppInputsTemplate:
+    def __init__(self, columns, constants=None, file_inputs=(), blocks=None):
+        """Compiled mapping from sample table columns to app inputs.
+
+        The mapping is declared once and then applied to every row of a sample
+        table (see `prepare_kf_rnaseq_samples()`). Constants and parameter blocks
+        are frozen and shared across rows. Each row only shallow-copies them into
+        its own inputs dictionary rather than deep-copying them, which is safe
+        because their values are immutable.
+
+        Args:
+            columns (dict): Mapping from app input names to sample table columns.
+            constants (dict, optional): App inputs with the same value for every
+                sample. Defaults to None.
+            file_inputs (tuple of str, optional): App input names whose values are
+                file IDs, which are replaced by the resolved files. Defaults to ().
+            blocks (dict, optional): Mapping from sample table columns to sets of
+                parameter blocks keyed by column value. The block matching the
+                value for a sample is included in its inputs. Defaults to None.
+        """
+        self.input_names = tuple(columns)
+        self.columns = tuple(columns.values())
+        self.constants = MappingProxyType(dict(constants or {}))
+        self.file_inputs = tuple(file_inputs)
+        blocks = blocks or {}
+        self.block_columns = tuple(blocks)
+        self.blocks = tuple(
+            {value: MappingProxyType(dict(block)) for value, block in options.items()}
+            for options in blocks.values()
+        )
+
+    def iter_inputs(self, samples, files):
+        """Yields the sample ID and app inputs for each row of a sample table.
+
+        Args:
+            samples (pd.DataFrame): Sample table indexed by sample ID.
+            files (dict): Resolved files keyed by file ID.
+
+        Yields:
+            tuple: Sample ID and the app inputs for that sample.
+        """
+        values = samples[list(self.columns)].to_dict("split")["data"]
+        block_values = samples[list(self.block_columns)].to_dict("split")["data"]
+        empty = MappingProxyType({})
+        for sample_id, row, block_row in zip(samples.index, values, block_values):
+            inputs = dict()
+            for options, value in zip(self.blocks, block_row):
+                inputs.update(options.get(value, empty))
+            inputs.update(self.constants)
+            inputs.update(zip(self.input_names, row))
+            for name in self.file_inputs:
+                inputs[name] = files[inputs[name]]
+            yield sample_id, inputs
+
+
+def iter_sample_chunks(manifest, sample_col, group_size=2):
+    """Yields manifest chunks that only contain complete per-sample groups.
+
+    The manifest can be a single data frame (which is yielded as is) or an
+    iterable of data frame chunks (e.g., from `get_dataframe(..., chunksize=N)`).
+    Since the rows for a sample can be split across chunks, incomplete groups
+    (i.e., with fewer than `group_size` rows) are buffered until the remaining
+    rows appear in later chunks. Leftover incomplete groups are yielded at the
+    end to let callers report them.
+
+    Args:
+        manifest (pd.DataFrame or iterable of pd.DataFrame): File manifest.
+        sample_col (str): Manifest column name for sample IDs.
+        group_size (int, optional): Expected number of rows per sample.
+            Defaults to 2.
+
+    Yields:
+        pd.DataFrame: Manifest rows for complete samples.
+    """
+    if isinstance(manifest, pd.DataFrame):
+        yield manifest
+        return
+    pending = None
+    for chunk in manifest:
+        if pending is not None and len(pending.index) > 0:
+            chunk = pd.concat([pending, chunk])
+        sizes = chunk.groupby(sample_col)[sample_col].transform("size")
+        pending = chunk[sizes < group_size]
+        complete = chunk[sizes >= group_size]
+        if len(complete.index) > 0:
+            yield complete
+    if pending is not None and len(pending.index) > 0:
+        yield pending
+
+
+def prepare_kf_rnaseq_samples(
+    manifest,
+    file_col="cavatica_file_id",
+    sample_col="sample_id",
+    readlen_col="read_length",
+    sampletype_col="sample_type",
+    orientation_col="read_orientation",
+    orientation_vals=("R1", "R2"),
+    strandedness_col="strandedness",
+    strandedness_vals=STRANDEDNESS_DEFAULTS,
+    library_col="library_id",
+    platform_col="platform",
+):
+    """Validates a paired-end file manifest and summarizes it with one row per sample.
+
+    The manifest is processed with whole-frame operations rather than sample by
+    sample. All validation errors are collected and reported together. See
+    `manifest_to_kf_rnaseq_app_inputs_factory()` for the arguments.
+
+    Args:
+        manifest (pd.DataFrame): File manifest with two rows (R1 and R2) per sample.
+
+    Raises:
+        ValueError: If required columns are missing or if samples are invalid
+            (e.g., unpaired files, conflicting values, or unknown strandedness).
+
+    Returns:
+        pd.DataFrame: Sample table indexed by sample ID with the R1 and R2 file IDs
+            ("reads1" and "reads2"), the mapped "strandedness", the "library_id",
+            "platform", "read_length", and whether the sample "is_tumor".
+    """
+    r1_val, r2_val = orientation_vals
+    strandedness_map = dict(zip(strandedness_vals, STRANDEDNESS_DEFAULTS))
+    required_cols = [
+        file_col,
+        sample_col,
+        orientation_col,
+        strandedness_col,
+        readlen_col,
+        sampletype_col,
+    ]
+    missing_cols = [col for col in required_cols if col not in manifest]
+    if missing_cols:
+        raise ValueError(f"Manifest is missing required columns: {missing_cols}")
+    defaults = {library_col: "Not_Reported", platform_col: "Not_Reported"}
+    defaults = {col: val for col, val in defaults.items() if col not in manifest}
+    # Concatenated chunks can have duplicate row labels
+    manifest = manifest.reset_index(drop=True).assign(**defaults)
+    errors = list()
+
+    # Validate pairing and orientations
+    grouped = manifest.groupby(sample_col)
+    sizes = grouped.size()
+    for sample_id, size in sizes[sizes != 2].items():
+        errors.append(f"Sample {sample_id} has {size} files instead of 2.")
+    orientations = manifest[orientation_col]
+    is_oriented = orientations.isin(orientation_vals)
+    for sample_id, val in manifest.loc[
+        ~is_oriented, [sample_col, orientation_col]
+    ].values:
+        errors.append(f"Sample {sample_id} has an invalid read orientation ({val}).")
+    counts = pd.crosstab(manifest[sample_col], orientations)
+    counts = counts.reindex(columns=list(orientation_vals), fill_value=0)
+    for val in orientation_vals:
+        for sample_id, count in counts.loc[counts[val] != 1, val].items():
+            errors.append(f"Sample {sample_id} has {count} {val} files instead of 1.")
+
+    # Validate metadata that should be unique per sample
+    metadata_cols = [
+        strandedness_col,
+        library_col,
+        platform_col,
+        readlen_col,
+        sampletype_col,
+    ]
+    nunique = grouped[metadata_cols].nunique(dropna=False)
+    for col in metadata_cols:
+        for sample_id in nunique.index[nunique[col] > 1]:
+            errors.append(f"Sample {sample_id} has multiple values for '{col}'.")
+    metadata = grouped[metadata_cols].first()
+    strandedness = metadata[strandedness_col].map(strandedness_map)
+    is_invalid = strandedness.isna() & (nunique[strandedness_col] == 1)
+    for sample_id, val in metadata.loc[is_invalid, strandedness_col].items():
+        errors.append(f"Sample {sample_id} has an invalid strandedness ({val}).")
+    if errors:
+        raise ValueError("Invalid manifest:\n" + "\n".join(errors))
+
+    # Pivot the R1 and R2 files into columns
+    reads = manifest[is_oriented].pivot(
+        index=sample_col, columns=orientation_col, values=file_col
+    )
+    sample_ids = pd.Series(metadata.index, index=metadata.index)
+    samples = pd.DataFrame(
+        {
+            "sample_id": sample_ids,
+            "reads1": reads[r1_val],
+            "reads2": reads[r2_val],
+            "strandedness": strandedness,
+            "library_id": metadata[library_col],
+            "platform": metadata[platform_col],
+            "read_length": metadata[readlen_col],
+            "is_tumor": metadata[sampletype_col].astype(str).str.contains(TUMOR_REGEX),
+        },
+        index=metadata.index,
+    )
+    samples["read_group"] = format_read_groups(
+        sample_ids, samples.library_id, samples.platform
+    )
+    return samples
+
+
+def resolve_files(client, file_ids, files=None, batch_size=BULK_BATCH_SIZE):
+    """Retrieves files in bulk (in batches) and adds them to a map keyed by file ID.
+
+    Files that are already in the map (e.g., from previous manifest chunks)
+    aren't retrieved again.
+
+    Args:
+        client (sbg.Api): SevenBridges API client.
+        file_ids (iterable of str): SevenBridges file IDs.
+        files (dict, optional): Map of resolved files to update. Defaults to None,
+            which creates a new map.
+        batch_size (int, optional): Number of files per bulk API call.
+            Defaults to BULK_BATCH_SIZE.
+
+    Raises:
+        ValueError: If a file cannot be retrieved.
+
+    Returns:
+        dict: Resolved files keyed by file ID.
+    """
+    files = dict() if files is None else files
+    missing = [
+        x for x in pd.unique(pd.Series(file_ids, dtype=object)) if x not in files
+    ]
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start : start + batch_size]
+        records = client.files.bulk_get(batch)
+        for file_id, record in zip(batch, records):
+            if not record.valid:
+                raise ValueError(f"Failed to retrieve file {file_id}: {record.error}")
+            files[file_id] = record.resource
+    return files
+
+
+def format_read_groups(sample_ids, library_ids, platforms):
+    """Formats the STAR read group lines for many samples at once."""
+    sample_ids, library_ids, platforms = (
+        x.astype(str).str.replace(r"\s", "_", regex=True)
+        for x in (sample_ids, library_ids, platforms)
+    )
+    return (
+        "ID:"
+        + sample_ids
+        + "\tLB:"
+        + library_ids
+        + "\tPL:"
+        + platforms
+        + "\tSM:"
+        + sample_ids
+    )
+
 
-def get_unique_value(df, col, default=None):
-    """Retrieves unique scalar value from Pandas DataFrame column."""
-    if col not in df and default is not None:
-        raw = [default]
-    else:
-        raw = df[col].unique()
-    assert len(raw) == 1
-    val = raw[0]
-    if isinstance(val, np.int64):
-        val = int(val)
-    return val
+def set_output_basename(task):
+    """Updates the output basename of a drafted task using its task ID."""
+    task.inputs["output_basename"] = task.id
+    task.save()
 
 
-def format_rg_val(val):
-    """Replaces all whitespace from input string with underscores."""
-    return re.sub(r"\s", "_", val)
+KF_RNASEQ_INPUTS_TEMPLATE = AppInputsTemplate(
+    columns={
+        "reads1": "reads1",
+        "reads2": "reads2",
+        "wf_strand_param": "strandedness",
+        "sample_name": "sample_id",
+        "rmats_read_length": "read_length",
+        "outSAMattrRGline": "read_group",
+    },
+    constants={"input_type": "FASTQ", "runThreadN": 36},
+    file_inputs=("reads1", "reads2"),
+    blocks={"is_tumor": {False: GTEX_NORMAL_PARAMS}},
+)
 
 
 # TODO: Currently assumes paired-end data
 # TODO: Separate function to import suggested reference files
 # TODO: Add support for (and validate) different versions of the workflow
-# TODO: Add mapping between app IDs (and versions?) to factory functions
+@register_app_inputs_factory("kfdrc-rnaseq-workflow")
 def manifest_to_kf_rnaseq_app_inputs_factory(
     file_col="cavatica_file_id",
     sample_col="sample_id",
@@ -91,61 +403,30 @@ def manifest_to_kf_rnaseq_app_inputs_factory(
 
     def manifest_to_kf_rnaseq_app_inputs(client, manifest):
         """Prepares KF RNA-seq app inputs from file manifest."""
-        # Unpacking valid values
-        r1_val, r2_val = orientation_vals
-        strandedness_map = dict(zip(strandedness_vals, STRANDEDNESS_DEFAULTS))
-
-        # Prepare inputs
-        by_sample = manifest.groupby(sample_col)
-        for sample_id in by_sample.groups:
-            # Subset manifest for specific sample
-            sample_df = by_sample.get_group(sample_id)
-            assert len(sample_df.index) == 2
-            # Retrieve Cavatica file IDs
-            r1_file_id = sample_df[sample_df[orientation_col] == r1_val][file_col].iat[
-                0
-            ]
-            r2_file_id = sample_df[sample_df[orientation_col] == r2_val][file_col].iat[
-                0
-            ]
-            # Retrieve other metadata
-            strandedness_raw = get_unique_value(sample_df, strandedness_col)
-            strandedness = strandedness_map.get(strandedness_raw, None)
-            assert strandedness
-            library_id = get_unique_value(sample_df, library_col, "Not_Reported")
-            platform = get_unique_value(sample_df, platform_col, "Not_Reported")
-            read_length = get_unique_value(sample_df, readlen_col)
-            sample_type = get_unique_value(sample_df, sampletype_col)
-            is_tumor = TUMOR_REGEX.search(sample_type)
-            # Prepare params dictionary
-            inputs = dict() if is_tumor else deepcopy(GTEX_NORMAL_PARAMS)
-            updates = {
-                "input_type": "FASTQ",
-                "reads1": client.files.get(r1_file_id),
-                "reads2": client.files.get(r2_file_id),
-                "runThreadN": 36,
-                "wf_strand_param": strandedness,
-                "sample_name": sample_id,
-                "rmats_read_length": read_length,
-                "outSAMattrRGline": "\t".join(
-                    map(
-                        format_rg_val,
-                        [
-                            f"ID:{sample_id}",
-                            f"LB:{library_id}",
-                            f"PL:{platform}",
-                            f"SM:{sample_id}",
-                        ],
-                    )
-                ),
-            }
-            inputs.update(updates)
-            task_name = "kf-rnaseq-workflow - " + sample_id
-
-            def callback_fn(task):
-                task.inputs["output_basename"] = task.id
-                task.save()
-
-            yield task_name, inputs, callback_fn
+        files = dict()
+        # The manifest can also be an iterable of chunks
+        for chunk in iter_sample_chunks(manifest, sample_col):
+            # Validate and summarize the samples in whole-frame operations
+            samples = prepare_kf_rnaseq_samples(
+                chunk,
+                file_col,
+                sample_col,
+                readlen_col,
+                sampletype_col,
+                orientation_col,
+                orientation_vals,
+                strandedness_col,
+                strandedness_vals,
+                library_col,
+                platform_col,
+            )
+            # Resolve the files of the chunk in bulk
+            resolve_files(client, pd.concat([samples.reads1, samples.reads2]), files)
+            # Prepare inputs
+            for sample_id, inputs in KF_RNASEQ_INPUTS_TEMPLATE.iter_inputs(
+                samples, files
+            ):
+                task_name = "kf-rnaseq-workflow - " + sample_id
+                yield task_name, inputs, set_output_basename
 
     return manifest_to_kf_rnaseq_app_inputs
@@ -1,34 +1,100 @@
 import re
-import time
-from functools import partial
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import PurePosixPath
+from threading import Lock
 
 import sevenbridges as sbg
-from sevenbridges import ImportExportState
+from sevenbridges import ImportExportState, TaskStatus
 from sevenbridges.http.error_handlers import maintenance_sleeper, rate_limit_sleeper
 from sevenbridges.meta.transformer import Transform
 from sevenbridges.models.project import Project
 
+from sagetasks.utils import TtlCache, Waiter, hash_client_args
+
 ENDPOINTS = {
     "cavatica": "https://cavatica-api.sbgenomics.com/v2",
     "cgc": "https://cavatica-api.sbgenomics.com/v2",
     "sevenbridges": "https://api.sbgenomics.com/v2",
 }
 
+# Maximum number of items per bulk API call
+BULK_BATCH_SIZE = 100
+
+# Initial and maximum intervals (in seconds) for polling job statuses
+POLL_INITIAL = 1
+POLL_MAXIMUM = 60
+
+IMPORT_DONE_STATES = (ImportExportState.COMPLETED, ImportExportState.FAILED)
+TASK_DONE_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.ABORTED)
+
+
+class ClientRegistry:
+    def __init__(self, maxsize=16) -> None:
+        """Thread-safe registry of shared SevenBridges API clients.
+
+        Clients are keyed by a hash of their arguments, such that tasks
+        using the same `client_args` (e.g., mapped Prefect tasks) reuse
+        the same client and thus its pool of warm connections.
+
+        Args:
+            maxsize (int, optional): Maximum number of clients kept in
+                the registry. Defaults to 16.
+        """
+        self.clients = TtlCache(ttl=None, maxsize=maxsize)
+        self._lock = Lock()
+
+    @staticmethod
+    def init_client(client_args):
+        """Creates a SevenBridges API client that sleeps through rate limits."""
+        error_handlers = [rate_limit_sleeper, maintenance_sleeper]
+        return sbg.Api(**client_args, error_handlers=error_handlers)
+
+    def get_client(self, client_args):
+        """Retrieves the shared client for the given arguments (or creates it)."""
+        key = hash_client_args(client_args)
+        with self._lock:
+            return self.clients.get_or_set(key, partial(self.init_client, client_args))
+
+    def invalidate(self, client_args=None):
+        """Discards a shared client (or all clients if no arguments are given)."""
+        key = None if client_args is None else hash_client_args(client_args)
+        self.clients.invalidate(key)
+
+
+# Process-wide registry shared by the SevenBridges tasks
+CLIENT_REGISTRY = ClientRegistry()
+
 
 class SbgUtils:
-    def __init__(self, client_args) -> None:
+    def __init__(self, client_args, shared_client=True) -> None:
         """Initializes the SevenBridges client with the bundled information.
 
         `client_args` can be generated with the `bundle_client_args()` static method.
+        By default, the client is retrieved from a process-wide registry, such that
+        instances with the same `client_args` share the same client and connection
+        pool. Set `shared_client` to False to create a dedicated client instead.
 
         Optionally, you can set a default project for various methods with the
         `open_project()` method.
+
+        The children of project folders are listed once and indexed by type and name
+        (see `get_children()`), so repeated lookups don't require API calls. Public
+        apps and project app listings are also memoized (see `invalidate_apps()`),
+        and concurrent lookups of the same app share a single API call.
         """
-        self.client = sbg.Api(
-            **client_args, error_handlers=[rate_limit_sleeper, maintenance_sleeper]
-        )
+        if shared_client:
+            self.client = CLIENT_REGISTRY.get_client(client_args)
+        else:
+            self.client = ClientRegistry.init_client(client_args)
         self._project = None
+        self._children = dict()
+        self._public_apps = TtlCache(ttl=None, maxsize=None)
+        self._project_apps = TtlCache(ttl=None, maxsize=None)
+        self._app_locks = defaultdict(Lock)
+        self._apps_lock = Lock()
 
     def extract_id(self, resource):
         """Extracts the resource ID (or returns the ID if already a string).
@@ -54,7 +120,12 @@ class SbgUtils:
 
     @staticmethod
     def bundle_client_args(auth_token, platform="cavatica", endpoint=None, **kwargs):
-        """Bundles the information for authenticating a SevenBridges client."""
+        """Bundles the information for authenticating a SevenBridges client.
+
+        Additional keyword arguments are passed to `sbg.Api()`, which can be used
+        to change its connection pool and concurrency settings (e.g., `pool_maxsize`,
+        `max_parallel_requests`, or `advance_access`).
+        """
         assert platform is None or platform in ENDPOINTS
         assert platform or endpoint
         endpoint = endpoint if endpoint else ENDPOINTS[platform]
@@ -115,23 +186,61 @@ class SbgUtils:
         project_id = self.extract_id(project)
         project = self.get_project(project_id=project_id)
         self._project = project
+        self.invalidate_children()
+        self.invalidate_apps()
 
-    def get_public_app(self, app_id):
-        """Retrieves the public app with the given ID."""
+    def _query_public_app(self, app_id):
+        """Queries the public app with the given ID."""
         public_apps = self.client.apps.query(visibility="public", id=app_id)
         assert len(public_apps) == 1
         public_app = public_apps[0]
         return public_app
 
-    def _get_apps_by_name(self, app_name):
-        """Retrieves the private apps with the given name."""
+    def _get_or_query_app(self, cache, key, query_fn):
+        """Retrieves a memoized app lookup, locking per key during the query.
+
+        Concurrent lookups of the same key share a single API call, whereas
+        lookups of different keys aren't serialized.
+        """
+        with self._apps_lock:
+            key_lock = self._app_locks[(id(cache), key)]
+        with key_lock:
+            return cache.get_or_set(key, query_fn)
+
+    def get_public_app(self, app_id):
+        """Retrieves the public app with the given ID (memoized)."""
+        query_fn = partial(self._query_public_app, app_id)
+        return self._get_or_query_app(self._public_apps, app_id, query_fn)
+
+    def _query_apps_by_name(self, app_name):
+        """Queries the private apps with the given name."""
         project_apps = self.client.apps.query(project=self.project, q=app_name)
-        return project_apps
+        return list(project_apps.all())
+
+    def _get_apps_by_name(self, app_name):
+        """Retrieves the private apps with the given name (memoized)."""
+        query_fn = partial(self._query_apps_by_name, app_name)
+        return self._get_or_query_app(self._project_apps, app_name, query_fn)
+
+    def invalidate_apps(self, public=False):
+        """Discards the memoized project app listings (and optionally public apps).
+
+        This is done automatically after a public app is copied with `import_app()`.
+        """
+        self._project_apps.invalidate()
+        if public:
+            self._public_apps.invalidate()
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _compile_suffix_regex(app_slug):
+        """Compiles the regular expression for the suffix of copied app IDs."""
+        return re.compile(re.escape(app_slug) + r"-(\d+)")
 
     def _get_app_suffix(self, app_slug, increment=False):
         """Generates an incrementing suffix for public apps that are copied."""
         apps = self._get_apps_by_name(app_slug)
-        regex = re.compile(app_slug + r"-(\d)+")
+        regex = self._compile_suffix_regex(app_slug)
         matches = [regex.search(x.id) for x in apps]
         matches = [x for x in matches if x]
         if matches:
@@ -158,7 +267,7 @@ class SbgUtils:
     def get_copied_app(self, app_id):
         """Retrieves a public app that's been copied to a project."""
         app_name = self.get_copied_app_name(app_id)
-        apps = self.client.apps.query(project=self.project, q=app_name)
+        apps = self._get_apps_by_name(app_name)
         # If multiple projects exist, pick the one with the shortest name
         apps = [x for x in apps if not x.raw.get("sbg:archived", False)]
         if len(apps) > 1:
@@ -171,6 +280,7 @@ class SbgUtils:
         public_app = self.get_public_app(app_id)
         app_name = self.get_copied_app_name(app_id, increment=True)
         project_app = public_app.copy(project=self.project, name=app_name)
+        self.invalidate_apps()
         return project_app
 
     def get_or_create_copied_app(self, app_id):
@@ -212,18 +322,48 @@ class SbgUtils:
             parent_args = {"parent": parent}
         return parent_args
 
+    def get_children(self, parent, child_type):
+        """Retrieves the children of the given type (file or folder), keyed by name.
+
+        All children are listed (with full pagination) the first time a parent is
+        used, and the index is kept up to date as folders are created and files are
+        imported with this instance. Use `invalidate_children()` if the parent was
+        modified by other means.
+        """
+        parent_id = self.extract_id(parent)
+        if parent_id not in self._children:
+            parent_args = self._get_parent_args(parent)
+            index = {"file": dict(), "folder": dict()}
+            for child in self.client.files.query(**parent_args).all():
+                children = index.setdefault(getattr(child, "type", None), dict())
+                children[child.name] = child
+            self._children[parent_id] = index
+        return self._children[parent_id].get(child_type, dict())
+
+    def _add_child(self, parent, child, child_type):
+        """Adds a new child to the index if the parent was already listed."""
+        index = self._children.get(self.extract_id(parent))
+        if index is not None:
+            index.setdefault(child_type, dict())[child.name] = child
+
+    def invalidate_children(self, parent=None):
+        """Discards the indexed children of a parent (or all parents if None)."""
+        if parent is None:
+            self._children.clear()
+        else:
+            self._children.pop(self.extract_id(parent), None)
+
     def get_folder(self, folder_name, parent):
         """Retrieves the folder with the given name and parent."""
-        parent_args = self._get_parent_args(parent)
-        children = self.client.files.query(**parent_args)
-        folders = [x for x in children if getattr(x, "type", None) == "folder"]
-        matches = [x for x in folders if x.name == folder_name]
+        folders = self.get_children(parent, "folder")
+        matches = [folders[folder_name]] if folder_name in folders else []
         return matches
 
     def create_folder(self, folder_name, parent):
         """Creates a folder with the given name and parent."""
         parent_args = self._get_parent_args(parent)
         folder = self.client.files.create_folder(name=folder_name, **parent_args)
+        self._add_child(parent, folder, "folder")
         return folder
 
     def get_or_create_folder(self, folder_name, parent):
@@ -239,24 +379,23 @@ class SbgUtils:
         for folder_name in folder_names:
             folder = self.get_or_create_folder(folder_name, parent)
             parent = folder
-        return folder
+        return parent
 
     def get_file(self, file_name, parent):
         """Retrieves a file with the given name and parent."""
-        parent_args = self._get_parent_args(parent)
-        children = self.client.files.query(**parent_args)
-        files = [x for x in children if getattr(x, "type", None) == "file"]
-        matches = [x for x in files if x.name == file_name]
+        files = self.get_children(parent, "file")
+        matches = [files[file_name]] if file_name in files else []
         return matches
 
-    def _wait_for_import_job(self, import_job):
+    @staticmethod
+    def init_waiter(timeout=None):
+        """Creates a waiter for polling job statuses with exponential backoff."""
+        return Waiter(POLL_INITIAL, POLL_MAXIMUM, timeout=timeout)
+
+    def _wait_for_import_job(self, import_job, timeout=None):
         """Waits for the volume file import job to complete (successfully or not)."""
-        while True:
-            import_state = import_job.reload().state
-            if import_state in (ImportExportState.COMPLETED, ImportExportState.FAILED):
-                break
-            time.sleep(5)
-        return import_job
+        waiter = self.init_waiter(timeout)
+        return waiter.wait(import_job.reload, lambda x: x.state in IMPORT_DONE_STATES)
 
     def _get_imported_file(self, import_job):
         """Retrieves the imported file with the given import job."""
@@ -270,11 +409,13 @@ class SbgUtils:
 
     def import_volume_file(self, volume_id, volume_path, parent):
         """Imports the given volume file under the given parent."""
+        parent_args = self._get_parent_args(parent)
         import_job = self.client.imports.submit_import(
-            volume=volume_id, parent=parent, location=volume_path
+            volume=volume_id, location=volume_path, **parent_args
         )
         import_job = self._wait_for_import_job(import_job)
         imported_file = self._get_imported_file(import_job)
+        self._add_child(parent, imported_file, "file")
         return imported_file
 
     def get_or_create_volume_file(self, volume_id, volume_path, project_path):
@@ -288,6 +429,96 @@ class SbgUtils:
         create_fn = partial(self.import_volume_file, volume_id, volume_path, parent)
         return self.get_or_create(get_fn, create_fn)
 
+    def _submit_imports(self, volume_id, submissions, results):
+        """Submits import jobs in batches and returns the jobs by result index."""
+        import_jobs = dict()
+        for start in range(0, len(submissions), BULK_BATCH_SIZE):
+            batch = submissions[start : start + BULK_BATCH_SIZE]
+            # Files at the project root are imported with `project` instead of `parent`
+            imports = [
+                {
+                    "volume": volume_id,
+                    "location": path,
+                    "name": name,
+                    **self._get_parent_args(parent),
+                }
+                for _, path, parent, name in batch
+            ]
+            try:
+                records = self.client.imports.bulk_submit(imports)
+            except sbg.SbgError as error:
+                # Invalid batches are reported per file rather than aborting
+                for index, *_ in batch:
+                    results[index]["error"] = str(error)
+                continue
+            for (index, *_), record in zip(batch, records):
+                if record.valid:
+                    import_jobs[index] = record.resource
+                else:
+                    results[index]["error"] = str(record.error)
+        return import_jobs
+
+    def _wait_for_import_jobs(self, import_jobs, results, timeout=None):
+        """Waits for import jobs to complete and returns the files by result index."""
+
+        def is_done(record):
+            return not record.valid or record.resource.state in IMPORT_DONE_STATES
+
+        waiter = self.init_waiter(timeout)
+        bulk_reload = self.client.imports.bulk_get
+        records = waiter.wait_all(import_jobs, bulk_reload, is_done, BULK_BATCH_SIZE)
+        imported_files = dict()
+        for index, record in records.items():
+            import_job = record.resource
+            if not record.valid:
+                results[index]["error"] = str(record.error)
+            elif import_job.state == ImportExportState.COMPLETED:
+                imported_files[index] = import_job.result
+            else:
+                results[index]["error"] = str(import_job.error)
+        return imported_files
+
+    def import_volume_files(self, volume_id, specs, timeout=None):
+        """Gets (or imports) many volume files under the given project paths.
+
+        `specs` are pairs of volume paths and project paths. Unlike with
+        `get_or_create_volume_file()`, missing files are imported using bulk API calls,
+        and all import jobs are tracked together with bulk status updates rather than
+        waiting for each job in turn. One result is returned per spec (in the same
+        order) with the file ID (or None) and the error message (or None). Statuses
+        are polled with exponential backoff, and a `TimeoutError` is raised if jobs
+        are still pending after `timeout` seconds (if set).
+        """
+        results = list()
+        submissions = list()
+        folders = dict()
+        for index, (volume_path, project_path) in enumerate(specs):
+            project_path = PurePosixPath(project_path)
+            result = {
+                "volume_path": volume_path,
+                "project_path": str(project_path),
+                "file_id": None,
+                "error": None,
+            }
+            results.append(result)
+            dir_name = project_path.parent
+            if dir_name not in folders:
+                folders[dir_name] = self.get_folders_recursively(dir_name.parts)
+            parent = folders[dir_name]
+            existing_file = self.get_children(parent, "file").get(project_path.name)
+            if existing_file is not None:
+                result["file_id"] = self.extract_id(existing_file)
+            else:
+                submissions.append((index, volume_path, parent, project_path.name))
+        import_jobs = self._submit_imports(volume_id, submissions, results)
+        imported_files = self._wait_for_import_jobs(import_jobs, results, timeout)
+        for index, _, parent, _ in submissions:
+            if index in imported_files:
+                imported_file = imported_files[index]
+                results[index]["file_id"] = self.extract_id(imported_file)
+                self._add_child(parent, imported_file, "file")
+        return results
+
     def get_task(self, task_name=None, app_id=None):
         """Retrieves the tasks with the given name and/or app ID."""
         matches = self.client.tasks.query(project=self.project)
@@ -315,3 +546,61 @@ class SbgUtils:
         get_fn = partial(self.get_task, task_name, app_id)
         create_fn = partial(self.create_task, app_id, inputs, task_name, callback_fn)
         return self.get_or_create(get_fn, create_fn)
+
+    def get_tasks_by_name(self, app_id=None):
+        """Retrieves all tasks in the project (optionally for an app), keyed by name."""
+        tasks = defaultdict(list)
+        for task in self.client.tasks.query(project=self.project).all():
+            if app_id is None or app_id in task.app:
+                tasks[task.name].append(task)
+        return tasks
+
+    def get_or_create_tasks(self, app_id, specs, max_workers=8):
+        """Gets (or drafts) many tasks with the given app.
+
+        `specs` are tuples of task names, inputs, and callback functions (see
+        `create_task()`), such as those generated by the app input factories. Unlike
+        with `get_or_create_task()`, the existing tasks are listed only once. There's
+        no bulk API for drafting tasks, so missing tasks are drafted (and updated by
+        their callback functions) concurrently, one batch of specs at a time. The
+        tasks are returned in the same order as `specs`.
+        """
+        specs = iter(specs)
+        existing_tasks = self.get_tasks_by_name(app_id)
+        tasks = list()
+        with ThreadPoolExecutor(max_workers) as executor:
+            batch = list(islice(specs, BULK_BATCH_SIZE))
+            while batch:
+                futures = dict()
+                for task_name, inputs, callback_fn in batch:
+                    matches = existing_tasks.get(task_name, [])
+                    if len(matches) > 1:
+                        raise ValueError("There shouldn't be more than one match.")
+                    if not matches and task_name not in futures:
+                        futures[task_name] = executor.submit(
+                            self.create_task, app_id, inputs, task_name, callback_fn
+                        )
+                for task_name, future in futures.items():
+                    existing_tasks[task_name] = [future.result()]
+                tasks.extend(existing_tasks[task_name][0] for task_name, *_ in batch)
+                batch = list(islice(specs, BULK_BATCH_SIZE))
+        return tasks
+
+    def wait_for_tasks(self, tasks, timeout=None):
+        """Waits for tasks to finish (successfully or not) using bulk status updates.
+
+        Returns the reloaded tasks keyed by task ID. A `TimeoutError` is raised if
+        tasks are still running after `timeout` seconds (if set).
+        """
+        task_ids = {self.extract_id(task): task for task in tasks}
+
+        def is_done(record):
+            return not record.valid or record.resource.status in TASK_DONE_STATUSES
+
+        waiter = self.init_waiter(timeout)
+        bulk_reload = self.client.tasks.bulk_get
+        records = waiter.wait_all(task_ids, bulk_reload, is_done, BULK_BATCH_SIZE)
+        for record in records.values():
+            if not record.valid:
+                raise sbg.SbgError(f"Failed to retrieve task status: {record.error}")
+        return {task_id: record.resource for task_id, record in records.items()}
@@ -0,0 +1,415 @@
+import hashlib
+import json
+import os
+import shutil
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Iterator, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover
+    pa = None
+    feather = None
+
+# Location and size budget (in bytes) of the on-disk table cache
+TABLE_CACHE_DIR = os.environ.get(
+    "SYNAPSE_TABLE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "sagetasks", "tables"),
+)
+TABLE_CACHE_MAX_BYTES = int(
+    os.environ.get("SYNAPSE_TABLE_CACHE_MAX_BYTES", 5 * 2**30)
+)
+
+RAW_FILENAME = "raw"
+
+
+def has_labels(usecols) -> bool:
+    """Check whether selected columns are given by label (not position).
+
+    Args:
+        usecols (list): Column labels or positions.
+
+    Returns:
+        bool: Whether all columns are given by label.
+    """
+    return all(isinstance(col, str) for col in usecols)
+
+
+def select_labels(columns, usecols) -> list:
+    """Convert selected columns into labels, like `pd.read_table()`.
+
+    Labels are kept in the requested order, whereas positions are kept
+    in file order.
+
+    Args:
+        columns (list): Column labels of the whole table.
+        usecols (list): Column labels or positions.
+
+    Returns:
+        list: Labels of the selected columns.
+    """
+    if has_labels(usecols):
+        return list(usecols)
+    return [columns[position] for position in sorted(set(usecols))]
+
+
+class TableCache:
+    def __init__(
+        self,
+        cache_dir: str = TABLE_CACHE_DIR,
+        max_bytes: Optional[int] = TABLE_CACHE_MAX_BYTES,
+    ) -> None:
+        """On-disk cache of tables downloaded from Synapse.
+
+        Entries are keyed by the Synapse ID, the version number and the
+        MD5 checksum of the file handle, so a new file version is never
+        served stale content. Each entry holds the raw file along with a
+        columnar copy of the parsed table per set of parsing options (and
+        selected columns). The columnar copy is stored in the Feather format
+        and memory-mapped on later loads if `pyarrow` is installed (`pip
+        install sagetasks[arrow]`), or pickled otherwise (including for
+        tables that cannot be converted to Arrow, such as those with
+        mixed-type columns). The least recently used entries are evicted
+        once the cache exceeds its size budget.
+
+        Args:
+            cache_dir (str, optional): Cache directory. Defaults to the
+                `SYNAPSE_TABLE_CACHE_DIR` environment variable (or
+                `~/.cache/sagetasks/tables`).
+            max_bytes (int, optional): Size budget for the cache. Defaults
+                to the `SYNAPSE_TABLE_CACHE_MAX_BYTES` environment variable
+                (or 5 GiB). Set to None for an unbounded cache.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.raw_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = Lock()
+
+    def entry_dir(self, synapse_id: str, version: int, md5: str) -> str:
+        """Compute the directory for a cache entry.
+
+        Args:
+            synapse_id (str): Synapse ID of a file entity.
+            version (int): Version number of the file entity.
+            md5 (str): MD5 checksum of the file handle.
+
+        Returns:
+            str: Directory for the cache entry.
+        """
+        return os.path.join(self.cache_dir, f"{synapse_id}.{version}.{md5}")
+
+    def table_filename(self, **read_args) -> str:
+        """Compute the filename of the columnar copy for parsing options.
+
+        The filename has no extension, which depends on the format used
+        for storing the columnar copy (see `write_table()`).
+
+        Args:
+            **read_args: Named arguments for `pd.read_table()`.
+
+        Returns:
+            str: Filename of the columnar copy.
+        """
+        serialized = json.dumps(read_args, sort_keys=True, default=repr)
+        digest = hashlib.sha256(serialized.encode()).hexdigest()[:16]
+        return f"table-{digest}"
+
+    def find_table(self, path: str) -> Optional[str]:
+        """Find an existing columnar copy in any of the supported formats.
+
+        Args:
+            path (str): Path to the columnar copy without an extension.
+
+        Returns:
+            str, optional: Path to the columnar copy (or None if missing).
+        """
+        for extension in (".feather", ".pkl"):
+            if os.path.exists(path + extension):
+                return path + extension
+        return None
+
+    def touch(self, path: str) -> None:
+        """Mark an entry as recently used.
+
+        Args:
+            path (str): Entry directory.
+        """
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def write_atomic(self, path: str, write) -> None:
+        """Write a file such that readers never see a partial file.
+
+        Args:
+            path (str): Destination path.
+            write (Callable): Function writing the content to a given path.
+        """
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        with NamedTemporaryFile(dir=directory, delete=False) as temp_file:
+            temp_path = temp_file.name
+        try:
+            write(temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def fetch_raw(self, entry: str, open_source) -> str:
+        """Retrieve the raw file for an entry, downloading it if needed.
+
+        Args:
+            entry (str): Entry directory.
+            open_source (Callable): Context manager factory returning a
+                binary file-like object for the remote file.
+
+        Returns:
+            str: Path to the local raw file.
+        """
+        raw_path = os.path.join(entry, RAW_FILENAME)
+        if os.path.exists(raw_path):
+            with self._lock:
+                self.raw_hits += 1
+            return raw_path
+
+        def download(path: str) -> None:
+            with open_source() as source, open(path, "wb") as target:
+                shutil.copyfileobj(source, target)
+
+        self.write_atomic(raw_path, download)
+        return raw_path
+
+    def read_table(self, path: str, usecols=None) -> pd.DataFrame:
+        """Read a columnar copy, memory-mapping it if possible.
+
+        Args:
+            path (str): Path to the columnar copy.
+            usecols (list, optional): Subset of columns to load, given
+                by label or by position. Defaults to None.
+
+        Returns:
+            pd.DataFrame: The loaded table.
+        """
+        if not path.endswith(".feather"):
+            data_frame = pd.read_pickle(path)
+            if usecols is None:
+                return data_frame
+            return data_frame[select_labels(data_frame.columns, usecols)]
+        table = feather.read_table(path, memory_map=True)
+        if usecols is not None:
+            table = table.select(select_labels(table.column_names, usecols))
+        return table.to_pandas()
+
+    def write_table(self, path: str, data_frame: pd.DataFrame) -> str:
+        """Write a columnar copy of a table.
+
+        The Feather format is used if possible. Otherwise, the table is
+        pickled (e.g., if `pyarrow` is missing or if some columns cannot
+        be converted to Arrow).
+
+        Args:
+            path (str): Path to the columnar copy without an extension.
+            data_frame (pd.DataFrame): Table to be cached.
+
+        Returns:
+            str: Path to the columnar copy.
+        """
+        if feather is not None:
+            try:
+                table = pa.Table.from_pandas(data_frame, preserve_index=False)
+            except pa.ArrowException:
+                pass
+            else:
+                feather_path = path + ".feather"
+
+                def write_feather(temp_path: str) -> None:
+                    # Uncompressed files can be memory-mapped without copies
+                    feather.write_feather(table, temp_path, compression="uncompressed")
+
+                self.write_atomic(feather_path, write_feather)
+                return feather_path
+        pickle_path = path + ".pkl"
+        self.write_atomic(pickle_path, data_frame.to_pickle)
+        return pickle_path
+
+    def load(
+        self,
+        synapse_id: str,
+        version: int,
+        md5: str,
+        open_source,
+        usecols=None,
+        **read_args,
+    ) -> pd.DataFrame:
+        """Load a table, using the cached copies whenever possible.
+
+        Args:
+            synapse_id (str): Synapse ID of a file entity.
+            version (int): Version number of the file entity.
+            md5 (str): MD5 checksum of the file handle.
+            open_source (Callable): Context manager factory returning a
+                binary file-like object for the remote file.
+            usecols (list, optional): Subset of columns to load. Only these
+                columns are parsed (and cached) on a miss, although they're
+                projected from a columnar copy of the whole table if there
+                is one. Defaults to None.
+            **read_args: Other named arguments for `pd.read_table()`.
+
+        Returns:
+            pd.DataFrame: The loaded table.
+        """
+        entry = self.entry_dir(synapse_id, version, md5)
+        full_path = os.path.join(entry, self.table_filename(usecols=None, **read_args))
+        table_path = os.path.join(
+            entry, self.table_filename(usecols=usecols, **read_args)
+        )
+        existing_path = self.find_table(table_path)
+        projection = None
+        if existing_path is None and usecols is not None and not callable(usecols):
+            # Projections can be served from a copy of the whole table
+            existing_path = self.find_table(full_path)
+            projection = usecols
+        if existing_path is not None:
+            with self._lock:
+                self.hits += 1
+            self.touch(entry)
+            return self.read_table(existing_path, projection)
+        with self._lock:
+            self.misses += 1
+        raw_path = self.fetch_raw(entry, open_source)
+        data_frame = pd.read_table(raw_path, usecols=usecols, **read_args)
+        if usecols is not None and not callable(usecols) and has_labels(usecols):
+            # Labels are returned in the requested order, like projections
+            data_frame = data_frame[list(usecols)]
+        self.write_table(table_path, data_frame)
+        self.touch(entry)
+        self.evict(keep=entry)
+        return data_frame
+
+    def iter_chunks(
+        self,
+        synapse_id: str,
+        version: int,
+        md5: str,
+        open_source,
+        chunksize: int,
+        **read_args,
+    ) -> Iterator[pd.DataFrame]:
+        """Read a table in chunks from the cached raw file.
+
+        Args:
+            synapse_id (str): Synapse ID of a file entity.
+            version (int): Version number of the file entity.
+            md5 (str): MD5 checksum of the file handle.
+            open_source (Callable): Context manager factory returning a
+                binary file-like object for the remote file.
+            chunksize (int): Number of rows per chunk.
+            **read_args: Other named arguments for `pd.read_table()`.
+
+        Yields:
+            pd.DataFrame: Successive chunks of the table.
+        """
+        entry = self.entry_dir(synapse_id, version, md5)
+        raw_path = self.fetch_raw(entry, open_source)
+        self.touch(entry)
+        self.evict(keep=entry)
+        with pd.read_table(raw_path, chunksize=chunksize, **read_args) as reader:
+            yield from reader
+
+    def entries(self) -> list:
+        """List the cache entries from least to most recently used.
+
+        Returns:
+            list: Tuples with the last use time, size and path of entries.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return list()
+        entries = list()
+        with os.scandir(self.cache_dir) as it:
+            for dir_entry in it:
+                # Files can be renamed or evicted by other threads meanwhile
+                try:
+                    if not dir_entry.is_dir():
+                        continue
+                    size = self.entry_size(dir_entry.path)
+                    last_used = dir_entry.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                entries.append((last_used, size, dir_entry.path))
+        return sorted(entries)
+
+    def entry_size(self, path: str) -> int:
+        """Compute the size of an entry, ignoring files that disappear.
+
+        Args:
+            path (str): Entry directory.
+
+        Returns:
+            int: Total size of the files in the entry (in bytes).
+        """
+        size = 0
+        with os.scandir(path) as it:
+            for file_entry in it:
+                try:
+                    size += file_entry.stat().st_size
+                except FileNotFoundError:
+                    pass
+        return size
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Evict least recently used entries until under the size budget.
+
+        Args:
+            keep (str, optional): Entry directory that shouldn't be evicted
+                (e.g., the entry that was just loaded). Defaults to None.
+        """
+        if self.max_bytes is None:
+            return
+        entries = self.entries()
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total_bytes -= size
+            with self._lock:
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for _, _, path in self.entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+    def stats(self) -> dict:
+        """Summarize the cache usage.
+
+        Returns:
+            dict: Number of hits (served from a columnar copy), raw hits
+                (served from a raw file), misses, evictions, entries and
+                the total size in bytes.
+        """
+        entries = self.entries()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "raw_hits": self.raw_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+            }
+
+
+# Process-wide cache shared by the Synapse tasks
+TABLE_CACHE = TableCache()
@@ -1,10 +1,20 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from tempfile import TemporaryDirectory
 
 import pandas as pd
 import synapseclient
 
-CONTENT_TYPES = {",": "text/csv", "\t": "text/tab-separated-values"}
+from sagetasks.synapse import upload, utils
+from sagetasks.synapse.cache import TABLE_CACHE
+from sagetasks.synapse.utils import SESSION_CACHE
+
+CONTENT_TYPES = {
+    ",": "text/csv",
+    "\t": "text/tab-separated-values",
+    "gzip": "application/gzip",
+    "parquet": "application/vnd.apache.parquet",
+}
 
 
 def bundle_client_args(auth_token, **kwargs):
@@ -14,32 +24,166 @@ def bundle_client_args(auth_token, **kwargs):
     return client_args
 
 
-def get_dataframe(client_args, synapse_id, sep=None):
-    """Synapse - Download and load data frame"""
-    client = synapseclient.login(**client_args)
+def get_dataframe(
+    client_args,
+    synapse_id,
+    sep=None,
+    chunksize=None,
+    usecols=None,
+    dtype=None,
+    use_cache=False,
+):
+    """Synapse - Download and load data frame
+
+    When `chunksize` is given, an iterator of data frames with up to
+    `chunksize` rows each is returned instead, and the file is streamed
+    such that only one chunk is held in memory at a time. The `usecols`
+    and `dtype` arguments are passed to `pd.read_table()` to limit the
+    columns being loaded and to avoid type inference, respectively.
+
+    If `use_cache` is enabled, files are cached on disk by version and
+    MD5 checksum along with a columnar copy of the parsed table (see
+    `TableCache` for the location and size budget of the cache).
+    """
+    client = SESSION_CACHE.get_client(client_args)
     file = client.get(synapse_id, downloadFile=False)
-    file_handle_id = file._file_handle.id
-    file_temp_url = client.restGET(
-        f"/file/{file_handle_id}",
-        client.fileHandleEndpoint,
-        params={
-            "fileAssociateId": synapse_id,
-            "fileAssociateType": "FileEntity",
-            "redirect": False,
-        },
-    )
-    data_frame = pd.read_table(file_temp_url, sep=sep)
+    md5 = file._file_handle.get("contentMd5")
+    read_args = dict(sep=sep, dtype=dtype)
+
+    def open_source():
+        return utils.open_url(utils.get_file_url(client, file))
+
+    if use_cache and md5:
+        cache_args = (synapse_id, file.versionNumber, md5, open_source)
+        if chunksize is not None:
+            return TABLE_CACHE.iter_chunks(
+                *cache_args, chunksize, usecols=usecols, **read_args
+            )
+        return TABLE_CACHE.load(*cache_args, usecols=usecols, **read_args)
+    file_temp_url = utils.get_file_url(client, file)
+    if chunksize is not None:
+        return utils.read_table_chunks(
+            file_temp_url, chunksize, usecols=usecols, **read_args
+        )
+    with utils.open_url(file_temp_url) as stream:
+        data_frame = pd.read_table(stream, usecols=usecols, **read_args)
     return data_frame
 
 
-def store_dataframe(client_args, data_frame, name, parent_id, sep=","):
-    """Synapse - Serialize and upload data frame"""
-    client = synapseclient.login(**client_args)
+def get_dataframes(
+    client_args,
+    synapse_ids,
+    sep=None,
+    usecols=None,
+    dtype=None,
+    concat=False,
+    source_col="synapse_id",
+    max_workers=8,
+    use_cache=False,
+):
+    """Synapse - Download and load many data frames
+
+    File entities are retrieved concurrently, and their presigned URLs are
+    resolved in batches. The files are then downloaded and parsed with up
+    to `max_workers` threads. A dictionary of data frames keyed by Synapse
+    ID is returned, unless `concat` is enabled, in which case the data
+    frames are concatenated with their Synapse ID in `source_col`. Files
+    are cached on disk if `use_cache` is enabled, like in `get_dataframe()`.
+    """
+    client = SESSION_CACHE.get_client(client_args)
+    synapse_ids = list(dict.fromkeys(synapse_ids))
+    read_args = dict(sep=sep, dtype=dtype)
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        uris = [f"/entity/{synapse_id}" for synapse_id in synapse_ids]
+        entities = dict(zip(synapse_ids, executor.map(client.restGET, uris)))
+        file_handles = utils.get_file_handles(client, entities.values())
+
+        def load(synapse_id):
+            file_handle = file_handles[synapse_id]
+            md5 = file_handle["fileHandle"].get("contentMd5")
+
+            def open_source():
+                return utils.open_url(file_handle["preSignedURL"])
+
+            if use_cache and md5:
+                version = entities[synapse_id]["versionNumber"]
+                cache_args = (synapse_id, version, md5, open_source)
+                return TABLE_CACHE.load(*cache_args, usecols=usecols, **read_args)
+            with open_source() as stream:
+                return pd.read_table(stream, usecols=usecols, **read_args)
+
+        data_frames = dict(zip(synapse_ids, executor.map(load, synapse_ids)))
+
+    if not concat:
+        return data_frames
+    if not data_frames:
+        return pd.DataFrame(columns=[source_col])
+    for synapse_id, data_frame in data_frames.items():
+        data_frame.insert(0, source_col, synapse_id)
+    return pd.concat(data_frames.values(), ignore_index=True)
+
+
+def store_dataframe(
+    client_args,
+    data_frame,
+    name,
+    parent_id,
+    sep=",",
+    file_format="csv",
+    compression=None,
+    streaming=False,
+    skip_unchanged=False,
+):
+    """Synapse - Serialize and upload data frame
+
+    The data frame is serialized as delimited text (optionally gzipped)
+    or as Parquet (with `file_format="parquet"`). By default, the output
+    is written to a temporary file and uploaded with `synapseclient`.
+    With `streaming=True`, it's instead streamed into a Synapse multipart
+    upload in bounded-size parts, which avoids the temporary file. Since
+    streaming resolves the storage location of `parent_id` itself, it's
+    opt-in and best limited to Synapse-managed storage.
+
+    If `skip_unchanged` is enabled and a file with the same name already
+    exists under `parent_id` with the same MD5 checksum as the serialized
+    output, the upload is skipped (avoiding a new version) and the
+    existing file is returned instead.
+    """
+    client = SESSION_CACHE.get_client(client_args)
+    if file_format == "parquet":
+        content_type = CONTENT_TYPES["parquet"]
+    elif compression is not None:
+        content_type = CONTENT_TYPES.get(compression, None)
+    else:
+        content_type = CONTENT_TYPES.get(sep, None)
+
+    def write(fileobj):
+        upload.serialize_dataframe(data_frame, fileobj, file_format, sep, compression)
+
+    checksum = None
+    if skip_unchanged:
+        existing_id = client.findEntityId(name, parent_id)
+        if existing_id is not None:
+            existing = client.get(existing_id, downloadFile=False)
+            checksum = upload.MultipartUploader.compute_checksum(write)
+            if existing._file_handle.get("contentMd5") == checksum[0]:
+                return existing
+
+    if streaming:
+        uploader = upload.MultipartUploader(client)
+        storage_location_id = uploader.get_storage_location_id(parent_id)
+        file_handle_id = uploader.upload(
+            write, name, content_type, storage_location_id, checksum
+        )
+        syn_file = synapseclient.File(
+            name=name, parent=parent_id, dataFileHandleId=file_handle_id
+        )
+        return client.store(syn_file)
     with TemporaryDirectory() as dirname:
         fpath = os.path.join(dirname, name)
-        content_type = CONTENT_TYPES.get(sep, None)
-        with open(fpath, "w") as f:
-            data_frame.to_csv(f, sep=sep, index=False)
+        with open(fpath, "wb") as f:
+            write(f)
         syn_file = synapseclient.File(
             fpath, name=name, parent=parent_id, contentType=content_type
         )
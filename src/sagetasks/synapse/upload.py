@@ -0,0 +1,308 @@
+import gzip
+import hashlib
+import io
+import json
+import math
+import time
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+import requests
+import synapseclient
+
+# Part sizes supported by the Synapse multipart upload API
+MIN_PART_SIZE = 5 * 2**20
+DEFAULT_PART_SIZE = 8 * 2**20
+MAX_PARTS = 10000
+
+# Number of presigned part URLs requested at once
+PRESIGNED_URL_BATCH_SIZE = 10
+
+# Timeout (in seconds) and retries for sending each part to its presigned URL
+PART_UPLOAD_TIMEOUT = 300
+PART_UPLOAD_RETRIES = 3
+PART_UPLOAD_BACKOFF = 1
+
+MULTIPART_UPLOAD_REQUEST = "org.sagebionetworks.repo.model.file.MultipartUploadRequest"
+
+
+class PartWriter(io.RawIOBase):
+    def __init__(
+        self,
+        part_size: int = DEFAULT_PART_SIZE,
+        on_part: Optional[Callable[[int, bytes], None]] = None,
+    ) -> None:
+        """Binary sink splitting a stream of bytes into bounded-size parts.
+
+        The size and MD5 checksum of the whole stream are tracked as it is
+        written. If `on_part` is provided, it's called with each complete
+        part (numbered from 1), so at most one part is held in memory at a
+        time. Otherwise, the bytes are discarded after being hashed.
+
+        Args:
+            part_size (int, optional): Size of each part (except the last
+                one). Defaults to 8 MiB.
+            on_part (Callable, optional): Function called with the part
+                number and content of each part. Defaults to None.
+        """
+        self.part_size = part_size
+        self.on_part = on_part
+        self.size = 0
+        self.md5 = hashlib.md5()
+        self.part_number = 0
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.size
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.size += len(data)
+        self.md5.update(data)
+        if self.on_part is not None:
+            self._buffer += data
+            while len(self._buffer) >= self.part_size:
+                self.flush_part(self.part_size)
+        return len(data)
+
+    def flush_part(self, size: int) -> None:
+        """Send the next part to the `on_part` function.
+
+        Args:
+            size (int): Number of buffered bytes in the part.
+        """
+        part = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self.part_number += 1
+        self.on_part(self.part_number, part)
+
+    def close(self) -> None:
+        if not self.closed and self.on_part is not None and self._buffer:
+            self.flush_part(len(self._buffer))
+        super().close()
+
+
+def serialize_dataframe(
+    data_frame: pd.DataFrame,
+    fileobj,
+    file_format: str = "csv",
+    sep: str = ",",
+    compression: Optional[str] = None,
+) -> None:
+    """Serialize a data frame into a binary file-like object.
+
+    The output is deterministic (e.g., the gzip timestamp is fixed), so
+    the same data frame always produces the same bytes.
+
+    Args:
+        data_frame (pd.DataFrame): Data frame to be serialized.
+        fileobj: Writable binary file-like object.
+        file_format (str, optional): Either "csv" (delimited text) or
+            "parquet". Defaults to "csv".
+        sep (str, optional): Delimiter for text output. Defaults to ",".
+        compression (str, optional): Either None or "gzip". For Parquet,
+            the compression applies to the column chunks (with Snappy used
+            by default). Defaults to None.
+
+    Raises:
+        ValueError: If the file format or compression is unsupported.
+    """
+    if compression not in (None, "gzip"):
+        raise ValueError(f"Unsupported compression ({compression}).")
+    if file_format == "parquet":
+        data_frame.to_parquet(fileobj, index=False, compression=compression or "snappy")
+        return
+    if file_format != "csv":
+        raise ValueError(f"Unsupported file format ({file_format}).")
+    if compression == "gzip":
+        with gzip.GzipFile(filename="", mode="wb", fileobj=fileobj, mtime=0) as gz:
+            serialize_dataframe(data_frame, gz, file_format, sep)
+        return
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+    data_frame.to_csv(text, sep=sep, index=False)
+    text.flush()
+    text.detach()
+
+
+class MultipartUploader:
+    def __init__(
+        self,
+        client: synapseclient.Synapse,
+        part_size: int = DEFAULT_PART_SIZE,
+    ) -> None:
+        """Upload generated content to Synapse without temporary files.
+
+        The Synapse multipart upload API requires the size and the MD5
+        checksum of the file before any part is sent. Hence, the content
+        is generated twice: first to compute these values while discarding
+        the bytes, and then to upload it part by part. Only one part is
+        held in memory at a time.
+
+        Args:
+            client (synapseclient.Synapse): Authenticated Synapse client.
+            part_size (int, optional): Target size of each part. It's
+                increased if the file would otherwise have too many parts.
+                Defaults to 8 MiB.
+        """
+        self.client = client
+        self.part_size = max(part_size, MIN_PART_SIZE)
+
+    def rest_post(self, uri: str, body: dict) -> dict:
+        endpoint = self.client.fileHandleEndpoint
+        return self.client.restPOST(uri, json.dumps(body), endpoint=endpoint)
+
+    def rest_put(self, uri: str) -> dict:
+        return self.client.restPUT(uri, endpoint=self.client.fileHandleEndpoint)
+
+    def get_storage_location_id(self, parent_id: str) -> Optional[int]:
+        """Retrieve the default storage location for a container.
+
+        Args:
+            parent_id (str): Synapse ID of a project or folder.
+
+        Returns:
+            int, optional: Storage location ID (or None for the default).
+        """
+        uri = f"/entity/{parent_id}/uploadDestination"
+        destination = self.client.restGET(uri, endpoint=self.client.fileHandleEndpoint)
+        return destination.get("storageLocationId")
+
+    def iter_part_urls(self, upload_id: str, num_parts: int) -> Iterator[dict]:
+        """Iterate over presigned URLs for parts, requested in batches.
+
+        Args:
+            upload_id (str): Multipart upload ID.
+            num_parts (int): Total number of parts.
+
+        Yields:
+            dict: Part number, presigned URL and signed headers.
+        """
+        uri = f"/file/multipart/{upload_id}/presigned/url/batch"
+        for start in range(1, num_parts + 1, PRESIGNED_URL_BATCH_SIZE):
+            stop = min(start + PRESIGNED_URL_BATCH_SIZE, num_parts + 1)
+            body = {"uploadId": upload_id, "partNumbers": list(range(start, stop))}
+            response = self.rest_post(uri, body)
+            yield from response["partPresignedUrls"]
+
+    @staticmethod
+    def put_part(part_url: dict, part: bytes) -> None:
+        """Send a part to its presigned URL, retrying failed attempts.
+
+        Args:
+            part_url (dict): Part number, presigned URL and signed headers.
+            part (bytes): Content of the part.
+
+        Raises:
+            requests.RequestException: If all attempts failed.
+        """
+        headers: Dict[str, str] = part_url.get("signedHeaders") or {}
+        for attempt in range(PART_UPLOAD_RETRIES + 1):
+            try:
+                response = requests.put(
+                    part_url["uploadPresignedUrl"],
+                    data=part,
+                    headers=headers,
+                    timeout=PART_UPLOAD_TIMEOUT,
+                )
+                response.raise_for_status()
+                return
+            except requests.RequestException:
+                if attempt == PART_UPLOAD_RETRIES:
+                    raise
+                time.sleep(PART_UPLOAD_BACKOFF * 2**attempt)
+
+    @staticmethod
+    def compute_checksum(write: Callable[[io.RawIOBase], None]) -> Tuple[str, int]:
+        """Compute the MD5 checksum and size of generated content.
+
+        Args:
+            write (Callable): Function writing the content into a binary
+                file-like object.
+
+        Returns:
+            Tuple[str, int]: Hexadecimal MD5 checksum and size in bytes.
+        """
+        with PartWriter() as sink:
+            write(sink)
+        return sink.md5.hexdigest(), sink.size
+
+    def upload(
+        self,
+        write: Callable[[io.RawIOBase], None],
+        file_name: str,
+        content_type: Optional[str] = None,
+        storage_location_id: Optional[int] = None,
+        checksum: Optional[Tuple[str, int]] = None,
+    ) -> str:
+        """Upload generated content as a new Synapse file handle.
+
+        Args:
+            write (Callable): Function writing the content into a binary
+                file-like object. It's called twice and must produce the
+                same bytes each time.
+            file_name (str): Name of the uploaded file.
+            content_type (str, optional): MIME type. Defaults to None.
+            storage_location_id (int, optional): Storage location ID.
+                Defaults to None, which uses the default Synapse storage.
+            checksum (Tuple[str, int], optional): MD5 checksum and size of
+                the content if already computed with `compute_checksum()`,
+                which skips the first pass. Defaults to None.
+
+        Raises:
+            RuntimeError: If the content changed between both passes, in
+                which case the multipart upload is left incomplete.
+
+        Returns:
+            str: ID of the new file handle.
+        """
+        md5_hex, size = checksum or self.compute_checksum(write)
+        part_size = max(self.part_size, math.ceil(size / MAX_PARTS))
+        num_parts = max(1, math.ceil(size / part_size))
+
+        request = {
+            "concreteType": MULTIPART_UPLOAD_REQUEST,
+            "contentType": content_type,
+            "contentMD5Hex": md5_hex,
+            "fileName": file_name,
+            "fileSizeBytes": size,
+            "partSizeBytes": part_size,
+            "storageLocationId": storage_location_id,
+        }
+        status = self.rest_post("/file/multipart", request)
+        upload_id = status["uploadId"]
+        part_urls = self.iter_part_urls(upload_id, num_parts)
+
+        def upload_part(part_number: int, part: bytes) -> None:
+            if part_number > num_parts:
+                raise RuntimeError(
+                    f"Content of '{file_name}' changed during upload "
+                    f"(more than the expected {num_parts} parts)."
+                )
+            part_url = next(part_urls)
+            if part_url["partNumber"] != part_number:
+                raise RuntimeError(
+                    f"Expected presigned URL for part {part_number} of "
+                    f"'{file_name}', got part {part_url['partNumber']}."
+                )
+            self.put_part(part_url, part)
+            part_md5 = hashlib.md5(part).hexdigest()
+            self.rest_put(
+                f"/file/multipart/{upload_id}/add/{part_number}?partMD5Hex={part_md5}"
+            )
+
+        uploader = PartWriter(part_size, upload_part)
+        write(uploader)
+        if uploader.md5.hexdigest() != md5_hex:
+            uploader.on_part = None
+            raise RuntimeError(f"Content of '{file_name}' changed during upload.")
+        uploader.close()
+        # Empty files still need one (empty) part
+        if size == 0:
+            upload_part(1, b"")
+        status = self.rest_put(f"/file/multipart/{upload_id}/complete")
+        if status.get("state") != "COMPLETED":
+            raise RuntimeError(f"Multipart upload of '{file_name}' failed: {status}")
+        return status["resultFileHandleId"]
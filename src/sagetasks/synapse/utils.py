@@ -0,0 +1,192 @@
+import json
+import os
+from collections import defaultdict
+from contextlib import contextmanager
+from threading import Lock
+from typing import IO, Dict, Iterable, Iterator, List, Mapping, Optional
+
+import pandas as pd
+import requests
+import synapseclient
+
+from sagetasks.utils import TtlCache, hash_client_args
+
+# Maximum number of file handles per batch request
+FILE_HANDLE_BATCH_SIZE = 100
+
+# Number of seconds before an unused Synapse session is discarded
+SESSION_IDLE_TIMEOUT = float(os.environ.get("SYNAPSE_SESSION_IDLE_TIMEOUT", 1800))
+
+
+class SessionCache:
+    def __init__(
+        self,
+        idle_timeout: Optional[float] = SESSION_IDLE_TIMEOUT,
+        maxsize: Optional[int] = 16,
+    ) -> None:
+        """Thread-safe cache of authenticated Synapse clients.
+
+        Clients are keyed by a hash of their arguments, so tasks sharing
+        the same `client_args` (e.g., mapped Prefect tasks) only log into
+        Synapse once per process. Concurrent requests for the same client
+        wait for a single login rather than each logging in.
+
+        Args:
+            idle_timeout (float, optional): Number of seconds before an
+                unused client is discarded. Defaults to the value of the
+                `SYNAPSE_SESSION_IDLE_TIMEOUT` environment variable (or
+                1800 seconds). Set to None to keep clients indefinitely.
+            maxsize (int, optional): Maximum number of cached clients.
+                Defaults to 16.
+        """
+        self.cache = TtlCache(ttl=idle_timeout, maxsize=maxsize, sliding=True)
+        self._login_locks: Dict[str, Lock] = defaultdict(Lock)
+        self._lock = Lock()
+
+    def get_client(self, client_args: Mapping) -> synapseclient.Synapse:
+        """Retrieve an authenticated Synapse client, logging in if needed.
+
+        Args:
+            client_args (Mapping): Arguments for `synapseclient.login()`,
+                usually from `bundle_client_args()`.
+
+        Returns:
+            synapseclient.Synapse: Authenticated Synapse client.
+        """
+        key = hash_client_args(client_args)
+        client = self.cache.get(key)
+        if client is not None:
+            return client
+        with self._lock:
+            login_lock = self._login_locks[key]
+        with login_lock:
+            client = self.cache.get(key)
+            if client is None:
+                client = synapseclient.login(**client_args)
+                self.cache.set(key, client)
+        return client
+
+    def invalidate(self, client_args: Optional[Mapping] = None) -> None:
+        """Discard a cached client (or all clients if no arguments are given).
+
+        Args:
+            client_args (Mapping, optional): Client arguments. Defaults
+                to None, which clears the whole cache.
+        """
+        key = None if client_args is None else hash_client_args(client_args)
+        self.cache.invalidate(key)
+
+
+# Process-wide cache shared by the Synapse tasks
+SESSION_CACHE = SessionCache()
+
+
+def get_file_url(client: synapseclient.Synapse, file: synapseclient.File) -> str:
+    """Retrieve a presigned URL for downloading a Synapse file.
+
+    Args:
+        client (synapseclient.Synapse): Authenticated Synapse client.
+        file (synapseclient.File): File entity (without the file content).
+
+    Returns:
+        str: Temporary URL for downloading the file.
+    """
+    file_handle_id = file._file_handle.id
+    return client.restGET(
+        f"/file/{file_handle_id}",
+        client.fileHandleEndpoint,
+        params={
+            "fileAssociateId": file.id,
+            "fileAssociateType": "FileEntity",
+            "redirect": False,
+        },
+    )
+
+
+def get_file_handles(
+    client: synapseclient.Synapse, entities: Iterable[Mapping]
+) -> Dict[str, dict]:
+    """Retrieve the file handles and presigned URLs for many file entities.
+
+    Requests are sent in batches of up to 100 file handles rather than
+    one request per file.
+
+    Args:
+        client (synapseclient.Synapse): Authenticated Synapse client.
+        entities (Iterable[Mapping]): File entities as returned by the
+            `/entity/{id}` endpoint.
+
+    Raises:
+        ValueError: If a file handle couldn't be retrieved.
+
+    Returns:
+        Dict[str, dict]: File handle (`fileHandle`) and presigned URL
+            (`preSignedURL`), keyed by Synapse ID.
+    """
+    requested: List[dict] = list()
+    for entity in entities:
+        if "dataFileHandleId" not in entity:
+            raise ValueError(f"{entity['id']} is not a file entity.")
+        file_request = {
+            "fileHandleId": entity["dataFileHandleId"],
+            "associateObjectId": entity["id"],
+            "associateObjectType": "FileEntity",
+        }
+        requested.append(file_request)
+    results = dict()
+    for start in range(0, len(requested), FILE_HANDLE_BATCH_SIZE):
+        batch = requested[start : start + FILE_HANDLE_BATCH_SIZE]
+        body = {
+            "requestedFiles": batch,
+            "includePreSignedURLs": True,
+            "includeFileHandles": True,
+        }
+        response = client.restPOST(
+            "/fileHandle/batch", json.dumps(body), endpoint=client.fileHandleEndpoint
+        )
+        for request, result in zip(batch, response["requestedFiles"]):
+            synapse_id = request["associateObjectId"]
+            if result.get("failureCode"):
+                message = f"Unable to retrieve file for {synapse_id}"
+                raise ValueError(f"{message} ({result['failureCode']}).")
+            results[synapse_id] = result
+    return results
+
+
+@contextmanager
+def open_url(url: str) -> Iterator[IO[bytes]]:
+    """Open a streamed, file-like view of a remote file.
+
+    Unlike passing the URL directly to pandas, which downloads the whole
+    file into memory first, the file is read from the network as needed.
+
+    Args:
+        url (str): URL of the remote file.
+
+    Yields:
+        IO[bytes]: Binary file-like object for the response body.
+    """
+    with requests.get(url, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        yield response.raw
+
+
+def read_table_chunks(url: str, chunksize: int, **kwargs) -> Iterator[pd.DataFrame]:
+    """Read a remote delimited file in data frame chunks.
+
+    The download is streamed, so only one chunk is held in memory at a
+    time. The connection is closed once the iterator is exhausted or
+    garbage-collected.
+
+    Args:
+        url (str): URL of the remote file.
+        chunksize (int): Number of rows per chunk.
+        **kwargs: Additional named arguments for `pd.read_table()`.
+
+    Yields:
+        pd.DataFrame: Successive chunks of the file.
+    """
+    with open_url(url) as stream:
+        with pd.read_table(stream, chunksize=chunksize, **kwargs) as reader:
+            yield from reader
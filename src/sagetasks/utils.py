@@ -1,8 +1,15 @@
+import hashlib
 import inspect
+import json
+import random
 import sys
+import time
+from collections import OrderedDict
 from collections.abc import Mapping, Sequence
 from copy import copy
 from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional
 
 from prefect import task
 from rich import print as rich_print
@@ -106,3 +113,340 @@ def dedup(x: Sequence) -> list:
     if isinstance(x, Sequence):
         x = list(set(x))
     return x
+
+
+def hash_client_args(client_args: Mapping) -> str:
+    """Compute a stable hash for a set of client arguments.
+
+    The hash can be used as a cache key for clients without keeping
+    secrets such as authentication tokens in plain text.
+
+    Args:
+        client_args (Mapping): Client arguments (e.g., from
+            the `bundle_client_args()` functions).
+
+    Returns:
+        str: Hexadecimal SHA-256 digest of the client arguments.
+    """
+    serialized = json.dumps(client_args, sort_keys=True, default=repr)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class TtlCache:
+    def __init__(
+        self,
+        ttl: Optional[float] = 300,
+        maxsize: Optional[int] = 128,
+        sliding: bool = False,
+    ) -> None:
+        """Thread-safe in-memory cache with expiring entries and LRU eviction.
+
+        Args:
+            ttl (float, optional): Number of seconds before an entry
+                expires. Defaults to 300. Set to None to disable expiry.
+            maxsize (int, optional): Maximum number of entries before
+                the least recently used entry is evicted. Defaults to 128.
+                Set to None for an unbounded cache.
+            sliding (bool, optional): Whether the expiry is reset every
+                time an entry is retrieved, such that entries only expire
+                after being idle for `ttl` seconds. Defaults to False.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.sliding = sliding
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_expired(self, timestamp: float) -> bool:
+        return self.ttl is not None and time.monotonic() - timestamp > self.ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retrieve a cached value and update the hit/miss counters.
+
+        Args:
+            key (Hashable): Cache key.
+            default (Any, optional): Value returned on a cache miss.
+                Defaults to None.
+
+        Returns:
+            Any: Cached value (or the default value).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._is_expired(entry[0]):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            if self.sliding:
+                self._entries[key] = (time.monotonic(), entry[1])
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value in the cache, evicting old entries if needed.
+
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to be cached.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Retrieve a cached value or compute and cache it on a miss.
+
+        Args:
+            key (Hashable): Cache key.
+            factory (Callable[[], Any]): Function for computing the value.
+
+        Returns:
+            Any: Cached (or just computed) value.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Remove an entry from the cache (or all entries if no key is given).
+
+        Args:
+            key (Hashable, optional): Cache key. Defaults to None,
+                which clears the whole cache.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        """Summarize the cache usage.
+
+        Returns:
+            dict: Number of hits, misses, and current entries.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+
+class Backoff:
+    def __init__(
+        self,
+        initial: float = 1,
+        maximum: float = 60,
+        factor: float = 2,
+        jitter: float = 0.1,
+    ) -> None:
+        """Exponential backoff schedule with a cap and random jitter.
+
+        Args:
+            initial (float, optional): First delay (in seconds). Defaults to 1.
+            maximum (float, optional): Maximum delay (in seconds).
+                Defaults to 60.
+            factor (float, optional): Multiplier applied to the delay
+                after each step. Defaults to 2.
+            jitter (float, optional): Maximum relative deviation applied
+                randomly to each delay (e.g., 0.1 for ±10%). Defaults to 0.1.
+        """
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.reset()
+
+    def reset(self) -> None:
+        """Restart the schedule from the initial delay."""
+        self.delay = self.initial
+
+    def next(self) -> float:
+        """Retrieve the next delay and advance the schedule.
+
+        Returns:
+            float: Delay (in seconds) with jitter applied.
+        """
+        delay = self.delay
+        self.delay = min(self.delay * self.factor, self.maximum)
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return min(delay, self.maximum)
+
+
+class Waiter:
+    def __init__(
+        self,
+        initial: float = 1,
+        maximum: float = 60,
+        factor: float = 2,
+        jitter: float = 0.1,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Poll jobs until they are done with an adaptive interval.
+
+        The interval between polls grows exponentially (with jitter) up to
+        a maximum, and it's reset whenever a job finishes since other jobs
+        are then likely to finish soon as well.
+
+        Args:
+            initial (float, optional): First interval (in seconds).
+                Defaults to 1.
+            maximum (float, optional): Maximum interval (in seconds).
+                Defaults to 60.
+            factor (float, optional): Multiplier applied to the interval
+                after each poll. Defaults to 2.
+            jitter (float, optional): Maximum relative deviation applied
+                randomly to each interval. Defaults to 0.1.
+            timeout (float, optional): Maximum number of seconds spent
+                waiting. Defaults to None (no timeout).
+        """
+        self.backoff = Backoff(initial, maximum, factor, jitter)
+        self.timeout = timeout
+        self.deadline: Optional[float] = None
+
+    def start(self) -> None:
+        """Reset the interval and the timeout before waiting."""
+        self.backoff.reset()
+        if self.timeout is not None:
+            self.deadline = time.monotonic() + self.timeout
+
+    def next_delay(self) -> float:
+        """Compute the delay before the next poll.
+
+        The delay is clipped to the time remaining before the timeout, such
+        that one last poll happens at the deadline.
+
+        Raises:
+            TimeoutError: If the timeout has been reached.
+
+        Returns:
+            float: Delay (in seconds) before the next poll.
+        """
+        delay = self.backoff.next()
+        if self.deadline is not None:
+            remaining = self.deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Jobs still pending after {self.timeout}s.")
+            delay = min(delay, remaining)
+        return delay
+
+    def sleep(self) -> None:
+        """Sleep until the next poll.
+
+        Raises:
+            TimeoutError: If the timeout has been reached.
+        """
+        time.sleep(self.next_delay())
+
+    def wait(self, reload: Callable[[], Any], is_done: Callable[[Any], bool]) -> Any:
+        """Wait for a single job.
+
+        Args:
+            reload (Callable[[], Any]): Function retrieving the job status.
+            is_done (Callable[[Any], bool]): Function checking whether the
+                reloaded job is done.
+
+        Returns:
+            Any: The last reloaded value of the job.
+        """
+        self.start()
+        while True:
+            job = reload()
+            if is_done(job):
+                return job
+            self.sleep()
+
+    def wait_all(
+        self,
+        jobs: Mapping,
+        bulk_reload: Callable[[list], list],
+        is_done: Callable[[Any], bool],
+        batch_size: int = 100,
+    ) -> dict:
+        """Wait for many jobs using bulk status updates.
+
+        Args:
+            jobs (Mapping): Jobs (or job IDs) to wait on, keyed by any
+                hashable value. They are passed as is to `bulk_reload`.
+            bulk_reload (Callable[[list], list]): Function retrieving the
+                status of a list of jobs, returning one value per job.
+            is_done (Callable[[Any], bool]): Function checking whether a
+                reloaded job is done.
+            batch_size (int, optional): Maximum number of jobs per call
+                to `bulk_reload`. Defaults to 100.
+
+        Returns:
+            dict: The last reloaded value of each job, keyed like `jobs`.
+        """
+        self.start()
+        pending = dict(jobs)
+        done = dict()
+        while True:
+            keys = list(pending)
+            for start in range(0, len(keys), batch_size):
+                batch = keys[start : start + batch_size]
+                reloaded = bulk_reload([pending[key] for key in batch])
+                for key, job in zip(batch, reloaded):
+                    if is_done(job):
+                        done[key] = job
+                        del pending[key]
+                        self.backoff.reset()
+            if not pending:
+                return done
+            self.sleep()
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """Thread-safe token bucket for throttling the rate of operations.
+
+        Tokens are replenished continuously at `rate` per second, up to
+        `capacity` tokens, which allows for short bursts.
+
+        Args:
+            rate (float): Number of tokens added per second.
+            capacity (float, optional): Maximum number of tokens in the
+                bucket. Defaults to None, which uses `max(rate, 1)`.
+        """
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self._tokens = self.capacity
+        self._timestamp = time.monotonic()
+        self._lock = Lock()
+
+    def reserve(self) -> float:
+        """Take a token from the bucket (borrowing from the future if empty).
+
+        Returns:
+            float: Number of seconds to wait before using the token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._timestamp
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._timestamp = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """Take a token from the bucket, sleeping until it's available.
+
+        Returns:
+            float: Number of seconds spent waiting.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
@@ -0,0 +1,121 @@
+import json
+import re
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+EG_TOKEN = "token"
+
+EG_COMPUTE_ENV = {
+    "id": "a1b2c3",
+    "name": "test-project-ce",
+    "platform": "aws-batch",
+    "config": {
+        "workDir": "s3://test-project-tower-scratch/work",
+        "preRunScript": "NXF_OPTS='-Xms4g -Xmx12g'",
+        "postRunScript": None,
+    },
+    "status": "AVAILABLE",
+}
+
+
+class FakeTowerServer:
+    """Local stand-in for the subset of the Tower API used by sagetasks."""
+
+    def __init__(self):
+        self.requests = []
+        self.failures = deque()
+        self.workflows = {}
+        self.compute_envs = {EG_COMPUTE_ENV["id"]: EG_COMPUTE_ENV}
+        self.lock = Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self.make_handler())
+        serve_kwargs = {"poll_interval": 0.01}
+        self.thread = Thread(
+            target=self.httpd.serve_forever, kwargs=serve_kwargs, daemon=True
+        )
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def count(self, method, pattern):
+        regex = re.compile(pattern)
+        return sum(1 for m, p in self.requests if m == method and regex.match(p))
+
+    def handle(self, method, path, params, body):
+        with self.lock:
+            self.requests.append((method, path))
+            if method == "GET" and path.startswith("/compute-envs/"):
+                ce_id = path.rsplit("/", 1)[-1]
+                return 200, {"computeEnv": self.compute_envs[ce_id]}
+            if method == "POST" and path == "/workflow/launch":
+                workflow_id = f"wf{len(self.workflows)}"
+                launch = body["launch"]
+                self.workflows[workflow_id] = {
+                    "id": workflow_id,
+                    "runName": launch["runName"],
+                    "projectName": launch["pipeline"],
+                    "status": "SUBMITTED",
+                }
+                return 200, {"workflowId": workflow_id}
+            if method == "GET" and path == "/workflow":
+                offset = int(params.get("offset", [0])[0])
+                size = int(params.get("max", [50])[0])
+                items = [{"workflow": wf} for wf in self.workflows.values()]
+                page = items[offset : offset + size]
+                return 200, {"workflows": page, "totalSize": len(items)}
+            if method == "GET" and path.startswith("/workflow/"):
+                workflow_id = path.rsplit("/", 1)[-1]
+                if workflow_id not in self.workflows:
+                    return 404, {"message": "Not found"}
+                return 200, {"workflow": self.workflows[workflow_id]}
+            return 404, {"message": "Not found"}
+
+    def make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def respond(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length)) if length else None
+                headers = {}
+                if self.headers.get("Authorization") != f"Bearer {EG_TOKEN}":
+                    status, result = 403, {"message": "Forbidden"}
+                elif server.failures:
+                    server.requests.append((self.command, url.path))
+                    status, headers = server.failures.popleft()
+                    result = {"message": "Failure"}
+                else:
+                    params = parse_qs(url.query)
+                    status, result = server.handle(self.command, url.path, params, body)
+                payload = json.dumps(result).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_DELETE = respond
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+@pytest.fixture
+def tower_server():
+    server = FakeTowerServer()
+    server.thread.start()
+    yield server
+    server.httpd.shutdown()
+    server.httpd.server_close()
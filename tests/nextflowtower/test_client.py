@@ -1,10 +1,14 @@
+import asyncio
 import json
+import logging
 import os
 from types import GeneratorType
 
 import pytest
+import requests
 
 from sagetasks.nextflowtower import client
+from sagetasks.nextflowtower.metrics import MetricsRegistry
 
 EG_TOKEN = "token"
 EG_API_URL = "https://example.com"
@@ -57,43 +61,113 @@ class TestTowerClient:
     def test_request_nonempty(self, mocker, capfd, tower_client):
         # Setup
         eg_kwargs = {"foo": "bar"}
-        mocked_request = mocker.patch("requests.request", autospec=True)
+        mocked_request = mocker.patch.object(requests.Session, "request", autospec=True)
         mocked_request.return_value.json.return_value = eg_kwargs
 
         # Regular call with non-empty response (w/o debugging)
         result = tower_client.request(EG_METHOD, EG_ENDPOINT, params=eg_kwargs)
-        (method, url), kwargs = mocked_request.call_args
+        (session, method, url), kwargs = mocked_request.call_args
         captured = capfd.readouterr()
         mocked_request.assert_called_once()
         assert method == EG_METHOD
         assert url.startswith(EG_API_URL)
         assert url.endswith(EG_ENDPOINT)
-        assert "Authorization" in kwargs["headers"]
-        assert kwargs["headers"]["Authorization"] == f"Bearer {EG_TOKEN}"
+        assert "Authorization" in session.headers
+        assert session.headers["Authorization"] == f"Bearer {EG_TOKEN}"
         assert "params" in kwargs
         assert kwargs["params"] == eg_kwargs
         assert result == eg_kwargs
         assert captured.out == ""
 
-    def test_request_empty(self, mocker, capfd, tower_client):
+    def test_request_empty(self, mocker, caplog, tower_client):
         # Setup
-        mocked_request = mocker.patch("requests.request", autospec=True)
+        mocked_request = mocker.patch.object(requests.Session, "request", autospec=True)
 
         def raise_json_error():
             raise json.decoder.JSONDecodeError("", "", 0)
 
         # Regular call with empty response (w/ debugging)
         mocked_request.return_value.json.side_effect = raise_json_error
+        caplog.set_level(logging.DEBUG, logger=client.__name__)
         tower_client.debug = True
         result = tower_client.request(EG_METHOD, EG_ENDPOINT)
-        captured = capfd.readouterr()
         assert result == dict()
-        assert captured.out != ""
-        assert "Endpoint:" in captured.out
-        assert "Params:" in captured.out
-        assert "Payload:" in captured.out
-        assert "Status Code:" in captured.out
-        assert "Response:" in captured.out
+        assert f"{EG_METHOD} {EG_API_URL}{EG_ENDPOINT}" in caplog.text
+        assert "Params:" in caplog.text
+        assert "Payload:" in caplog.text
+        assert "Response:" in caplog.text
+
+    def test_request_instrumentation(self, tower_server):
+        metrics = MetricsRegistry()
+        events = []
+        tower_client = client.TowerClient(
+            EG_TOKEN,
+            tower_server.url,
+            backoff_factor=0,
+            hooks=[events.append],
+            metrics=metrics,
+        )
+        tower_server.failures.append((503, {}))
+        endpoint = "/compute-envs/{compute_env_id}"
+        path_params = {"compute_env_id": "a1b2c3"}
+        for _ in range(2):
+            tower_client.request(EG_METHOD, endpoint, path_params=path_params)
+        with pytest.raises(requests.HTTPError):
+            path_params = {"workflow_id": "missing"}
+            tower_client.request(
+                EG_METHOD, "/workflow/{workflow_id}", path_params=path_params
+            )
+        assert [event.retries for event in events] == [1, 0, 0]
+        assert [event.status_code for event in events] == [200, 200, 404]
+        assert events[0].endpoint == endpoint
+        assert events[0].bytes_received > 0
+        assert events[2].error == "HTTPError"
+        summary = metrics.summary()
+        assert summary[f"{EG_METHOD} {endpoint}"]["latency"]["count"] == 2
+        assert summary[f"{EG_METHOD} {endpoint}"]["statuses"] == {200: 2}
+        assert summary[f"{EG_METHOD} {endpoint}"]["retries"] == 1
+        assert summary[f"{EG_METHOD} /workflow/{{workflow_id}}"]["errors"] == 1
+
+    def test_request_uninstrumented(self, mocker, tower_client):
+        mocked_record = mocker.patch.object(tower_client, "record_request")
+        mocked_request = mocker.patch.object(requests.Session, "request", autospec=True)
+        mocked_request.return_value.json.return_value = {}
+        tower_client.request(EG_METHOD, EG_ENDPOINT)
+        mocked_record.assert_not_called()
+
+    def test_debug_mode_is_per_client(self, caplog, tower_client):
+        level = client.logger.level
+        debug_client = client.TowerClient(EG_TOKEN, EG_API_URL, debug_mode=True)
+        assert client.logger.level == level
+        caplog.set_level(logging.DEBUG, logger=client.__name__)
+        assert debug_client.is_instrumented()
+        assert not tower_client.is_instrumented()
+
+    def test_session_reuse(self, mocker, tower_client):
+        mocked_request = mocker.patch.object(requests.Session, "request", autospec=True)
+        mocked_request.return_value.json.return_value = {}
+        tower_client.request(EG_METHOD, EG_ENDPOINT)
+        tower_client.request(EG_METHOD, EG_ENDPOINT)
+        (first_session, *_), _ = mocked_request.call_args_list[0]
+        (second_session, *_), _ = mocked_request.call_args_list[1]
+        assert first_session is second_session
+        adapter = first_session.get_adapter(EG_API_URL)
+        assert adapter._pool_maxsize == tower_client.pool_maxsize
+
+    def test_session_close(self, tower_client):
+        session = tower_client.session
+        tower_client.close()
+        assert tower_client._session is None
+        assert tower_client.session is not session
+
+    def test_context_manager(self, mocker):
+        with client.TowerClient(EG_TOKEN, EG_API_URL) as tower_client:
+            mocked_close = mocker.patch.object(tower_client, "close")
+        mocked_close.assert_called_once()
+
+    def test_no_keep_alive(self):
+        tower_client = client.TowerClient(EG_TOKEN, EG_API_URL, keep_alive=False)
+        assert tower_client.session.headers["Connection"] == "close"
 
     def test_paged_request(self, mocker, tower_client):
         # Setup
@@ -117,3 +191,157 @@ class TestTowerClient:
         assert "max" in kwargs["params"]
         assert "offset" in kwargs["params"]
         assert result == ["foo", "bar"]
+
+    def test_paged_request_concurrent(self, tower_server):
+        for i in range(95):
+            tower_server.workflows[f"wf{i}"] = {"id": f"wf{i}"}
+        tower_client = client.TowerClient(EG_TOKEN, tower_server.url)
+        items = tower_client.paged_request(
+            EG_METHOD, "/workflow", page_size=10, max_workers=3
+        )
+        result = [item["workflow"]["id"] for item in items]
+        assert result == list(tower_server.workflows)
+        assert tower_server.count(EG_METHOD, "/workflow$") == 10
+
+    def test_paged_request_stream(self, tower_server):
+        for i in range(25):
+            tower_server.workflows[f"wf{i}"] = {"id": f"wf{i}"}
+        tower_client = client.TowerClient(EG_TOKEN, tower_server.url)
+        items = tower_client.paged_request(
+            EG_METHOD, "/workflow", page_size=10, stream=True
+        )
+        result = [item["workflow"]["id"] for item in items]
+        assert result == list(tower_server.workflows)
+        assert tower_server.count(EG_METHOD, "/workflow$") == 3
+
+    def test_paged_request_early_stop(self, mocker, tower_client):
+        responses = {
+            offset: {"things": [offset], "totalSize": 100} for offset in range(100)
+        }
+        mocked_request = mocker.patch.object(tower_client, "request", autospec=True)
+        mocked_request.side_effect = lambda *_, params: dict(
+            responses[params["offset"]]
+        )
+        items = tower_client.paged_request(EG_METHOD, EG_ENDPOINT, max_workers=2)
+        assert [next(items) for _ in range(3)] == [0, 1, 2]
+        items.close()
+        # Prefetching is bounded by the number of workers
+        assert mocked_request.call_count <= 5
+
+    def test_retry_idempotent(self, tower_server):
+        tower_client = client.TowerClient(EG_TOKEN, tower_server.url, backoff_factor=0)
+        tower_server.failures.extend([(503, {}), (502, {})])
+        result = tower_client.request(EG_METHOD, "/compute-envs/a1b2c3")
+        assert result["computeEnv"]["id"] == "a1b2c3"
+        assert tower_server.count(EG_METHOD, "/compute-envs/") == 3
+        assert tower_client.stats()["retries"] == 2
+
+    def test_retry_exhausted(self, tower_server):
+        tower_client = client.TowerClient(
+            EG_TOKEN, tower_server.url, backoff_factor=0, max_retries=1
+        )
+        tower_server.failures.extend([(503, {}), (503, {})])
+        with pytest.raises(requests.HTTPError):
+            tower_client.request(EG_METHOD, "/compute-envs/a1b2c3")
+        assert tower_server.count(EG_METHOD, "/compute-envs/") == 2
+
+    def test_retry_launch(self, mocker, tower_server):
+        mocked_sleep = mocker.patch.object(client.time, "sleep")
+        tower_client = client.TowerClient(EG_TOKEN, tower_server.url, backoff_factor=0)
+        data = {"launch": {"runName": "foo", "pipeline": "sage/work"}}
+        # Launches aren't replayed after server errors
+        tower_server.failures.append((503, {}))
+        with pytest.raises(requests.HTTPError):
+            tower_client.request("POST", "/workflow/launch", json=data)
+        assert tower_server.workflows == {}
+        # But they are retried when rate-limited (honoring Retry-After)
+        tower_server.failures.append((429, {"Retry-After": "7"}))
+        tower_client.request("POST", "/workflow/launch", json=data)
+        assert len(tower_server.workflows) == 1
+        mocked_sleep.assert_called_once_with(7.0)
+        stats = tower_client.stats()
+        assert stats["retries"] == 1
+        assert stats["rate_limited"] == 1
+        # Server-supplied delays are capped
+        tower_server.failures.append((429, {"Retry-After": "3600"}))
+        tower_client.request("POST", "/workflow/launch", json=data)
+        mocked_sleep.assert_called_with(tower_client.max_backoff)
+
+    def test_retry_connection_error(self, mocker, tower_client):
+        tower_client.backoff_factor = 0
+        mocked_request = mocker.patch.object(requests.Session, "request")
+        mocked_request.side_effect = requests.ConnectionError
+        with pytest.raises(requests.ConnectionError):
+            tower_client.request("POST", EG_ENDPOINT)
+        mocked_request.assert_called_once()
+        with pytest.raises(requests.ConnectionError):
+            tower_client.request("GET", EG_ENDPOINT)
+        assert mocked_request.call_count == 1 + 1 + tower_client.max_retries
+
+    def test_rate_limit(self, mocker, tower_server):
+        mocked_sleep = mocker.patch.object(client.time, "sleep")
+        tower_client = client.TowerClient(
+            EG_TOKEN, tower_server.url, rate_limit=0.5, burst=1
+        )
+        other_client = client.TowerClient(
+            EG_TOKEN, tower_server.url, rate_limit=0.5, burst=1
+        )
+        assert tower_client.token_bucket is other_client.token_bucket
+        tower_client.request(EG_METHOD, "/compute-envs/a1b2c3")
+        tower_client.request(EG_METHOD, "/compute-envs/a1b2c3")
+        mocked_sleep.assert_called_once()
+        assert mocked_sleep.call_args.args[0] > 1
+        assert tower_client.stats()["throttled"] == 1
+
+
+def test_parse_retry_after():
+    assert client.parse_retry_after(None) is None
+    assert client.parse_retry_after("3") == 3
+    assert client.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert client.parse_retry_after("soon") is None
+
+
+class TestAsyncTowerClient:
+    def test_request(self, tower_server):
+        async def run():
+            async with client.AsyncTowerClient(EG_TOKEN, tower_server.url) as tc:
+                return await tc.request("GET", "/compute-envs/a1b2c3")
+
+        result = asyncio.run(run())
+        assert result["computeEnv"]["id"] == "a1b2c3"
+
+    def test_request_nonmethod(self):
+        tower_client = client.AsyncTowerClient(EG_TOKEN, EG_API_URL)
+        with pytest.raises(ValueError):
+            asyncio.run(tower_client.request("FOO", EG_ENDPOINT))
+
+    def test_paged_request(self, tower_server):
+        for i in range(60):
+            tower_server.workflows[f"wf{i}"] = {"id": f"wf{i}"}
+
+        async def run():
+            async with client.AsyncTowerClient(EG_TOKEN, tower_server.url) as tc:
+                params = {"workspaceId": 123}
+                items = tc.paged_request("GET", "/workflow", params=params)
+                return [item async for item in items]
+
+        result = asyncio.run(run())
+        assert [item["workflow"]["id"] for item in result] == list(
+            tower_server.workflows
+        )
+        assert tower_server.count("GET", "/workflow$") == 2
+
+    def test_paged_request_stream(self, tower_server):
+        for i in range(15):
+            tower_server.workflows[f"wf{i}"] = {"id": f"wf{i}"}
+
+        async def run():
+            async with client.AsyncTowerClient(EG_TOKEN, tower_server.url) as tc:
+                items = tc.paged_request("GET", "/workflow", page_size=10, stream=True)
+                return [item async for item in items]
+
+        result = asyncio.run(run())
+        assert [item["workflow"]["id"] for item in result] == list(
+            tower_server.workflows
+        )
+        assert tower_server.count("GET", "/workflow$") == 2
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from sagetasks.nextflowtower.streaming import JsonItemDecoder, JsonItemStream
+
+EG_BODY = {
+    "workflows": [
+        {"workflow": {"id": "wf0", "runName": "épique", "params": [1, 2.5]}},
+        {"workflow": {"id": "wf1", "runName": "test", "params": {"x": None}}},
+    ],
+    "totalSize": 1234,
+    "extra": {"nested": [True, False]},
+}
+
+
+def test_decoder_byte_by_byte():
+    data = json.dumps(EG_BODY, ensure_ascii=False, indent=2).encode()
+    decoder = JsonItemDecoder()
+    items = []
+    for i in range(len(data)):
+        items.extend(decoder.feed(data[i : i + 1]))
+    items.extend(decoder.close())
+    assert items == EG_BODY["workflows"]
+    assert decoder.items_key == "workflows"
+    assert decoder.fields == {"totalSize": 1234, "extra": {"nested": [True, False]}}
+
+
+def test_decoder_yields_items_early():
+    decoder = JsonItemDecoder()
+    assert decoder.feed(b'{"things": [{"a": 1}, {"b"') == [{"a": 1}]
+    assert decoder.feed(b": 2}], ") == [{"b": 2}]
+    assert decoder.feed(b'"totalSize": 1') == []
+    assert decoder.feed(b"2}") == []
+    assert decoder.fields == {"totalSize": 12}
+    assert decoder.close() == []
+
+
+def test_decoder_incomplete():
+    decoder = JsonItemDecoder()
+    decoder.feed(b'{"things": [1, 2')
+    with pytest.raises(ValueError):
+        decoder.close()
+
+
+def test_decoder_not_object():
+    with pytest.raises(ValueError):
+        JsonItemDecoder().feed(b"[1, 2]")
+
+
+def test_stream_closes_early(mocker):
+    close = mocker.Mock()
+    stream = JsonItemStream([b'{"things": [1, 2, 3]}'], close=close)
+    with stream:
+        assert next(iter(stream)) == 1
+    close.assert_called_once_with()
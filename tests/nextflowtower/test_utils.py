@@ -1,7 +1,10 @@
+import asyncio
+
+import httpx
 import pytest
 
 from sagetasks.nextflowtower import utils
-from sagetasks.nextflowtower.utils import TowerUtils
+from sagetasks.nextflowtower.utils import AsyncTowerUtils, TowerUtils
 from sagetasks.utils import dedup
 
 EG_UTILS_ARGS = {"platform": "tower.nf", "auth_token": "foobar"}
@@ -101,6 +104,51 @@ class TestTowerUtils:
         result = tower_utils.get_compute_env(compute_env_id)
         assert result == EG_COMPUTE_ENV["computeEnv"]
 
+    def test_get_compute_env_cached(self, mocker, tower_utils):
+        mocked_request = mocker.patch.object(utils.TowerClient, "request")
+        mocked_request.return_value = EG_COMPUTE_ENV
+        compute_env_id = EG_COMPUTE_ENV["computeEnv"]["id"]
+        tower_utils.get_compute_env(compute_env_id)
+        tower_utils.get_compute_env(compute_env_id)
+        mocked_request.assert_called_once()
+        assert tower_utils.compute_env_cache.stats()["hits"] == 1
+        # Bypassing the cache
+        tower_utils.get_compute_env(compute_env_id, use_cache=False)
+        assert mocked_request.call_count == 2
+        # Invalidating the cache
+        tower_utils.invalidate_compute_env(compute_env_id)
+        tower_utils.get_compute_env(compute_env_id)
+        assert mocked_request.call_count == 3
+
+    def test_get_compute_env_shared_cache(self, mocker, tower_utils_client_args):
+        mocked_request = mocker.patch.object(utils.TowerClient, "request")
+        mocked_request.return_value = EG_COMPUTE_ENV
+        compute_env_id = EG_COMPUTE_ENV["computeEnv"]["id"]
+        for _ in range(2):
+            tower_utils = TowerUtils(tower_utils_client_args, shared_cache=True)
+            tower_utils.open_workspace(EG_WORKSPACE_ID)
+            tower_utils.get_compute_env(compute_env_id)
+        mocked_request.assert_called_once()
+        tower_utils.invalidate_compute_env()
+        # The TTL of the shared cache is set separately from `cache_ttl`
+        tower_utils = TowerUtils(
+            tower_utils_client_args, cache_ttl=10, shared_cache=True
+        )
+        assert tower_utils.compute_env_cache.ttl == utils.COMPUTE_ENV_CACHE_TTL
+        mocker.patch.object(utils.COMPUTE_ENV_CACHE, "ttl")
+        utils.set_shared_cache_ttl(10)
+        assert tower_utils.compute_env_cache.ttl == 10
+
+    def test_init_launch_workflow_data_unavailable(self, mocker, tower_utils):
+        unavailable = dict(EG_COMPUTE_ENV["computeEnv"], status="INVALID")
+        mocked = mocker.patch.object(tower_utils, "get_compute_env")
+        mocked.return_value = unavailable
+        with pytest.raises(ValueError):
+            tower_utils.init_launch_workflow_data(unavailable["id"])
+        # Cached records are refreshed before failing the availability check
+        assert mocked.call_count == 2
+        assert mocked.call_args.kwargs["use_cache"] is False
+
     def test_get_workflow(self, mocker, tower_utils):
         mocked_request = mocker.patch.object(utils.TowerClient, "request")
         mocked_request.return_value = EG_WORKFLOW
@@ -156,3 +204,210 @@ class TestTowerUtils:
         assert launch_args["pipeline"] == args["pipeline"]
         assert launch_args["runName"] == args.get("run_name")
         assert launch_args["userSecrets"] == dedup(args.get("user_secrets", []))
+
+    def test_launch_workflows(self, tower_server):
+        client_args = TowerUtils.bundle_client_args(
+            "token", platform=None, endpoint=tower_server.url
+        )
+        tower_server.compute_envs["broken"] = dict(
+            tower_server.compute_envs["a1b2c3"], status="INVALID"
+        )
+        specs = [
+            {"compute_env_id": "a1b2c3", "pipeline": "sage/work", "run_name": "foo"},
+            {"compute_env_id": "broken", "pipeline": "sage/work"},
+            {"compute_env_id": "a1b2c3", "pipeline": "sage/work", "bad": "arg"},
+            {"compute_env_id": "a1b2c3", "pipeline": "sage/work", "run_name": "bar"},
+        ]
+        with TowerUtils(client_args, EG_WORKSPACE_ID) as tower_utils:
+            results = tower_utils.launch_workflows(iter(specs), max_workers=2)
+        assert [result["index"] for result in results] == [0, 1, 2, 3]
+        assert results[0]["workflow"]["workflow"]["runName"] == "foo"
+        assert results[3]["workflow"]["workflow"]["runName"] == "bar"
+        assert results[1]["error"].startswith("ValueError")
+        assert results[2]["error"].startswith("TypeError")
+        assert results[0]["error"] is None
+        # Each compute environment is retrieved once (twice if not available)
+        assert tower_server.count("GET", "/compute-envs/a1b2c3") == 1
+        assert tower_server.count("GET", "/compute-envs/broken") == 2
+        assert tower_server.count("POST", "/workflow/launch") == 2
+
+    def test_get_workflow_statuses(self, tower_server):
+        client_args = TowerUtils.bundle_client_args(
+            "token", platform=None, endpoint=tower_server.url
+        )
+        for i in range(30):
+            tower_server.workflows[f"wf{i}"] = {"id": f"wf{i}", "status": "RUNNING"}
+        with TowerUtils(client_args, EG_WORKSPACE_ID) as tower_utils:
+            ids = ["wf0", "wf1", "wf2"]
+            workflows = tower_utils.get_workflow_statuses(ids)
+            assert sorted(workflows) == ids
+            assert tower_server.count("GET", "/workflow/") == 3
+            ids = [f"wf{i}" for i in range(15)]
+            workflows = tower_utils.get_workflow_statuses(ids, page_size=10)
+            assert sorted(workflows) == sorted(ids)
+            assert workflows["wf14"]["workflow"]["status"] == "RUNNING"
+            # Listing stops once all workflows are found
+            assert tower_server.count("GET", "/workflow$") <= 3
+
+    def test_get_workflow_statuses_unlisted(self, tower_server):
+        client_args = TowerUtils.bundle_client_args(
+            "token", platform=None, endpoint=tower_server.url
+        )
+        for i in range(100):
+            tower_server.workflows[f"wf{i}"] = {"id": f"wf{i}", "status": "RUNNING"}
+        # The last workflows are only listed on the last page
+        ids = [f"wf{i}" for i in [*range(10), *range(90, 100)]]
+        with TowerUtils(client_args, EG_WORKSPACE_ID) as tower_utils:
+            workflows = tower_utils.get_workflow_statuses(ids, page_size=10)
+        assert sorted(workflows) == sorted(ids)
+        assert tower_server.count("GET", "/workflow$") < 10
+        assert tower_server.count("GET", "/workflow/") == 10
+
+    def test_watch_workflows(self, mocker, tower_utils):
+        mocked_sleep = mocker.patch.object(utils.time, "sleep")
+        polls = [
+            {"wf0": "SUBMITTED", "wf1": "RUNNING"},
+            {"wf0": "SUBMITTED", "wf1": "RUNNING"},
+            {"wf0": "RUNNING", "wf1": "SUCCEEDED"},
+            {"wf0": "FAILED"},
+        ]
+        mocked_statuses = mocker.patch.object(tower_utils, "get_workflow_statuses")
+        mocked_statuses.side_effect = [
+            {wid: {"workflow": {"id": wid, "status": st}} for wid, st in poll.items()}
+            for poll in polls
+        ]
+        transitions = list(tower_utils.watch_workflows(["wf0", "wf1"]))
+        statuses = [(t.workflow_id, t.status) for t in transitions]
+        assert statuses == [
+            ("wf0", "SUBMITTED"),
+            ("wf1", "RUNNING"),
+            ("wf0", "RUNNING"),
+            ("wf1", "SUCCEEDED"),
+            ("wf0", "FAILED"),
+        ]
+        assert mocked_sleep.call_count == 3
+        # Only pending workflows are polled
+        assert mocked_statuses.call_args.args[0] == ["wf0"]
+
+    def test_wait_all(self, mocker, tower_utils):
+        mocker.patch.object(utils.time, "sleep")
+        mocked_statuses = mocker.patch.object(tower_utils, "get_workflow_statuses")
+        mocked_statuses.return_value = {
+            "wf0": {"workflow": {"id": "wf0", "status": "RUNNING"}}
+        }
+        with pytest.raises(TimeoutError):
+            tower_utils.wait_all(["wf0"], timeout=0)
+        mocked_statuses.return_value = {
+            "wf0": {"workflow": {"id": "wf0", "status": "SUCCEEDED"}}
+        }
+        result = tower_utils.wait_all(["wf0"], timeout=0)
+        assert result["wf0"]["workflow"]["status"] == "SUCCEEDED"
+
+
+@pytest.fixture
+def async_tower_utils(tower_server):
+    client_args = AsyncTowerUtils.bundle_client_args(
+        "token", platform=None, endpoint=tower_server.url
+    )
+    return AsyncTowerUtils(client_args, EG_WORKSPACE_ID, max_concurrency=4)
+
+
+class TestAsyncTowerUtils:
+    def test_launch_workflow(self, tower_server, async_tower_utils):
+        async def run():
+            async with async_tower_utils:
+                return await async_tower_utils.launch_workflow("a1b2c3", "sage/work")
+
+        result = asyncio.run(run())
+        assert result["workflow"]["projectName"] == "sage/work"
+        assert tower_server.count("GET", "/compute-envs/") == 1
+        assert tower_server.count("POST", "/workflow/launch") == 1
+
+    def test_launch_workflows(self, tower_server, async_tower_utils):
+        specs = [
+            {"compute_env_id": "a1b2c3", "pipeline": "sage/work", "run_name": str(i)}
+            for i in range(10)
+        ]
+
+        async def run():
+            async with async_tower_utils:
+                return await async_tower_utils.launch_workflows(specs)
+
+        results = asyncio.run(run())
+        run_names = [result["workflow"]["runName"] for result in results]
+        assert run_names == [str(i) for i in range(10)]
+        # The compute environment is only retrieved once
+        assert tower_server.count("GET", "/compute-envs/") == 1
+        assert tower_server.count("POST", "/workflow/launch") == 10
+
+    def test_launch_workflows_errors(self, tower_server, async_tower_utils):
+        tower_server.compute_envs["broken"] = dict(
+            tower_server.compute_envs["a1b2c3"], status="INVALID"
+        )
+        specs = [
+            {"compute_env_id": "a1b2c3", "pipeline": "sage/work", "run_name": "foo"},
+            {"compute_env_id": "broken", "pipeline": "sage/work"},
+            {"pipeline": "sage/work"},
+        ]
+
+        async def run(return_exceptions):
+            async with async_tower_utils:
+                return await async_tower_utils.launch_workflows(
+                    specs, return_exceptions=return_exceptions
+                )
+
+        results = asyncio.run(run(return_exceptions=True))
+        assert results[0]["workflow"]["runName"] == "foo"
+        assert isinstance(results[1], ValueError)
+        assert isinstance(results[2], TypeError)
+        with pytest.raises(ValueError):
+            asyncio.run(run(return_exceptions=False))
+
+    def test_get_workflows(self, tower_server, async_tower_utils):
+        tower_server.workflows = {"wf0": {"id": "wf0"}, "wf1": {"id": "wf1"}}
+
+        async def run():
+            async with async_tower_utils:
+                ids = ["wf1", "wf0", "missing"]
+                return await async_tower_utils.get_workflows(
+                    ids, return_exceptions=True
+                )
+
+        results = asyncio.run(run())
+        assert results[0]["workflow"]["id"] == "wf1"
+        assert results[1]["workflow"]["id"] == "wf0"
+        assert isinstance(results[2], httpx.HTTPStatusError)
+
+
+def test_read_launch_specs(tmp_path):
+    jsonl_path = tmp_path / "specs.jsonl"
+    jsonl_path.write_text(
+        '{"compute_env_id": "a1b2c3", "pipeline": "sage/work"}\n\n'
+        '{"compute_env_id": "a1b2c3", "pipeline": "sage/play", "profiles": ["a"]}\n'
+    )
+    specs = list(TowerUtils.read_launch_specs(str(jsonl_path)))
+    assert [spec["pipeline"] for spec in specs] == ["sage/work", "sage/play"]
+    csv_path = tmp_path / "specs.csv"
+    csv_path.write_text(
+        "compute_env_id,pipeline,run_name,profiles\n"
+        "a1b2c3,sage/work,,docker\n"
+        'a1b2c3,sage/play,test,"docker, test"\n'
+    )
+    specs = list(TowerUtils.read_launch_specs(str(csv_path)))
+    assert "run_name" not in specs[0]
+    assert specs[0]["profiles"] == ["docker"]
+    assert specs[1]["profiles"] == ["docker", "test"]
+
+    def test_wait_all(self, tower_server, async_tower_utils):
+        tower_server.workflows = {
+            f"wf{i}": {"id": f"wf{i}", "status": "SUCCEEDED"} for i in range(20)
+        }
+
+        async def run():
+            async with async_tower_utils:
+                ids = list(tower_server.workflows)
+                return await async_tower_utils.wait_all(ids, timeout=10)
+
+        result = asyncio.run(run())
+        assert len(result) == 20
+        assert tower_server.count("GET", "/workflow/") == 0
@@ -0,0 +1,87 @@
+import pytest
+
+from sagetasks.nextflowtower.utils import TowerUtils
+from sagetasks.nextflowtower.workflows import WorkflowHandle, WorkflowWatcher
+
+EG_WORKSPACE_ID = 123456
+
+
+@pytest.fixture
+def tower_utils(tower_server):
+    client_args = TowerUtils.bundle_client_args(
+        "token", platform=None, endpoint=tower_server.url
+    )
+    with TowerUtils(client_args, EG_WORKSPACE_ID) as tower_utils:
+        yield tower_utils
+
+
+class TestWorkflowHandle:
+    def test_lazy_launch(self, tower_server, tower_utils):
+        handle = tower_utils.launch_workflow("a1b2c3", "sage/work", lazy=True)
+        assert isinstance(handle, WorkflowHandle)
+        assert handle.workspace_id == EG_WORKSPACE_ID
+        assert not handle.is_loaded
+        assert tower_server.count("GET", "/workflow/") == 0
+        # Details are retrieved once on first access
+        assert handle.status == "SUBMITTED"
+        assert handle["workflow"]["projectName"] == "sage/work"
+        assert tower_server.count("GET", "/workflow/") == 1
+        with pytest.raises(AttributeError):
+            handle.missing_attribute
+
+    def test_refresh(self, tower_server, tower_utils):
+        handle = tower_utils.launch_workflow("a1b2c3", "sage/work", lazy=True)
+        assert handle.status == "SUBMITTED"
+        tower_server.workflows[handle.workflow_id]["status"] = "RUNNING"
+        assert handle.status == "SUBMITTED"
+        handle.refresh()
+        assert handle.status == "RUNNING"
+
+    def test_refresh_all(self, tower_server, tower_utils):
+        handles = [
+            tower_utils.launch_workflow("a1b2c3", "sage/work", lazy=True)
+            for _ in range(5)
+        ]
+        for workflow in tower_server.workflows.values():
+            workflow["status"] = "RUNNING"
+        WorkflowHandle.refresh_all(handles)
+        assert all(handle.is_loaded for handle in handles)
+        assert [handle.status for handle in handles] == ["RUNNING"] * 5
+        assert tower_server.count("GET", "/workflow/") == 5
+
+
+def make_workflow(workflow_id, status):
+    return {"workflow": {"id": workflow_id, "status": status}}
+
+
+class TestWorkflowWatcher:
+    def test_update(self):
+        watcher = WorkflowWatcher(["wf0", "wf1"], min_interval=1, max_interval=4)
+        watcher.backoff.jitter = 0
+        updates = {
+            "wf0": make_workflow("wf0", "RUNNING"),
+            "wf1": make_workflow("wf1", "SUCCEEDED"),
+        }
+        transitions = watcher.update(updates)
+        assert [t.status for t in transitions] == ["RUNNING", "SUCCEEDED"]
+        assert transitions[0].previous_status is None
+        assert watcher.pending == ["wf0"]
+        # Unchanged statuses don't produce transitions and slow down polling
+        assert watcher.update({"wf0": updates["wf0"]}) == []
+        assert [watcher.next_delay() for _ in range(3)] == [1, 1.5, 2.25]
+        watcher.update({"wf0": make_workflow("wf0", "FAILED")})
+        assert watcher.next_delay() == 1
+        assert watcher.pending == []
+
+    def test_timeout(self, mocker):
+        mocked_time = mocker.patch("sagetasks.utils.time.monotonic")
+        mocked_time.return_value = 0
+        watcher = WorkflowWatcher(["wf0"], min_interval=5, timeout=10)
+        watcher.backoff.jitter = 0
+        assert watcher.next_delay() == 5
+        # The last poll happens at the deadline rather than raising early
+        mocked_time.return_value = 6
+        assert watcher.next_delay() == 4
+        mocked_time.return_value = 10
+        with pytest.raises(TimeoutError, match="wf0"):
+            watcher.next_delay()
@@ -0,0 +1,147 @@
+import pandas as pd
+import pytest
+
+from sagetasks.sevenbridges import general
+from sagetasks.sevenbridges.inputs import (
+    GTEX_NORMAL_PARAMS,
+    AppInputsTemplate,
+    get_app_inputs_factory,
+    iter_sample_chunks,
+    manifest_to_kf_rnaseq_app_inputs_factory,
+    prepare_kf_rnaseq_samples,
+    resolve_files,
+)
+
+EG_MANIFEST = pd.DataFrame(
+    {
+        "cavatica_file_id": ["f1", "f2", "f3", "f4", "f5", "f6"],
+        "sample_id": ["s1", "s2", "s1", "s3", "s2", "s3"],
+        "read_length": [100] * 6,
+        "sample_type": ["Tumor", "Normal", "Tumor", "Normal", "Normal", "Normal"],
+        "read_orientation": ["R1", "R1", "R2", "R1", "R2", "R2"],
+        "strandedness": ["default"] * 6,
+    }
+)
+
+
+def test_iter_sample_chunks():
+    chunks = [EG_MANIFEST.iloc[i : i + 2] for i in range(0, 6, 2)]
+    complete = list(iter_sample_chunks(chunks, "sample_id"))
+    assert [sorted(set(x.sample_id)) for x in complete] == [["s1"], ["s2", "s3"]]
+    assert list(complete[1]["cavatica_file_id"]) == ["f2", "f4", "f5", "f6"]
+
+
+def test_app_inputs_from_chunks(mocker):
+    client = mocker.Mock()
+    client.files.bulk_get.side_effect = lambda file_ids: [
+        mocker.Mock(valid=True, resource=x) for x in file_ids
+    ]
+    inputs_fn = manifest_to_kf_rnaseq_app_inputs_factory()
+    chunks = [EG_MANIFEST.iloc[i : i + 4] for i in range(0, 6, 4)]
+    from_chunks = {name: inputs for name, inputs, _ in inputs_fn(client, chunks)}
+    from_frame = {name: inputs for name, inputs, _ in inputs_fn(client, EG_MANIFEST)}
+    assert from_chunks == from_frame
+    assert from_frame["kf-rnaseq-workflow - s3"]["reads2"] == "f6"
+    # One bulk call per chunk (or for the whole data frame)
+    assert client.files.bulk_get.call_count == 3
+
+
+def test_resolve_files(mocker):
+    client = mocker.Mock()
+    client.files.bulk_get.side_effect = lambda file_ids: [
+        mocker.Mock(valid=x != "bad", resource=x.upper(), error="not found")
+        for x in file_ids
+    ]
+    files = resolve_files(client, ["a", "b", "a", "c"], batch_size=2)
+    assert files == {"a": "A", "b": "B", "c": "C"}
+    assert client.files.bulk_get.call_count == 2
+    resolve_files(client, ["a", "d"], files)
+    client.files.bulk_get.assert_called_with(["d"])
+    with pytest.raises(ValueError, match="bad: not found"):
+        resolve_files(client, ["bad"])
+
+
+def test_prepare_samples():
+    samples = prepare_kf_rnaseq_samples(EG_MANIFEST)
+    assert list(samples.index) == ["s1", "s2", "s3"]
+    assert list(samples.reads1) == ["f1", "f2", "f4"]
+    assert list(samples.reads2) == ["f3", "f5", "f6"]
+    assert list(samples.library_id) == ["Not_Reported"] * 3
+    assert not samples.is_tumor.any()
+
+
+def test_prepare_samples_errors():
+    manifest = EG_MANIFEST.copy()
+    manifest.loc[5, "read_orientation"] = "R1"
+    manifest.loc[4, "strandedness"] = "unknown"
+    manifest.loc[2, "read_length"] = 50
+    manifest = pd.concat([manifest, EG_MANIFEST.iloc[[0]].assign(sample_id="s4")])
+    with pytest.raises(ValueError) as exc_info:
+        prepare_kf_rnaseq_samples(manifest)
+    assert str(exc_info.value).splitlines()[1:] == [
+        "Sample s4 has 1 files instead of 2.",
+        "Sample s3 has 2 R1 files instead of 1.",
+        "Sample s3 has 0 R2 files instead of 1.",
+        "Sample s4 has 0 R2 files instead of 1.",
+        "Sample s2 has multiple values for 'strandedness'.",
+        "Sample s1 has multiple values for 'read_length'.",
+    ]
+
+
+def test_app_inputs_template():
+    samples = pd.DataFrame(
+        {"file": ["f1", "f2"], "size": [1, 2], "normal": [True, False]},
+        index=["s1", "s2"],
+    )
+    blocks = {"normal": {True: {"param": 1}}}
+    template = AppInputsTemplate(
+        {"reads": "file", "size": "size"}, {"x": "y"}, ("reads",), blocks
+    )
+    blocks["normal"][True]["param"] = 2
+    inputs = dict(template.iter_inputs(samples, {"f1": "F1", "f2": "F2"}))
+    assert inputs == {
+        "s1": {"param": 1, "x": "y", "reads": "F1", "size": 1},
+        "s2": {"x": "y", "reads": "F2", "size": 2},
+    }
+    # Inputs are separate dictionaries
+    inputs["s1"]["x"] = "z"
+    assert template.constants["x"] == "y"
+
+
+def test_app_inputs_factory_registry():
+    factory = manifest_to_kf_rnaseq_app_inputs_factory
+    assert get_app_inputs_factory("cavatica/apps/kfdrc-rnaseq-workflow") is factory
+    assert get_app_inputs_factory("user/project/kfdrc-rnaseq-workflow/3") is factory
+    # Copies made by `SbgUtils.import_app()` have a numeric suffix
+    copied_app_id = "user/project/kfdrc-rnaseq-workflow-12/2"
+    assert get_app_inputs_factory(copied_app_id) is factory
+    with pytest.raises(ValueError, match="No inputs factory"):
+        get_app_inputs_factory("user/project/other-app")
+
+
+def test_create_tasks_registered_inputs(mocker):
+    utils = mocker.patch.object(general, "SbgUtils").return_value
+    utils.get_or_create_tasks.side_effect = lambda app_id, specs, _: list(specs)
+    utils.extract_id.side_effect = lambda spec: spec[0]
+    utils.client.files.bulk_get.side_effect = lambda file_ids: [
+        mocker.Mock(valid=True, resource=x) for x in file_ids
+    ]
+    app_id = "user/project/kfdrc-rnaseq-workflow-1"
+    task_ids = general.create_tasks({}, "user/project", app_id, EG_MANIFEST)
+    assert task_ids[0] == "kf-rnaseq-workflow - s1"
+
+
+def test_app_inputs_shared_params(mocker):
+    client = mocker.Mock()
+    client.files.bulk_get.side_effect = lambda file_ids: [
+        mocker.Mock(valid=True, resource=x) for x in file_ids
+    ]
+    inputs_fn = manifest_to_kf_rnaseq_app_inputs_factory()
+    inputs = {name: inputs for name, inputs, _ in inputs_fn(client, EG_MANIFEST)}
+    normal = inputs["kf-rnaseq-workflow - s2"]
+    assert normal["outFilterType"] == GTEX_NORMAL_PARAMS["outFilterType"]
+    assert (
+        normal["outSAMattrRGline"] == "ID:s2\tLB:Not_Reported\tPL:Not_Reported\tSM:s2"
+    )
+    normal["outFilterType"] = "Normal"
+    assert inputs["kf-rnaseq-workflow - s3"]["outFilterType"] == "BySJout"
@@ -0,0 +1,257 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pytest
+from sevenbridges.errors import SbgError
+from sevenbridges.models.file import File
+from sevenbridges.models.project import Project
+
+from sagetasks.sevenbridges import utils
+from sagetasks.sevenbridges.utils import ClientRegistry, SbgUtils
+
+EG_CLIENT_ARGS = SbgUtils.bundle_client_args("token")
+
+
+@pytest.fixture
+def registry(mocker):
+    registry = ClientRegistry()
+    mocker.patch.object(utils, "CLIENT_REGISTRY", registry)
+    return registry
+
+
+class TestClientRegistry:
+    def test_shared_client(self, registry):
+        first = SbgUtils(EG_CLIENT_ARGS)
+        second = SbgUtils(dict(EG_CLIENT_ARGS))
+        assert first.client is second.client
+
+    def test_settings(self, registry):
+        client_args = SbgUtils.bundle_client_args(
+            "token", pool_maxsize=5, max_parallel_requests=2, advance_access=True
+        )
+        client = SbgUtils(client_args).client
+        assert client is not SbgUtils(EG_CLIENT_ARGS).client
+        assert client.pool_maxsize == 5
+        assert client.aa is True
+
+    def test_concurrent(self, mocker, registry):
+        mocked_init = mocker.patch.object(
+            ClientRegistry, "init_client", side_effect=lambda _: object()
+        )
+        with ThreadPoolExecutor(8) as executor:
+            futures = [executor.submit(SbgUtils, EG_CLIENT_ARGS) for _ in range(32)]
+            clients = {id(future.result().client) for future in futures}
+        assert len(clients) == 1
+        mocked_init.assert_called_once()
+
+    def test_dedicated_client(self, registry):
+        shared = SbgUtils(EG_CLIENT_ARGS).client
+        assert SbgUtils(EG_CLIENT_ARGS, shared_client=False).client is not shared
+        registry.invalidate(EG_CLIENT_ARGS)
+        assert SbgUtils(EG_CLIENT_ARGS).client is not shared
+
+
+def make_file(name, file_type="file"):
+    return File(id=f"{name}-id", name=name, type=file_type, api=None)
+
+
+@pytest.fixture
+def sbg_utils(mocker):
+    sbg_utils = SbgUtils(EG_CLIENT_ARGS, shared_client=False)
+    sbg_utils.client = mocker.Mock()
+    sbg_utils._project = "project-id"
+    return sbg_utils
+
+
+class TestChildrenIndex:
+    def test_lookups(self, sbg_utils):
+        client = sbg_utils.client
+        listing = [make_file("a.fq"), make_file("dir", "folder")]
+        client.files.query.return_value.all.return_value = listing
+        assert sbg_utils.get_file("a.fq", "project-id") == [listing[0]]
+        assert sbg_utils.get_folder("dir", "project-id") == [listing[1]]
+        assert sbg_utils.get_file("b.fq", "project-id") == []
+        client.files.query.assert_called_once_with(parent="project-id")
+
+    def test_created_folders(self, sbg_utils):
+        client = sbg_utils.client
+        client.files.query.return_value.all.return_value = []
+        client.files.create_folder.side_effect = lambda name, **_: make_file(
+            name, "folder"
+        )
+        folder = sbg_utils.get_folders_recursively(["a", "b"], "project-id")
+        assert folder.id == "b-id"
+        assert sbg_utils.get_folders_recursively(["a", "b"], "project-id") is folder
+        assert client.files.create_folder.call_count == 2
+        assert client.files.query.call_count == 2
+        sbg_utils.invalidate_children()
+        sbg_utils.get_folder("a", "project-id")
+        assert client.files.query.call_count == 3
+
+
+def test_import_volume_files(mocker, sbg_utils):
+    client = sbg_utils.client
+    folder = make_file("dir", "folder")
+    mocker.patch.object(sbg_utils, "get_folders_recursively", return_value=folder)
+    client.files.query.return_value.all.return_value = [make_file("a.fq")]
+    mocker.patch("sagetasks.utils.time.sleep")
+
+    def record(state=None, result=None, error=None):
+        job = mocker.Mock(state=state, result=result, error="failed")
+        return mocker.Mock(valid=error is None, resource=job, error=error)
+
+    client.imports.bulk_submit.return_value = [record(), record(), record(error="no")]
+    client.imports.bulk_get.side_effect = [
+        [record("RUNNING"), record("FAILED")],
+        [record("COMPLETED", make_file("b.fq"))],
+    ]
+    specs = [(f"vol/{x}.fq", f"dir/{x}.fq") for x in "abcd"]
+    results = sbg_utils.import_volume_files("vol-id", specs)
+    assert [x["file_id"] for x in results] == ["a.fq-id", "b.fq-id", None, None]
+    assert [x["error"] for x in results] == [None, None, "failed", "no"]
+    imports = client.imports.bulk_submit.call_args.args[0]
+    assert [x["location"] for x in imports] == ["vol/b.fq", "vol/c.fq", "vol/d.fq"]
+    assert imports[0]["name"] == "b.fq" and imports[0]["parent"] is folder
+    assert client.imports.bulk_get.call_count == 2
+    # Imported files are added to the index without listing the folder again
+    assert sbg_utils.get_file("b.fq", folder)[0].id == "b.fq-id"
+    client.files.query.assert_called_once_with(parent=folder)
+
+
+def test_wait_for_tasks(mocker, sbg_utils):
+    client = sbg_utils.client
+    mocked_sleep = mocker.patch("sagetasks.utils.time.sleep")
+
+    def bulk_get(task_ids):
+        status = "COMPLETED" if mocked_sleep.call_count else "RUNNING"
+        return [
+            mocker.Mock(valid=True, resource=mocker.Mock(id=x, status=status))
+            for x in task_ids
+        ]
+
+    client.tasks.bulk_get.side_effect = bulk_get
+    tasks = sbg_utils.wait_for_tasks(["t1", "t2"])
+    assert {x: t.status for x, t in tasks.items()} == {
+        "t1": "COMPLETED",
+        "t2": "COMPLETED",
+    }
+    assert client.tasks.bulk_get.call_count == 2
+
+
+def test_get_or_create_tasks(mocker, sbg_utils):
+    client = sbg_utils.client
+    existing = mocker.Mock(app="user/project/app/0", id="t0")
+    existing.name = "s0"
+    other_app = mocker.Mock(app="user/project/other/0", id="t9")
+    other_app.name = "s1"
+    client.tasks.query.return_value.all.return_value = [existing, other_app]
+    # Tasks are created from worker threads, where `Mock.call_count` isn't
+    # updated atomically, so calls are tracked with (atomic) list appends
+    created, callbacks = [], []
+
+    def create(name, **_):
+        created.append(name)
+        return mocker.Mock(id=f"new-{name}")
+
+    client.tasks.create.side_effect = create
+    callback_fn = callbacks.append
+    names = ["s0", "s1", "s2", "s1"] + [f"x{i}" for i in range(150)]
+    specs = [(name, {}, callback_fn) for name in names]
+    tasks = sbg_utils.get_or_create_tasks("user/project/app", specs)
+    assert [task.id for task in tasks[:4]] == ["t0", "new-s1", "new-s2", "new-s1"]
+    assert len(tasks) == len(names)
+    client.tasks.query.assert_called_once()
+    assert len(created) == len(callbacks) == 152
+
+
+class TestAppLookups:
+    @pytest.fixture
+    def client(self, mocker, sbg_utils):
+        client = sbg_utils.client
+        public_app = mocker.Mock(id="cavatica/apps/rnaseq")
+        project_apps = list()
+
+        def query(visibility=None, id=None, project=None, q=None):
+            if visibility == "public":
+                return [public_app]
+            matches = [x for x in project_apps if q in x.id]
+            return mocker.Mock(all=mocker.Mock(return_value=iter(matches)))
+
+        def copy(project, name):
+            project_apps.append(mocker.Mock(id=f"{project}/{name}", raw={}))
+            return project_apps[-1]
+
+        client.apps.query.side_effect = query
+        public_app.copy.side_effect = copy
+        return client
+
+    def test_copied_app(self, sbg_utils, client):
+        app = sbg_utils.get_or_create_copied_app("cavatica/apps/rnaseq")
+        assert app.id == "project-id/rnaseq-1"
+        public_queries = [
+            x for x in client.apps.query.call_args_list if x.kwargs.get("visibility")
+        ]
+        assert len(public_queries) == 1
+        num_queries = client.apps.query.call_count
+        again = sbg_utils.get_or_create_copied_app("cavatica/apps/rnaseq")
+        assert again is app
+        assert client.apps.query.call_count == num_queries
+
+    def test_concurrent_lookups(self, sbg_utils, client):
+        app_ids = ["cavatica/apps/rnaseq"] * 16
+        with ThreadPoolExecutor(8) as executor:
+            apps = set(executor.map(sbg_utils.get_public_app, app_ids))
+        assert len(apps) == 1
+        client.apps.query.assert_called_once()
+
+    def test_parallel_lookups(self, sbg_utils, client):
+        # Lookups of different apps would time out here if serialized
+        barrier = Barrier(2, timeout=5)
+        query = client.apps.query.side_effect
+
+        def blocking_query(**kwargs):
+            barrier.wait()
+            return query(**kwargs)
+
+        client.apps.query.side_effect = blocking_query
+        with ThreadPoolExecutor(2) as executor:
+            list(executor.map(sbg_utils._get_apps_by_name, ["rnaseq", "dnaseq"]))
+
+
+def test_import_volume_files_at_root(mocker, sbg_utils):
+    client = sbg_utils.client
+    project = sbg_utils._project = Project(id="user/project", api=None)
+    client.files.query.return_value.all.return_value = []
+    mocker.patch("sagetasks.utils.time.sleep")
+    job = mocker.Mock(state="COMPLETED", result=make_file("a.fq"))
+    client.imports.bulk_submit.return_value = [mocker.Mock(valid=True, resource=job)]
+    client.imports.bulk_get.return_value = [mocker.Mock(valid=True, resource=job)]
+    results = sbg_utils.import_volume_files("vol-id", [("vol/a.fq", "a.fq")])
+    assert results[0]["file_id"] == "a.fq-id"
+    imports = client.imports.bulk_submit.call_args.args[0]
+    assert imports[0]["project"] is project and "parent" not in imports[0]
+    client.files.query.assert_called_once_with(project=project)
+
+
+def test_import_volume_file_at_root(mocker, sbg_utils):
+    client = sbg_utils.client
+    project = Project(id="user/project", api=None)
+    client.files.query.return_value.all.return_value = []
+    job = client.imports.submit_import.return_value
+    job.state = "COMPLETED"
+    job.result = make_file("a.fq")
+    mocker.patch.object(sbg_utils, "_wait_for_import_job", side_effect=lambda x: x)
+    imported_file = sbg_utils.import_volume_file("vol-id", "vol/a.fq", project)
+    assert imported_file.id == "a.fq-id"
+    client.imports.submit_import.assert_called_once_with(
+        volume="vol-id", location="vol/a.fq", project=project
+    )
+
+
+def test_import_volume_files_invalid_batch(mocker, sbg_utils):
+    client = sbg_utils.client
+    client.files.query.return_value.all.return_value = []
+    client.imports.bulk_submit.side_effect = SbgError("Invalid file parameter!")
+    results = sbg_utils.import_volume_files("vol-id", [("vol/a.fq", "a.fq")])
+    assert results[0]["error"] == "Invalid file parameter!"
+    assert results[0]["file_id"] is None
@@ -0,0 +1,46 @@
+from io import BytesIO
+
+import pytest
+
+from sagetasks.synapse import general
+from sagetasks.synapse.cache import TableCache
+from sagetasks.synapse.utils import SessionCache
+
+EG_CLIENT_ARGS = {"authToken": "token", "silent": True}
+
+EG_TABLE = b"sample\tvalue\tnotes\n" + b"".join(
+    f"s{i}\t{i}\tfoo\n".encode() for i in range(10)
+)
+
+
+@pytest.fixture(autouse=True)
+def table_cache(mocker, tmp_path):
+    cache = TableCache(str(tmp_path / "tables"))
+    mocker.patch.object(general, "TABLE_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def mocked_login(mocker):
+    def login(**_):
+        client = mocker.Mock()
+        file = client.get.return_value
+        file.id = "syn123"
+        file.versionNumber = 1
+        file._file_handle = {"id": "123", "contentMd5": "abc"}
+        return client
+
+    return mocker.patch("synapseclient.login", side_effect=login)
+
+
+@pytest.fixture
+def mocked_download(mocker, mocked_login):
+    mocker.patch.object(general, "SESSION_CACHE", SessionCache())
+    mocker.patch.object(general.utils, "get_file_url", return_value="https://eg")
+
+    def get(url, stream):
+        response = mocker.MagicMock()
+        response.__enter__.return_value.raw = BytesIO(EG_TABLE)
+        return response
+
+    return mocker.patch.object(general.utils.requests, "get", side_effect=get)
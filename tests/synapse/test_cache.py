@@ -0,0 +1,139 @@
+import io
+import os
+from contextlib import nullcontext
+from pathlib import Path
+
+import pytest
+
+from sagetasks.synapse import cache, general
+
+from .conftest import EG_CLIENT_ARGS
+
+
+def test_cached_loads(mocked_download, table_cache):
+    first = general.get_dataframe(EG_CLIENT_ARGS, "syn123", sep="\t", use_cache=True)
+    second = general.get_dataframe(
+        EG_CLIENT_ARGS, "syn123", sep="\t", usecols=["sample", "value"], use_cache=True
+    )
+    assert mocked_download.call_count == 1
+    assert second.equals(first[["sample", "value"]])
+    stats = table_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["entries"] == 1 and stats["bytes"] > 0
+
+
+def test_cached_chunks(mocked_download, table_cache):
+    general.get_dataframe(EG_CLIENT_ARGS, "syn123", sep="\t", use_cache=True)
+    chunks = general.get_dataframe(
+        EG_CLIENT_ARGS, "syn123", sep="\t", chunksize=3, use_cache=True
+    )
+    assert sum(len(chunk.index) for chunk in chunks) == 10
+    assert mocked_download.call_count == 1
+    assert table_cache.stats()["raw_hits"] == 1
+
+
+def test_new_version(mocked_download, mocked_login):
+    general.get_dataframe(EG_CLIENT_ARGS, "syn123", sep="\t", use_cache=True)
+    client = general.SESSION_CACHE.get_client(EG_CLIENT_ARGS)
+    client.get.return_value.versionNumber = 2
+    general.get_dataframe(EG_CLIENT_ARGS, "syn123", sep="\t", use_cache=True)
+    assert mocked_download.call_count == 2
+
+
+def test_lru_eviction(tmp_path):
+    table_cache = cache.TableCache(str(tmp_path), max_bytes=150)
+
+    def open_source():
+        raise AssertionError("Unexpected download")
+
+    for version in range(3):
+        entry = table_cache.entry_dir("syn123", version, "abc")
+        table_cache.write_atomic(
+            f"{entry}/{cache.RAW_FILENAME}", lambda p: Path(p).write_bytes(b"x" * 60)
+        )
+        table_cache.touch(entry)
+    table_cache.fetch_raw(table_cache.entry_dir("syn123", 0, "abc"), open_source)
+    table_cache.touch(table_cache.entry_dir("syn123", 0, "abc"))
+    table_cache.evict()
+    remaining = [path.rsplit("/", 1)[-1] for _, _, path in table_cache.entries()]
+    assert len(remaining) == 2
+    assert table_cache.stats()["evictions"] == 1
+
+
+@pytest.mark.parametrize("feather", [None, cache.feather])
+def test_columnar_formats(mocker, tmp_path, feather):
+    mocker.patch.object(cache, "feather", feather)
+    table_cache = cache.TableCache(str(tmp_path))
+    data_frame = general.pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    path = str(tmp_path / table_cache.table_filename())
+    path = table_cache.write_table(path, data_frame)
+    assert table_cache.find_table(str(tmp_path / table_cache.table_filename()))
+    assert table_cache.read_table(path, usecols=["b"]).equals(data_frame[["b"]])
+
+
+def test_mixed_type_columns(tmp_path):
+    table_cache = cache.TableCache(str(tmp_path))
+    data_frame = general.pd.DataFrame({"a": [1, "x", 2.5]})
+    path = table_cache.write_table(str(tmp_path / "table"), data_frame)
+    assert path.endswith(".pkl")
+    assert table_cache.read_table(path).equals(data_frame)
+
+
+def test_projected_miss(mocker, tmp_path):
+    table_cache = cache.TableCache(str(tmp_path))
+    read_table = mocker.spy(cache.pd, "read_table")
+    source = b"a\tb\tc\n1\tx\t2\n"
+
+    def open_source():
+        return nullcontext(io.BytesIO(source))
+
+    args = ("syn123", 1, "abc", open_source)
+    first = table_cache.load(*args, usecols=["c", "a"], sep="\t")
+    assert list(first.columns) == ["c", "a"]
+    assert read_table.call_args.kwargs["usecols"] == ["c", "a"]
+    second = table_cache.load(*args, usecols=["c", "a"], sep="\t")
+    assert second.equals(first)
+    assert table_cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("feather", [None, cache.feather])
+def test_positional_usecols(mocker, tmp_path, feather):
+    mocker.patch.object(cache, "feather", feather)
+    table_cache = cache.TableCache(str(tmp_path))
+    source = b"a\tb\tc\n1\tx\t2\n"
+
+    def open_source():
+        return nullcontext(io.BytesIO(source))
+
+    args = ("syn123", 1, "abc", open_source)
+    first = table_cache.load(*args, usecols=[2, 0], sep="\t")
+    assert list(first.columns) == ["a", "c"]
+    assert table_cache.load(*args, usecols=[2, 0], sep="\t").equals(first)
+    # Projected from a copy of the whole table
+    table_cache.load(*args, sep="\t")
+    assert table_cache.load(*args, usecols=[0, 2], sep="\t").equals(first)
+    assert table_cache.stats()["hits"] == 2
+
+
+def test_entries_ignore_removed_files(mocker, tmp_path):
+    table_cache = cache.TableCache(str(tmp_path))
+    entry = tmp_path / "syn123.1.abc"
+    entry.mkdir()
+    (entry / cache.RAW_FILENAME).write_bytes(b"x" * 10)
+    removed_dir = tmp_path / "syn123.2.abc"
+    removed_dir.mkdir()
+    removed_file = mocker.Mock(path=str(entry / "tmp"))
+    removed_file.stat.side_effect = FileNotFoundError
+    scandir = os.scandir
+
+    def racy_scandir(path):
+        # Files renamed or evicted by other threads while listing
+        listed = list(scandir(path))
+        if path == str(entry):
+            listed.append(removed_file)
+        else:
+            removed_dir.rmdir()
+        return nullcontext(listed)
+
+    mocker.patch.object(cache.os, "scandir", racy_scandir)
+    assert table_cache.entries() == [(mocker.ANY, 10, str(entry))]
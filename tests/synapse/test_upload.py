@@ -0,0 +1,200 @@
+import gzip
+import hashlib
+import io
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from sagetasks.synapse import general, upload
+from sagetasks.synapse.utils import SessionCache
+
+from .conftest import EG_CLIENT_ARGS
+
+EG_DATAFRAME = pd.DataFrame({"sample": [f"s{i}" for i in range(1000)], "value": 1.5})
+
+
+class FakeMultipartApi:
+    """Minimal stand-in for the Synapse multipart upload endpoints."""
+
+    def __init__(self):
+        self.fileHandleEndpoint = "https://file"
+        self.request = None
+        self.parts = {}
+        self.added = {}
+
+    def restGET(self, uri, endpoint):
+        return {"storageLocationId": 1}
+
+    def restPOST(self, uri, body, endpoint):
+        body = json.loads(body)
+        if uri == "/file/multipart":
+            self.request = body
+            return {"uploadId": "42", "state": "UPLOADING"}
+        return {
+            "partPresignedUrls": [
+                {"partNumber": n, "uploadPresignedUrl": f"https://s3/{n}"}
+                for n in body["partNumbers"]
+            ]
+        }
+
+    def restPUT(self, uri, endpoint):
+        if uri.endswith("/complete"):
+            content = b"".join(self.parts[n] for n in sorted(self.parts))
+            assert hashlib.md5(content).hexdigest() == self.request["contentMD5Hex"]
+            assert len(content) == self.request["fileSizeBytes"]
+            return {"state": "COMPLETED", "resultFileHandleId": "123"}
+        part_number = int(uri.split("/add/")[1].split("?")[0])
+        self.added[part_number] = uri.split("partMD5Hex=")[1]
+        return {"addPartState": "ADD_SUCCESS"}
+
+    def put(self, url, data, headers, timeout):
+        self.parts[int(url.rsplit("/", 1)[1])] = data
+        return type("Response", (), {"raise_for_status": lambda self: None})()
+
+    @property
+    def content(self):
+        return b"".join(self.parts[n] for n in sorted(self.parts))
+
+
+@pytest.fixture
+def fake_api(mocker):
+    api = FakeMultipartApi()
+    mocker.patch.object(upload.requests, "put", side_effect=api.put)
+    return api
+
+
+def test_part_writer():
+    parts = []
+    with upload.PartWriter(4, lambda n, part: parts.append((n, part))) as writer:
+        writer.write(b"abcdefghij")
+        writer.write(b"k")
+    assert parts == [(1, b"abcd"), (2, b"efgh"), (3, b"ijk")]
+    assert writer.size == 11
+    assert writer.md5.hexdigest() == hashlib.md5(b"abcdefghijk").hexdigest()
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_multipart_upload(fake_api, compression):
+    uploader = upload.MultipartUploader(fake_api)
+    uploader.part_size = 1000
+
+    def write(fileobj):
+        upload.serialize_dataframe(EG_DATAFRAME, fileobj, compression=compression)
+
+    handle_id = uploader.upload(write, "table.csv", "text/csv", 1)
+    assert handle_id == "123"
+    content = fake_api.content
+    if compression:
+        content = gzip.decompress(content)
+    assert pd.read_csv(io.BytesIO(content)).equals(EG_DATAFRAME)
+    assert all(len(part) <= 1000 for part in fake_api.parts.values())
+    assert len(fake_api.added) == len(fake_api.parts)
+    assert fake_api.request["partSizeBytes"] == 1000
+
+
+def test_multipart_upload_changed(fake_api):
+    uploader = upload.MultipartUploader(fake_api)
+    calls = []
+
+    def write(fileobj):
+        calls.append(None)
+        fileobj.write(b"x" * len(calls))
+
+    with pytest.raises(RuntimeError):
+        uploader.upload(write, "table.csv")
+
+
+def test_multipart_upload_overflow(fake_api):
+    uploader = upload.MultipartUploader(fake_api)
+    uploader.part_size = 1000
+    calls = []
+
+    def write(fileobj):
+        calls.append(None)
+        fileobj.write(b"x" * 1000 * len(calls))
+
+    with pytest.raises(RuntimeError, match="more than the expected 1 parts"):
+        uploader.upload(write, "table.csv")
+
+
+def test_put_part_retries(mocker, fake_api):
+    mocker.patch.object(upload.time, "sleep")
+    put = upload.requests.put
+    put.side_effect = [upload.requests.ConnectionError(), mocker.Mock()]
+    part_url = {"partNumber": 1, "uploadPresignedUrl": "https://s3/1"}
+    upload.MultipartUploader.put_part(part_url, b"abc")
+    assert put.call_count == 2
+    assert put.call_args.kwargs["timeout"] == upload.PART_UPLOAD_TIMEOUT
+
+
+def test_put_part_gives_up(mocker, fake_api):
+    sleep = mocker.patch.object(upload.time, "sleep")
+    upload.requests.put.side_effect = upload.requests.Timeout()
+    part_url = {"partNumber": 1, "uploadPresignedUrl": "https://s3/1"}
+    with pytest.raises(upload.requests.Timeout):
+        upload.MultipartUploader.put_part(part_url, b"abc")
+    assert sleep.call_count == upload.PART_UPLOAD_RETRIES
+
+
+def test_store_dataframe_parquet(mocker, fake_api):
+    mocker.patch.object(general, "SESSION_CACHE", SessionCache())
+    client = mocker.patch("synapseclient.login").return_value
+    client.fileHandleEndpoint = fake_api.fileHandleEndpoint
+    client.restGET.side_effect = fake_api.restGET
+    client.restPOST.side_effect = fake_api.restPOST
+    client.restPUT.side_effect = fake_api.restPUT
+    general.store_dataframe(
+        EG_CLIENT_ARGS,
+        EG_DATAFRAME,
+        "table.parquet",
+        "syn1",
+        file_format="parquet",
+        streaming=True,
+    )
+    assert fake_api.request["contentType"] == "application/vnd.apache.parquet"
+    assert pd.read_parquet(io.BytesIO(fake_api.content)).equals(EG_DATAFRAME)
+    syn_file = client.store.call_args.args[0]
+    assert syn_file.dataFileHandleId == "123"
+    assert syn_file.parentId == "syn1"
+
+
+def test_store_dataframe_temp_file(mocker):
+    mocker.patch.object(general, "SESSION_CACHE", SessionCache())
+    client = mocker.patch("synapseclient.login").return_value
+    contents = []
+    client.store.side_effect = lambda f: contents.append(Path(f.path).read_text())
+    general.store_dataframe(EG_CLIENT_ARGS, EG_DATAFRAME, "table.tsv", "syn1", sep="\t")
+    assert contents[0].startswith("sample\tvalue\ns0\t1.5\n")
+
+
+@pytest.mark.parametrize("changed", [False, True])
+def test_store_dataframe_skip_unchanged(mocker, fake_api, changed):
+    mocker.patch.object(general, "SESSION_CACHE", SessionCache())
+    client = mocker.patch("synapseclient.login").return_value
+    client.fileHandleEndpoint = fake_api.fileHandleEndpoint
+    client.restGET.side_effect = fake_api.restGET
+    client.restPOST.side_effect = fake_api.restPOST
+    client.restPUT.side_effect = fake_api.restPUT
+    serialized = io.BytesIO()
+    upload.serialize_dataframe(EG_DATAFRAME, serialized)
+    md5 = hashlib.md5(serialized.getvalue()).hexdigest()
+    existing = client.get.return_value
+    existing._file_handle = {"contentMd5": "other" if changed else md5}
+    result = general.store_dataframe(
+        EG_CLIENT_ARGS,
+        EG_DATAFRAME,
+        "table.csv",
+        "syn1",
+        streaming=True,
+        skip_unchanged=True,
+    )
+    client.findEntityId.assert_called_once_with("table.csv", "syn1")
+    if changed:
+        assert result is client.store.return_value
+        assert fake_api.request["contentMD5Hex"] == md5
+    else:
+        assert result is existing
+        client.store.assert_not_called()
+        assert fake_api.request is None
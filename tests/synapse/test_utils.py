@@ -0,0 +1,119 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sagetasks.synapse import general
+from sagetasks.synapse.utils import SessionCache
+
+from .conftest import EG_CLIENT_ARGS
+
+
+class TestSessionCache:
+    def test_reuse(self, mocked_login):
+        sessions = SessionCache()
+        client = sessions.get_client(EG_CLIENT_ARGS)
+        assert sessions.get_client(dict(EG_CLIENT_ARGS)) is client
+        other = sessions.get_client({**EG_CLIENT_ARGS, "authToken": "other"})
+        assert other is not client
+        assert mocked_login.call_count == 2
+
+    def test_concurrent_login(self, mocked_login):
+        sessions = SessionCache()
+        with ThreadPoolExecutor(8) as executor:
+            futures = [
+                executor.submit(sessions.get_client, EG_CLIENT_ARGS) for _ in range(32)
+            ]
+            clients = {id(future.result()) for future in futures}
+        assert len(clients) == 1
+        mocked_login.assert_called_once_with(**EG_CLIENT_ARGS)
+
+    def test_idle_expiry(self, mocker, mocked_login):
+        mocked_time = mocker.patch("sagetasks.utils.time.monotonic")
+        mocked_time.return_value = 0
+        sessions = SessionCache(idle_timeout=60)
+        client = sessions.get_client(EG_CLIENT_ARGS)
+        mocked_time.return_value = 50
+        assert sessions.get_client(EG_CLIENT_ARGS) is client
+        mocked_time.return_value = 200
+        assert sessions.get_client(EG_CLIENT_ARGS) is not client
+
+    def test_invalidate(self, mocked_login):
+        sessions = SessionCache()
+        client = sessions.get_client(EG_CLIENT_ARGS)
+        sessions.invalidate(EG_CLIENT_ARGS)
+        assert sessions.get_client(EG_CLIENT_ARGS) is not client
+
+
+def test_get_dataframe(mocked_download):
+    data_frame = general.get_dataframe(
+        EG_CLIENT_ARGS,
+        "syn123",
+        sep="\t",
+        usecols=["sample", "value"],
+        use_cache=False,
+    )
+    assert list(data_frame.columns) == ["sample", "value"]
+    assert len(data_frame.index) == 10
+    mocked_download.assert_called_once_with("https://eg", stream=True)
+
+
+def test_get_dataframe_chunks(mocked_download):
+    chunks = general.get_dataframe(
+        EG_CLIENT_ARGS, "syn123", sep="\t", chunksize=4, dtype={"value": "float64"}
+    )
+    sizes = [len(chunk.index) for chunk in chunks]
+    assert sizes == [4, 4, 2]
+    mocked_download.assert_called_once()
+
+
+def test_general_tasks_share_session(mocked_download, mocked_login):
+    for _ in range(3):
+        general.get_dataframe(EG_CLIENT_ARGS, "syn123")
+    mocked_login.assert_called_once_with(**EG_CLIENT_ARGS)
+
+
+@pytest.fixture
+def mocked_batch(mocker, mocked_download):
+    client = general.SESSION_CACHE.get_client(EG_CLIENT_ARGS)
+    client.restGET.side_effect = lambda uri: {
+        "id": uri.rsplit("/", 1)[1],
+        "versionNumber": 1,
+        "dataFileHandleId": f"fh-{uri.rsplit('/', 1)[1]}",
+    }
+
+    def batch(uri, body, endpoint):
+        files = json.loads(body)["requestedFiles"]
+        return {
+            "requestedFiles": [
+                {
+                    "fileHandleId": file["fileHandleId"],
+                    "fileHandle": {"contentMd5": file["fileHandleId"]},
+                    "preSignedURL": f"https://eg/{file['associateObjectId']}",
+                }
+                for file in files
+            ]
+        }
+
+    client.restPOST.side_effect = batch
+    return client
+
+
+def test_get_dataframes(mocked_batch, mocked_download):
+    synapse_ids = [f"syn{i}" for i in range(150)] + ["syn0"]
+    result = general.get_dataframes(
+        EG_CLIENT_ARGS, synapse_ids, sep="\t", concat=True, max_workers=4
+    )
+    assert len(result.index) == 1500
+    assert list(result.columns) == ["synapse_id", "sample", "value", "notes"]
+    assert result["synapse_id"].unique().tolist() == synapse_ids[:-1]
+    assert mocked_batch.restPOST.call_count == 2
+    assert mocked_download.call_count == 150
+
+
+def test_get_dataframes_dict(mocked_batch, mocked_download):
+    result = general.get_dataframes(
+        EG_CLIENT_ARGS, ["syn1", "syn2"], sep="\t", usecols=["value"], use_cache=False
+    )
+    assert list(result) == ["syn1", "syn2"]
+    assert list(result["syn2"].columns) == ["value"]
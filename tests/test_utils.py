@@ -2,7 +2,14 @@ from copy import deepcopy
 
 import pytest
 
-from sagetasks.utils import update_dict
+from sagetasks.utils import (
+    Backoff,
+    TokenBucket,
+    TtlCache,
+    Waiter,
+    hash_client_args,
+    update_dict,
+)
 
 EG_DICT = {
     "foo": [1, 2, 3],
@@ -49,3 +56,123 @@ def test_update_dict_copy():
     result = update_dict(EG_DICT, overrides)
     assert result["bar"] == overrides["bar"]
     assert EG_DICT == eg_dict_copy
+
+
+class TestTtlCache:
+    def test_hits_and_misses(self):
+        cache = TtlCache()
+        assert cache.get("foo") is None
+        cache.set("foo", 1)
+        assert cache.get("foo") == 1
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_expiry(self, mocker):
+        mocked_time = mocker.patch("sagetasks.utils.time.monotonic")
+        mocked_time.return_value = 0
+        cache = TtlCache(ttl=10)
+        cache.set("foo", 1)
+        mocked_time.return_value = 5
+        assert cache.get("foo") == 1
+        mocked_time.return_value = 11
+        assert cache.get("foo") is None
+        assert len(cache) == 0
+
+    def test_sliding_expiry(self, mocker):
+        mocked_time = mocker.patch("sagetasks.utils.time.monotonic")
+        mocked_time.return_value = 0
+        cache = TtlCache(ttl=10, sliding=True)
+        cache.set("foo", 1)
+        for now in (8, 16, 24):
+            mocked_time.return_value = now
+            assert cache.get("foo") == 1
+        mocked_time.return_value = 35
+        assert cache.get("foo") is None
+
+    def test_lru_eviction(self):
+        cache = TtlCache(maxsize=2)
+        cache.set("foo", 1)
+        cache.set("bar", 2)
+        cache.get("foo")
+        cache.set("baz", 3)
+        assert cache.get("bar") is None
+        assert cache.get("foo") == 1
+
+    def test_get_or_set(self, mocker):
+        cache = TtlCache()
+        factory = mocker.Mock(return_value=1)
+        assert cache.get_or_set("foo", factory) == 1
+        assert cache.get_or_set("foo", factory) == 1
+        factory.assert_called_once()
+
+    def test_invalidate(self):
+        cache = TtlCache()
+        cache.set("foo", 1)
+        cache.set("bar", 2)
+        cache.invalidate("foo")
+        assert cache.get("foo") is None
+        assert cache.get("bar") == 2
+        cache.invalidate()
+        assert len(cache) == 0
+
+
+def test_hash_client_args():
+    args = {"authToken": "secret", "silent": True}
+    digest = hash_client_args(args)
+    assert digest == hash_client_args({"silent": True, "authToken": "secret"})
+    assert digest != hash_client_args({"authToken": "other", "silent": True})
+    assert "secret" not in digest
+
+
+def test_backoff():
+    backoff = Backoff(initial=1, maximum=5, factor=2, jitter=0)
+    assert [backoff.next() for _ in range(5)] == [1, 2, 4, 5, 5]
+    backoff.reset()
+    assert backoff.next() == 1
+    backoff = Backoff(initial=10, maximum=10, jitter=0.5)
+    assert all(5 <= backoff.next() <= 10 for _ in range(20))
+
+
+class TestWaiter:
+    def test_wait(self, mocker):
+        mocked_sleep = mocker.patch("sagetasks.utils.time.sleep")
+        states = iter(["queued", "running", "running", "done"])
+        waiter = Waiter(initial=1, maximum=3, jitter=0)
+        assert waiter.wait(lambda: next(states), lambda x: x == "done") == "done"
+        delays = [c.args[0] for c in mocked_sleep.call_args_list]
+        assert delays == [1, 2, 3]
+
+    def test_wait_all(self, mocker):
+        mocked_sleep = mocker.patch("sagetasks.utils.time.sleep")
+        remaining = {"a": 1, "b": 3, "c": 3}
+
+        def bulk_reload(jobs):
+            for job in jobs:
+                remaining[job] -= 1
+            return [(job, remaining[job]) for job in jobs]
+
+        waiter = Waiter(initial=1, jitter=0)
+        jobs = {key: key for key in remaining}
+        done = waiter.wait_all(jobs, bulk_reload, lambda x: x[1] == 0, batch_size=2)
+        assert done == {"a": ("a", 0), "b": ("b", 0), "c": ("c", 0)}
+        # The interval is reset after the first job is done
+        assert [c.args[0] for c in mocked_sleep.call_args_list] == [1, 2]
+
+    def test_timeout(self, mocker):
+        mocked_time = mocker.patch("sagetasks.utils.time")
+        mocked_time.monotonic.side_effect = [0, 5, 11]
+        waiter = Waiter(initial=4, jitter=0, timeout=10)
+        with pytest.raises(TimeoutError):
+            waiter.wait(lambda: None, lambda x: False)
+        assert mocked_time.sleep.call_args.args[0] == 4
+
+
+def test_token_bucket(mocker):
+    mocked_time = mocker.patch("sagetasks.utils.time.monotonic")
+    mocked_time.return_value = 0
+    bucket = TokenBucket(rate=2, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1
+    mocked_time.return_value = 10
+    assert bucket.reserve() == 0